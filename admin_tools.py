@@ -11,39 +11,77 @@ from dotenv import load_dotenv
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 
+from quota import QuotaLimiter
+from sheets_client import SheetMetadataCache, read_columns
+from records import ACTIONS, euros, parse_rows
+from weeks import LOGS_PARTITIONED, current_week, last_weeks, parse_week_tab, week_label
+from fake_sheets import FAKE_SHEETS, shared_service as fake_sheets_service
+
 # Lade Umgebungsvariablen
 load_dotenv()
 
 SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Lese-/Schreib-Budgets mit Backoff bei 429 (gleiche Limits wie im Bot)
+quota = QuotaLimiter()
+
 def init_sheets():
     """Google Sheets Service initialisieren"""
+    if FAKE_SHEETS:
+        return fake_sheets_service()
+    
     try:
         creds = Credentials.from_service_account_file(
             'credentials.json',
             scopes=SCOPES
         )
-        service = build('sheets', 'v4', credentials=creds)
+        service = build('sheets', 'v4', credentials=creds, static_discovery=True, cache_discovery=False)
         return service
     except Exception as e:
         print(f"❌ Fehler beim Verbinden: {e}")
         return None
 
-def get_all_logs():
-    """Alle Logs abrufen"""
+def log_tabs(service, include_weeks=True):
+    """Logs-Tab und (bei LOGS_PARTITIONED) alle Wochen-Tabs"""
+    if not (LOGS_PARTITIONED and include_weeks):
+        return ['Logs']
+    titles = SheetMetadataCache().load(service, SPREADSHEET_ID, quota).sheet_ids()
+    return ['Logs'] + sorted(title for title in titles if parse_week_tab(title) is not None)
+
+def get_all_logs(include_weeks=True):
+    """Alle Logs abrufen (ohne include_weeks nur der Logs-Tab)"""
     service = init_sheets()
     if not service:
         return None
     
     try:
         sheet = service.spreadsheets()
-        result = sheet.values().get(
+        result = quota.run(sheet.values().batchGet(
             spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
+            ranges=[f'{tab}!A2:I' for tab in log_tabs(service, include_weeks)]
+        ))
         
-        return result.get('values', [])
+        return [row for r in result.get('valueRanges', []) for row in r.get('values', [])]
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        return None
+
+def get_aggregate_logs():
+    """
+    Logs nur mit Zeitstempel, KW, Username, User-ID, Aktion und Betrag (ein batchGet)
+    
+    Jede Zeile wird einmal zu einem LogRecord geparst (Beträge in Cent).
+    """
+    service = init_sheets()
+    if not service:
+        return None
+    
+    try:
+        records = []
+        for tab in log_tabs(service):
+            records.extend(parse_rows(read_columns(service, SPREADSHEET_ID, tab, quota=quota)))
+        return records
     except Exception as e:
         print(f"❌ Fehler: {e}")
         return None
@@ -54,44 +92,39 @@ def stats_overall():
     print("📊 GESAMTSTATISTIKEN")
     print("="*60 + "\n")
     
-    logs = get_all_logs()
+    logs = get_aggregate_logs()
     if not logs:
         print("Keine Logs gefunden.")
         return
     
     total_logs = len(logs)
-    total_payout = 0
+    total_cents = 0
     action_counts = {}
     user_counts = {}
     
-    for row in logs:
-        if len(row) >= 7:
-            action = row[4]
-            username = row[2]
-            amount = float(row[6])
-            
-            total_payout += amount
-            
-            if action not in action_counts:
-                action_counts[action] = 0
-            action_counts[action] += 1
-            
-            if username not in user_counts:
-                user_counts[username] = {'count': 0, 'payout': 0}
-            user_counts[username]['count'] += 1
-            user_counts[username]['payout'] += amount
+    for record in logs:
+        total_cents += record.cents
+        
+        if record.action not in action_counts:
+            action_counts[record.action] = 0
+        action_counts[record.action] += 1
+        
+        if record.username not in user_counts:
+            user_counts[record.username] = {'count': 0, 'cents': 0}
+        user_counts[record.username]['count'] += 1
+        user_counts[record.username]['cents'] += record.cents
     
     print(f"Gesamtanzahl Logs: {total_logs}")
-    print(f"Gesamtauszahlung: {total_payout:.2f}€\n")
+    print(f"Gesamtauszahlung: {euros(total_cents):.2f}€\n")
     
     print("Aktionen:")
     for action, count in sorted(action_counts.items(), key=lambda x: x[1], reverse=True):
-        print(f"  - {action}: {count}x")
+        print(f"  - {ACTIONS.value(action)}: {count}x")
     
     print("\nTop 10 Mitglieder (nach Verdienst):")
-    top_users = sorted(user_counts.items(), key=lambda x: x[1]['payout'], reverse=True)[:10]
+    top_users = sorted(user_counts.items(), key=lambda x: x[1]['cents'], reverse=True)[:10]
     for i, (user, data) in enumerate(top_users, 1):
-        print(f"  {i}. {user}: {data['payout']:.2f}€ ({data['count']} Logs)")
+        print(f"  {i}. {user}: {euros(data['cents']):.2f}€ ({data['count']} Logs)")
 
 def stats_weekly():
     """Wöchentliche Statistiken"""
@@ -99,39 +132,47 @@ def stats_weekly():
     print("📅 WÖCHENTLICHE STATISTIKEN")
     print("="*60 + "\n")
     
-    logs = get_all_logs()
+    logs = get_aggregate_logs()
     if not logs:
         print("Keine Logs gefunden.")
         return
     
-    current_week = datetime.now().isocalendar()[1]
-    current_year = datetime.now().year
-    week_key = f"KW{current_week}/{current_year}"
-    
-    weekly_logs = [row for row in logs if len(row) >= 2 and row[1] == week_key]
+    week = current_week()
+    weekly_logs = [record for record in logs if record.week == week]
     
     if not weekly_logs:
-        print(f"Keine Logs für {week_key} gefunden.")
-        return
-    
-    total_payout = sum(float(row[6]) for row in weekly_logs if len(row) >= 7)
-    
-    print(f"Kalenderwoche: {week_key}")
-    print(f"Anzahl Logs: {len(weekly_logs)}")
-    print(f"Gesamtauszahlung: {total_payout:.2f}€")
+        print(f"Keine Logs für {week_label(week)} gefunden.")
+    else:
+        total_cents = sum(record.cents for record in weekly_logs)
+        
+        print(f"Kalenderwoche: {week_label(week)}")
+        print(f"Anzahl Logs: {len(weekly_logs)}")
+        print(f"Gesamtauszahlung: {euros(total_cents):.2f}€")
+    
+    # Offene Logs der letzten 4 Wochen (auch über den Jahreswechsel)
+    recent = last_weeks(4)
+    per_week = {key: [0, 0] for key in recent.weeks()}
+    for record in logs:
+        if record.week in recent:
+            per_week[record.week][0] += 1
+            per_week[record.week][1] += record.cents
+    
+    print(f"\nLetzte 4 Wochen ({recent.label()}):")
+    for key, (count, cents) in per_week.items():
+        print(f"  - {week_label(key)}: {count} Logs, {euros(cents):.2f}€")
 
 def export_user_stats(username=None):
     """Exportiere Statistiken für einen User"""
-    logs = get_all_logs()
+    logs = get_aggregate_logs()
     if not logs:
         print("Keine Logs gefunden.")
         return
     
     if username:
-        user_logs = [row for row in logs if len(row) >= 3 and row[2].lower() == username.lower()]
+        user_logs = [record for record in logs if record.username.lower() == username.lower()]
     else:
         username = input("Username eingeben: ").strip()
-        user_logs = [row for row in logs if len(row) >= 3 and row[2].lower() == username.lower()]
+        user_logs = [record for record in logs if record.username.lower() == username.lower()]
     
     if not user_logs:
         print(f"Keine Logs für User '{username}' gefunden.")
@@ -140,25 +181,22 @@ def export_user_stats(username=None):
     print(f"\n📊 Statistiken für: {username}")
     print("="*60 + "\n")
     
-    total_payout = 0
+    total_cents = 0
     action_counts = {}
     
-    for row in user_logs:
-        if len(row) >= 7:
-            action = row[4]
-            amount = float(row[6])
-            total_payout += amount
-            
-            if action not in action_counts:
-                action_counts[action] = 0
-            action_counts[action] += 1
+    for record in user_logs:
+        total_cents += record.cents
+        
+        if record.action not in action_counts:
+            action_counts[record.action] = 0
+        action_counts[record.action] += 1
     
     print(f"Gesamtlogs: {len(user_logs)}")
-    print(f"Gesamtverdienst: {total_payout:.2f}€\n")
+    print(f"Gesamtverdienst: {euros(total_cents):.2f}€\n")
     
     print("Aktionen:")
     for action, count in sorted(action_counts.items(), key=lambda x: x[1], reverse=True):
-        print(f"  - {action}: {count}x")
+        print(f"  - {ACTIONS.value(action)}: {count}x")
 
 def backup_to_csv():
     """Backup als CSV exportieren"""
@@ -173,7 +211,7 @@ def backup_to_csv():
     try:
         with open(filename, 'w', encoding='utf-8') as f:
             # Header
-            f.write("Zeitstempel,KW,Username,User-ID,Aktion,Beschreibung,Betrag,Bild-URL\n")
+            f.write("Zeitstempel,KW,Username,User-ID,Aktion,Beschreibung,Betrag,Bild-URL,Log-ID\n")
             
             # Daten
             for row in logs:
@@ -203,7 +241,8 @@ def delete_logs_before_date():
     if not service:
         return
     
-    logs = get_all_logs()
+    # Nur der Logs-Tab wird neu geschrieben (Wochen-Tabs bleiben unverändert)
+    logs = get_all_logs(include_weeks=False)
     if not logs:
         print("Keine Logs gefunden.")
         return
@@ -239,20 +278,20 @@ def delete_logs_before_date():
         sheet = service.spreadsheets()
         
         # Leeren
-        sheet.values().clear(
+        quota.run(sheet.values().clear(
             spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
+            range='Logs!A2:I'
+        ))
         
         # Neu schreiben
         if kept_logs:
             body = {'values': kept_logs}
-            sheet.values().update(
+            quota.run(sheet.values().update(
                 spreadsheetId=SPREADSHEET_ID,
-                range='Logs!A2:H',
+                range='Logs!A2:I',
                 valueInputOption='USER_ENTERED',
                 body=body
-            ).execute()
+            ))
         
         print(f"✅ {deleted_count} Logs gelöscht.")
     except Exception as e:
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wochen-Aggregate für Discord Log Bot
+In-Memory Index mit Summen pro Woche und User, der bei jedem Log und jeder
+Archivierung in O(1) aktualisiert wird. Kann auch aus den vorab summierten
+Zeilen des _Aggregates-Tabs aufgebaut werden
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from local_store import cell_text, parse_amount
+from records import ACTIONS, LogRecord, euros, parse_row, to_cents
+from weeks import parse_week
+
+
+class UserWeekAggregate:
+    """Verdienst (in Cent), Anzahl Logs und Aktions-Breakdown eines Users in einer Woche"""
+    __slots__ = ('user_id', 'username', 'cents', 'logs', 'breakdown')
+
+    def __init__(self, user_id: str, username: str, actions: Iterable[str]):
+        self.user_id = user_id
+        self.username = username
+        self.cents = 0
+        self.logs = 0
+        self.breakdown = {action: 0 for action in actions}
+
+    @property
+    def total(self) -> float:
+        """Verdienst in Euro (aus ganzen Cent, ohne Rundungsdrift)"""
+        return euros(self.cents)
+
+    def to_dict(self) -> Dict:
+        """Als Dict im Format der bisherigen Helper-Funktionen"""
+        return {
+            'user_id': self.user_id,
+            'username': self.username,
+            'total': self.total,
+            'cents': self.cents,
+            'logs': self.logs,
+            'breakdown': dict(self.breakdown)
+        }
+
+
+class WeekAggregateIndex:
+    """
+    Aggregat-Index: ISO-Woche (202642) -> User-ID -> UserWeekAggregate
+
+    Zusätzlich werden die Aktionszähler pro Woche gepflegt, damit der
+    Wochenbericht ohne Iteration über einzelne Logs auskommt.
+    """
+
+    def __init__(self, actions: Iterable[str]):
+        self.actions = list(actions)
+        for action in self.actions:
+            ACTIONS.code(action)
+        self.weeks: Dict[int, Dict[str, UserWeekAggregate]] = {}
+        self.action_counts: Dict[int, Dict[str, int]] = {}
+
+    def add(self, record: LogRecord):
+        """Verbuche einen neuen Log"""
+        self._add(record.week, record.user_id, record.username, record.action_name, 1, record.cents)
+
+    def _add(self, week: int, user_id: str, username: str, action: str, logs: int, cents: int):
+        users = self.weeks.setdefault(week, {})
+        aggregate = users.get(user_id)
+        if aggregate is None:
+            aggregate = users[user_id] = UserWeekAggregate(user_id, username, self.actions)
+
+        aggregate.username = username
+        aggregate.cents += cents
+        aggregate.logs += logs
+        if action in aggregate.breakdown:
+            aggregate.breakdown[action] += logs
+
+        counts = self.action_counts.setdefault(week, {a: 0 for a in self.actions})
+        if action in counts:
+            counts[action] += logs
+
+    def add_row(self, row: List[Any]):
+        """Verbuche eine Zeile im Format des Logs-Tabs"""
+        record = parse_row(row)
+        if record is not None:
+            self.add(record)
+
+    def copy_weeks(self, other: 'WeekAggregateIndex', weeks: Iterable[int]):
+        """Übernimm die Aggregate einzelner Wochen aus einem anderen Index"""
+        for week in weeks:
+            users = other.weeks.get(week)
+            if users:
+                self.weeks[week] = dict(users)
+                self.action_counts[week] = dict(other.action_counts.get(week, {}))
+            else:
+                self.weeks.pop(week, None)
+                self.action_counts.pop(week, None)
+
+    def remove(self, record: LogRecord):
+        """Nimm einen archivierten Log wieder heraus"""
+        aggregate = self.user(record.week, record.user_id)
+        if aggregate is None:
+            return
+
+        self._add(record.week, record.user_id, aggregate.username, record.action_name, -1, -record.cents)
+        if aggregate.logs <= 0:
+            self.remove_user(record.week, record.user_id)
+
+    def remove_row(self, row: List[Any]):
+        """Nimm eine archivierte Zeile wieder heraus (Layout des Logs- oder Archiv-Tabs)"""
+        record = parse_row(row)
+        if record is not None:
+            self.remove(record)
+
+    def remove_user(self, week: int, user_id: str) -> Optional[UserWeekAggregate]:
+        """Entferne das Aggregat eines Users (nach Archivierung)"""
+        users = self.weeks.get(week)
+        if not users:
+            return None
+
+        aggregate = users.pop(str(user_id), None)
+        if aggregate is None:
+            return None
+
+        counts = self.action_counts.get(week, {})
+        for action, count in aggregate.breakdown.items():
+            if action in counts:
+                counts[action] -= count
+
+        if not users:
+            del self.weeks[week]
+            self.action_counts.pop(week, None)
+        return aggregate
+
+    def add_summary_row(self, row: List[Any]):
+        """
+        Verbuche eine Zeile des _Aggregates-Tabs (KW, User-ID, Username, Aktion, Anzahl, Summe)
+
+        Die Zeile trägt nur das KW-Label ohne Zeitstempel. Ältere Labels am
+        Jahreswechsel landen dadurch ggf. im falschen Jahr, siehe
+        ``is_year_boundary_week``.
+        """
+        if len(row) < 6:
+            return
+
+        week = parse_week(row[0])
+        if week is None:
+            return
+
+        try:
+            logs = int(parse_amount(row[4]))
+            cents = to_cents(row[5])
+        except ValueError:
+            return
+
+        self._add(week, sys.intern(cell_text(row[1])), str(row[2]), str(row[3]), logs, cents)
+
+    def rebuild(self, rows: Iterable[List[Any]]):
+        """Baue den Index komplett neu auf (Start / Recovery)"""
+        self.weeks = {}
+        self.action_counts = {}
+        for row in rows:
+            self.add_row(row)
+
+    def rebuild_from_summary(self, rows: Iterable[List[Any]]):
+        """Baue den Index aus den Zeilen des _Aggregates-Tabs auf"""
+        self.weeks = {}
+        self.action_counts = {}
+        for row in rows:
+            self.add_summary_row(row)
+
+    # ==================== LOOKUPS ====================
+
+    def user(self, week: int, user_id: str) -> Optional[UserWeekAggregate]:
+        """Aggregat eines Users in einer Woche"""
+        return self.weeks.get(week, {}).get(str(user_id))
+
+    def users(self, week: int) -> List[UserWeekAggregate]:
+        """Alle User einer Woche, sortiert nach Verdienst"""
+        users = list(self.weeks.get(week, {}).values())
+        users.sort(key=lambda a: a.cents, reverse=True)
+        return users
+
+    def week_action_counts(self, week: int) -> Dict[str, int]:
+        """Aktionszähler einer Woche"""
+        return dict(self.action_counts.get(week, {a: 0 for a in self.actions}))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lösch-Planer für Discord Log Bot
+Fasst zu löschende Zeilen zu möglichst wenigen zusammenhängenden Bereichen
+zusammen, damit ein Archiv-Lauf nur wenige deleteDimension-Requests braucht.
+Für das serverseitige Archivieren werden dieselben Bereiche per cutPaste
+ins Archiv verschoben
+
+Author: xPerpleXz
+License: MIT
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+def merge_row_ranges(row_numbers: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Fasse Zeilennummern zu Bereichen zusammen
+
+    Args:
+        row_numbers: 1-basierte Zeilennummern wie in Google Sheets
+
+    Returns:
+        Liste von 0-basierten ``[startIndex, endIndex)`` Bereichen, absteigend
+        sortiert (von unten nach oben löschen verschiebt keine anderen Bereiche)
+    """
+    ranges: List[Tuple[int, int]] = []
+
+    for row in sorted(set(row_numbers)):
+        start = row - 1
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((start, row))
+
+    ranges.reverse()
+    return ranges
+
+
+def build_delete_requests(sheet_id: int, ranges: List[Tuple[int, int]]) -> List[Dict]:
+    """Erzeuge deleteDimension-Requests für die übergebenen Bereiche"""
+    return [
+        {
+            'deleteDimension': {
+                'range': {
+                    'sheetId': sheet_id,
+                    'dimension': 'ROWS',
+                    'startIndex': start,
+                    'endIndex': end
+                }
+            }
+        }
+        for start, end in ranges
+    ]
+
+
+# Logs A:H -> Archiv A:H; Archiv I (Archiv-Datum) und J (Log-ID) stehen schon im Stempel
+ARCHIVE_MOVE_COLUMNS = (0, 8)
+
+
+def build_move_requests(source_id: int, archive_id: int, row_targets: Dict[int, int]) -> List[Dict]:
+    """
+    Erzeuge cutPaste-Requests, die Zeilen auf ihre Stempel-Zeilen im Archiv verschieben
+
+    Args:
+        row_targets: 1-basierte Zeile im Quell-Tab -> 1-basierte Zielzeile im Archiv
+
+    Returns:
+        Ein Request pro Lauf, in dem Quell- und Zielzeilen zusammenhängend
+        sind, unabhängig von der Zeilenanzahl
+    """
+    runs: List[List[int]] = []  # [erste Quellzeile, letzte Quellzeile, erste Zielzeile]
+
+    for row in sorted(row_targets):
+        target = row_targets[row]
+        if runs and runs[-1][1] + 1 == row and runs[-1][2] + row - runs[-1][0] == target:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row, target])
+
+    first_column, last_column = ARCHIVE_MOVE_COLUMNS
+    return [
+        {
+            'cutPaste': {
+                'source': {
+                    'sheetId': source_id,
+                    'startRowIndex': first - 1,
+                    'endRowIndex': last,
+                    'startColumnIndex': first_column,
+                    'endColumnIndex': last_column
+                },
+                'destination': {'sheetId': archive_id, 'rowIndex': target - 1, 'columnIndex': first_column},
+                # Nur Werte, das Archiv behält sein eigenes Format
+                'pasteType': 'PASTE_VALUES'
+            }
+        }
+        for first, last, target in runs
+    ]
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aggregations-Benchmark für Discord Log Bot
+Misst Kaltstart, Wochen-Aggregate, Wochenbericht, Admin-Statistik und
+Archivierung auf synthetischen Logs-Daten gegen den Fake-Sheets-Backend
+
+Pro Szenario und Datenmenge: Laufzeit (Median/Min über mehrere Durchläufe),
+Spitzen-Speicher (tracemalloc, eigener Durchlauf) und Sheets-Requests pro
+Methode. Die Ergebnisse landen als JSON in einer Datei und können mit
+``--compare`` gegen einen früheren Lauf verglichen werden.
+
+Verwendung:
+    python benchmarks/bench_aggregation.py --sizes 10000 100000
+    python benchmarks/bench_aggregation.py --compare bench_results_alt.json
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Vor dem Import des Bots: Fake-Sheets und temporärer lokaler Spiegel
+WORKDIR = tempfile.mkdtemp(prefix='logbot-bench-')
+os.environ['FAKE_SHEETS'] = '1'
+os.environ.setdefault('SPREADSHEET_ID', 'benchmark')
+os.environ['LOCAL_DB_PATH'] = os.path.join(WORKDIR, 'bootstrap.db')
+
+# Gemessen wird die Verarbeitung, nicht das Warten auf das Google-Budget
+os.environ.setdefault('SHEETS_READ_PER_MINUTE', '1000000')
+os.environ.setdefault('SHEETS_WRITE_PER_MINUTE', '1000000')
+
+import admin_tools  # noqa: E402
+import bot as logbot  # noqa: E402
+import fake_sheets  # noqa: E402
+from aggregates import WeekAggregateIndex  # noqa: E402
+from archive_planner import merge_row_ranges, build_delete_requests  # noqa: E402
+from local_store import LocalStore  # noqa: E402
+from weeks import current_week  # noqa: E402
+
+SPREADSHEET_ID = os.environ['SPREADSHEET_ID']
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+ACTIONS = list(logbot.PAYMENT_AMOUNTS.keys())
+ACTION_WEIGHTS = [6, 3, 1]  # Düngen am häufigsten
+
+LOG_HEADER = ['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Log-ID']
+PAYOUT_HEADER = ['Zeitstempel', 'KW', 'Username', 'User-ID', 'Betrag', 'Logs', 'Status', 'Admin', 'Payout-ID']
+ARCHIVE_HEADER = LOG_HEADER[:8] + ['Archiviert am', 'Log-ID']
+
+
+# ==================== DATEN ====================
+
+def generate_logs(count: int, weeks: int = 52, seed: int = 42) -> List[List[Any]]:
+    """
+    Synthetische Logs im Format des Logs-Tabs
+
+    Wenige sehr aktive und viele gelegentliche User (Zipf-Verteilung),
+    Zeitstempel über ``weeks`` Wochen bis heute, aufsteigend sortiert.
+    """
+    rng = random.Random(seed)
+    users = max(20, count // 500)
+    user_weights = [1 / (rank ** 1.1) for rank in range(1, users + 1)]
+
+    now = datetime.now()
+    start = now - timedelta(weeks=weeks)
+    span = (now - start).total_seconds()
+    offsets = sorted(rng.random() * span for _ in range(count))
+
+    user_ids = rng.choices(range(users), weights=user_weights, k=count)
+    actions = rng.choices(ACTIONS, weights=ACTION_WEIGHTS, k=count)
+
+    rows = []
+    for log_id, (offset, user, action) in enumerate(zip(offsets, user_ids, actions), 1):
+        moment = start + timedelta(seconds=offset)
+        rows.append([
+            moment.strftime("%d.%m.%Y %H:%M:%S"),
+            f"KW{moment.isocalendar()[1]}/{moment.year}",
+            f"member{user:05d}",
+            str(100000000000000000 + user),
+            action,
+            f"Benchmark {log_id}",
+            logbot.PAYMENT_AMOUNTS[action],
+            '',
+            log_id
+        ])
+    return rows
+
+
+def prepare(size: int, latency: float) -> Dict:
+    """Frischer Fake-Backend mit ``size`` Logs, frischer lokaler Spiegel"""
+    service = fake_sheets.FakeSheetsService(latency=latency, seed=size)
+    service.seed_rows(SPREADSHEET_ID, 'Logs', [LOG_HEADER] + generate_logs(size))
+    service.seed_rows(SPREADSHEET_ID, 'Auszahlungen', [PAYOUT_HEADER])
+    service.seed_rows(SPREADSHEET_ID, 'Archiv', [ARCHIVE_HEADER])
+    fake_sheets._shared = service
+
+    db_path = os.path.join(WORKDIR, f'bench-{size}-{time.monotonic_ns()}.db')
+    logbot.bot.store = LocalStore(db_path)
+    logbot.bot.index = WeekAggregateIndex(ACTIONS)
+    logbot.bot.sheets_service = None
+    if not logbot.bot.connect_sheets():
+        raise RuntimeError("Fake Sheets konnte nicht verbunden werden")
+    return {'service': service, 'db_path': db_path}
+
+
+# ==================== MESSUNG ====================
+
+def measure(
+    run: Callable[[], Any],
+    service: fake_sheets.FakeSheetsService,
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None
+) -> Dict:
+    """Laufzeit (``repeat`` Durchläufe), danach ein Durchlauf mit tracemalloc"""
+    durations = []
+    calls: Dict[str, int] = {}
+    for attempt in range(repeat):
+        if setup:
+            setup()
+        service.reset_stats()
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+        if attempt == 0:
+            calls = {name.replace('sheets.spreadsheets.', ''): count for name, count in service.calls.items()}
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_ms': statistics.median(durations) * 1000,
+        'min_ms': min(durations) * 1000,
+        'runs': len(durations),
+        'peak_kib': peak / 1024,
+        'api_calls': calls,
+        'api_calls_total': sum(calls.values())
+    }
+
+
+def quiet(function: Callable[[], Any]) -> Callable[[], Any]:
+    """Unterdrücke die print-Ausgaben des Bots während der Messung"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function()
+    return run
+
+
+def run_size(size: int, repeat: int, latency: float) -> Dict:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    run_async = lambda coroutine_function: quiet(lambda: loop.run_until_complete(coroutine_function()))  # noqa: E731
+
+    try:
+        context = prepare(size, latency)
+        service = context['service']
+
+        # Wochenbericht braucht bot.user für das Author-Icon
+        logbot.bot._connection.user = SimpleNamespace(display_avatar=SimpleNamespace(url=''))
+
+        results = {}
+
+        # Kaltstart: Sheets -> lokaler Spiegel -> Aggregate
+        results['cold_start'] = measure(run_async(logbot.sync_store_from_sheets), service, repeat)
+
+        results['index_rebuild'] = measure(quiet(logbot.rebuild_index), service, repeat)
+        results['get_all_users_with_earnings'] = measure(run_async(logbot.get_all_users_with_earnings), service, repeat)
+
+        top_user = int(service.rows(SPREADSHEET_ID, 'Logs')[1][3])
+        week_users = loop.run_until_complete(logbot.get_all_users_with_earnings())
+        if week_users:
+            top_user = int(week_users[0]['user_id'])
+
+        results['get_user_week_earnings'] = measure(
+            run_async(lambda: logbot.get_user_week_earnings(top_user)), service, repeat
+        )
+        results['generate_weekly_stats'] = measure(run_async(logbot.generate_weekly_stats), service, repeat)
+        results['admin_stats_overall'] = measure(quiet(admin_tools.stats_overall), service, repeat)
+
+        # Archiv-Planung: alle Zeilen des aktivsten Users über alle Wochen
+        user_rows = [
+            number for number, row in enumerate(service.rows(SPREADSHEET_ID, 'Logs')[1:], 2)
+            if int(row[3]) == top_user
+        ]
+        results['archive_planner'] = measure(
+            lambda: build_delete_requests(0, merge_row_ranges(user_rows)), service, repeat
+        )
+        results['archive_planner']['rows'] = len(user_rows)
+
+        # Archivierung Ende-zu-Ende: verändert die Daten, daher vor jedem
+        # Durchlauf Tabs und lokalen Spiegel zurücksetzen
+        week = current_week()
+        spreadsheet = service.spreadsheet(SPREADSHEET_ID)
+        snapshot = {tab.title: ([list(row) for row in tab.rows], tab.row_count) for tab in spreadsheet.tabs}
+
+        def restore():
+            for tab in spreadsheet.tabs:
+                rows, row_count = snapshot[tab.title]
+                tab.rows = [list(row) for row in rows]
+                tab.row_count = row_count
+            loop.run_until_complete(logbot.sync_store_from_sheets())
+
+        async def archive():
+            await logbot.archive_user_logs(top_user, week)
+            await logbot.replicate_pending()
+
+        results['archive_user_logs'] = measure(run_async(archive), service, min(repeat, 3), setup=quiet(restore))
+
+        logbot.bot.store.close()
+        os.remove(context['db_path'])
+        return results
+    finally:
+        loop.close()
+
+
+# ==================== AUSGABE ====================
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return 'unbekannt'
+
+
+def print_table(results: Dict, baseline: Optional[Dict] = None):
+    print(f"\n{'Szenario':<30} {'Logs':>9} {'Median ms':>11} {'Peak KiB':>10} {'API':>5} {'Δ Median':>9}")
+    print("-" * 80)
+    for size, scenarios in results['sizes'].items():
+        for name, result in scenarios.items():
+            delta = ''
+            old = (baseline or {}).get('sizes', {}).get(size, {}).get(name)
+            if old and old['median_ms']:
+                delta = f"{(result['median_ms'] / old['median_ms'] - 1) * 100:+.0f}%"
+            print(
+                f"{name:<30} {int(size):>9} {result['median_ms']:>11.2f} "
+                f"{result['peak_kib']:>10.0f} {result['api_calls_total']:>5} {delta:>9}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregations-Benchmark (Fake Sheets)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Anzahl Logs pro Lauf")
+    parser.add_argument('--repeat', type=int, default=5, help="Durchläufe pro Szenario")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulierte Sheets-Latenz in Sekunden")
+    parser.add_argument('--output', default='bench_results.json', help="JSON-Ergebnisdatei")
+    parser.add_argument('--compare', help="Früherer JSON-Lauf zum Vergleich")
+    args = parser.parse_args()
+
+    results = {
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'latency': args.latency,
+        'sizes': {}
+    }
+
+    for size in args.sizes:
+        print(f"⏱️ {size} Logs...")
+        results['sizes'][str(size)] = run_size(size, args.repeat, args.latency)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_table(results, baseline)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Ergebnisse gespeichert: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
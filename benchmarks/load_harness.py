@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Last-Harness für Discord Log Bot
+Simuliert viele gleichzeitige Mitglieder und Admins mit nachgebauten
+Discord-Interactions gegen den Fake-Sheets-Backend mit Latenz
+
+Getrieben werden die echten Handler: ``/log`` -> Aktionsauswahl ->
+``LogModal.on_submit`` (inkl. Bild-Upload), ``LogView.stats_button``,
+``/panel``, Panel-Aktualisierung, ``/auszahlung`` mit Bestätigung und
+optional eine Sammelauszahlung (``PayoutAllConfirmView.confirm``).
+
+Gemessen werden pro Handler die Zeit bis zur ersten Antwort an Discord
+(defer / send_message / send_modal) und bis zur letzten Folgenachricht.
+Jede Interaction, deren erste Antwort nicht innerhalb von 3 Sekunden
+ankommt, wird gemeldet - genau dann sehen Mitglieder
+"Die Interaktion ist fehlgeschlagen".
+
+Verwendung:
+    python benchmarks/load_harness.py --members 300 --admins 5 --sheets-latency 0.4
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+# Realistische Quota (wie in Produktion) - vor dem Import des Bots setzen
+os.environ.setdefault('SHEETS_READ_PER_MINUTE', '60')
+os.environ.setdefault('SHEETS_WRITE_PER_MINUTE', '60')
+os.environ['LOG_OUTPUT_CHANNEL_ID'] = ''
+
+import bench_aggregation as bench  # noqa: E402  (setzt Fake-Sheets und temporären Spiegel)
+from bench_aggregation import logbot  # noqa: E402
+
+# Discord verlangt die erste Antwort innerhalb von 3 Sekunden
+ACK_DEADLINE = 3.0
+
+# Folgenachrichten von LogModal.on_submit: Aufforderung zum Upload bzw. Timeout beim Warten aufs Bild
+IMAGE_PROMPT_TITLE = "📸 Bitte Bild hochladen"
+IMAGE_TIMEOUT_TITLE = "⏱️ Zeit abgelaufen"
+
+
+# ==================== FAKE DISCORD ====================
+
+class InteractionRecord:
+    """Zeitpunkte einer simulierten Interaction"""
+
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.start = time.perf_counter()
+        self.ack: Optional[float] = None
+        self.followups: List[float] = []
+        self.upload: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def time_to_ack(self) -> Optional[float]:
+        return self.ack - self.start if self.ack is not None else None
+
+    @property
+    def time_to_followup(self) -> Optional[float]:
+        """Letzte Folgenachricht, ab Upload des Bildes (Modal) bzw. Start"""
+        if not self.followups:
+            return None
+        return self.followups[-1] - max(self.start, self.upload or 0.0)
+
+    @property
+    def missed(self) -> bool:
+        return self.time_to_ack is None or self.time_to_ack > ACK_DEADLINE
+
+
+class DiscordSimulator:
+    """Simulierte Latenz der Discord-API und gesammelte Records"""
+
+    def __init__(self, latency: float, jitter: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.records: List[InteractionRecord] = []
+
+    async def call(self):
+        await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+
+    def interaction(self, handler: str, user: 'FakeMember', guild: 'FakeGuild', channel: 'FakeChannel') -> 'FakeInteraction':
+        record = InteractionRecord(handler)
+        self.records.append(record)
+        return FakeInteraction(self, record, user, guild, channel)
+
+
+class FakeMessage:
+    def __init__(self, simulator: DiscordSimulator, record: InteractionRecord, kwargs: Dict):
+        self._simulator = simulator
+        self._record = record
+        self.kwargs = kwargs
+
+    async def edit(self, **kwargs):
+        await self._simulator.call()
+        self._record.followups.append(time.perf_counter())
+        self.kwargs.update(kwargs)
+
+
+class FakeResponse:
+    """Gegenstück zu discord.InteractionResponse"""
+
+    def __init__(self, simulator: DiscordSimulator, record: InteractionRecord):
+        self._simulator = simulator
+        self._record = record
+        self.view = None
+        self.modal = None
+
+    def is_done(self) -> bool:
+        return self._record.ack is not None
+
+    async def _respond(self):
+        if self.is_done():
+            raise RuntimeError("Interaction wurde bereits beantwortet")
+        await self._simulator.call()
+        self._record.ack = time.perf_counter()
+
+    async def defer(self, ephemeral: bool = False, thinking: bool = False):
+        await self._respond()
+
+    async def send_message(self, *args, view=None, **kwargs):
+        self.view = view
+        await self._respond()
+
+    async def send_modal(self, modal):
+        self.modal = modal
+        await self._respond()
+
+    async def edit_message(self, *args, view=None, **kwargs):
+        self.view = view
+        await self._respond()
+
+
+class FakeFollowup:
+    """Gegenstück zu interaction.followup (Webhook)"""
+
+    def __init__(self, simulator: DiscordSimulator, record: InteractionRecord, response: FakeResponse):
+        self._simulator = simulator
+        self._record = record
+        self._response = response
+        self.view = None
+        # Wird mit dem Embed-Titel jeder Folgenachricht aufgerufen (z.B. Bild-Upload auslösen)
+        self.on_send: Optional[Callable[[Optional[str]], None]] = None
+
+    async def send(self, *args, view=None, **kwargs) -> FakeMessage:
+        if not self._response.is_done():
+            raise RuntimeError("Followup vor der ersten Antwort")
+        await self._simulator.call()
+        self._record.followups.append(time.perf_counter())
+        if view is not None:
+            self.view = view
+
+        embed = kwargs.get('embed')
+        title = embed.title if embed is not None else None
+        if title == IMAGE_TIMEOUT_TITLE:
+            self._record.error = "Bild nicht empfangen (Timeout in wait_for)"
+        if self.on_send is not None:
+            self.on_send(title)
+        return FakeMessage(self._simulator, self._record, kwargs)
+
+
+class FakeMember:
+    def __init__(self, simulator: DiscordSimulator, user_id: int, name: str, admin: bool = False):
+        self._simulator = simulator
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.mention = f'<@{user_id}>'
+        self.bot = False
+        self.roles = []
+        self.display_avatar = SimpleNamespace(url='')
+        self.guild_permissions = SimpleNamespace(administrator=admin)
+
+    async def send(self, *args, **kwargs):
+        await self._simulator.call()
+
+
+class FakeGuild:
+    def __init__(self, members: List[FakeMember]):
+        self.id = 1
+        self.icon = None
+        self._members = {member.id: member for member in members}
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+
+class FakeInteraction:
+    """Gegenstück zu discord.Interaction (nur was die Handler nutzen)"""
+
+    def __init__(self, simulator: DiscordSimulator, record: InteractionRecord, user: FakeMember, guild: FakeGuild, channel: FakeChannel):
+        self.record = record
+        self.user = user
+        self.guild = guild
+        self.channel = channel
+        self.response = FakeResponse(simulator, record)
+        self.followup = FakeFollowup(simulator, record, self.response)
+
+
+async def run_handler(interaction: FakeInteraction, handler, *args):
+    """Handler ausführen, Fehler im Record vermerken statt abzubrechen"""
+    try:
+        await handler(interaction, *args)
+    except Exception as e:
+        interaction.record.error = f'{type(e).__name__}: {e}'
+
+
+# ==================== ABLÄUFE ====================
+
+async def member_flow(sim: DiscordSimulator, member: FakeMember, guild: FakeGuild, args, rng: random.Random):
+    channel = FakeChannel(10_000 + member.id)
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+
+    for _ in range(args.logs_per_member):
+        # /log -> LogView
+        interaction = sim.interaction('log_command', member, guild, channel)
+        await run_handler(interaction, logbot.log_command.callback)
+        view = interaction.response.view
+        if view is None:
+            return
+
+        # Aktion wählen -> LogModal
+        select = next(item for item in view.children if isinstance(item, logbot.ActionSelect))
+        interaction = sim.interaction('ActionSelect.callback', member, guild, channel)
+        select._refresh_state(interaction, {'values': [rng.choice(bench.ACTIONS)]})
+        await run_handler(interaction, lambda i: select.callback(i))
+        modal = interaction.response.modal
+        if modal is None:
+            return
+
+        # Modal abschicken, Bild kommt nach kurzer Bedenkzeit ab der Aufforderung
+        interaction = sim.interaction('LogModal.on_submit', member, guild, channel)
+        modal.description._refresh_state(interaction, {'value': 'Lasttest'})
+        uploads = []
+
+        def on_send(title, record=interaction.record):
+            # Erst nach "Bitte Bild hochladen" wartet on_submit per wait_for auf die Nachricht
+            if title == IMAGE_PROMPT_TITLE:
+                uploads.append(asyncio.create_task(upload_image(member, channel, record, rng.uniform(0, args.think))))
+
+        interaction.followup.on_send = on_send
+        await run_handler(interaction, modal.on_submit)
+        await asyncio.gather(*uploads)
+
+        # Eigene Statistik
+        interaction = sim.interaction('LogView.stats_button', member, guild, channel)
+        await run_handler(interaction, view.stats_button.callback)
+
+        await asyncio.sleep(rng.uniform(0, args.think))
+
+
+async def upload_image(member: FakeMember, channel: FakeChannel, record: InteractionRecord, delay: float):
+    """Simuliere den Bild-Upload, auf den LogModal.on_submit nach der Aufforderung wartet"""
+    await asyncio.sleep(delay)
+    record.upload = time.perf_counter()
+    message = SimpleNamespace(
+        author=SimpleNamespace(id=member.id, bot=True),  # bot=True: keine Prefix-Command-Verarbeitung
+        channel=channel,
+        attachments=[SimpleNamespace(url=f'https://cdn.example/{member.id}.png')]
+    )
+    logbot.bot.dispatch('message', message)
+
+
+async def admin_flow(sim: DiscordSimulator, admin: FakeMember, guild: FakeGuild, payees: List[FakeMember], args, rng: random.Random):
+    channel = FakeChannel(20_000 + admin.id)
+    # Erst wenn die ersten Mitglieder geloggt haben, gibt es etwas auszuzahlen
+    await asyncio.sleep(args.ramp + args.think + rng.uniform(0, args.ramp))
+
+    for payee in payees:
+        # /panel und Aktualisieren
+        interaction = sim.interaction('panel_command', admin, guild, channel)
+        await run_handler(interaction, logbot.panel_command.callback)
+        panel = interaction.followup.view
+        if panel is not None:
+            interaction = sim.interaction('PayoutPanelView.refresh', admin, guild, channel)
+            await run_handler(interaction, panel.refresh.callback)
+
+        # /auszahlung @mitglied -> bestätigen
+        interaction = sim.interaction('payout_command', admin, guild, channel)
+        await run_handler(interaction, logbot.payout_command.callback, payee)
+        confirm_view = interaction.followup.view
+        if confirm_view is not None:
+            interaction = sim.interaction('PayoutConfirmView.confirm', admin, guild, channel)
+            await run_handler(interaction, confirm_view.confirm.callback)
+
+        await asyncio.sleep(rng.uniform(0, args.think))
+
+
+async def bulk_payout(sim: DiscordSimulator, admin: FakeMember, guild: FakeGuild):
+    """Panel öffnen und alle auszahlen"""
+    channel = FakeChannel(30_000)
+    interaction = sim.interaction('panel_command', admin, guild, channel)
+    await run_handler(interaction, logbot.panel_command.callback)
+    panel = interaction.followup.view
+    if panel is None:
+        return
+
+    interaction = sim.interaction('PayoutPanelView.payout_all', admin, guild, channel)
+    await run_handler(interaction, panel.payout_all.callback)
+    confirm_view = interaction.response.view
+    if confirm_view is None:
+        return
+
+    interaction = sim.interaction('PayoutAllConfirmView.confirm', admin, guild, channel)
+    await run_handler(interaction, confirm_view.confirm.callback)
+
+
+# ==================== AUSWERTUNG ====================
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def summarize(records: List[InteractionRecord]) -> Dict:
+    by_handler: Dict[str, List[InteractionRecord]] = {}
+    for record in records:
+        by_handler.setdefault(record.handler, []).append(record)
+
+    summary = {}
+    for handler, items in sorted(by_handler.items()):
+        acks = [r.time_to_ack for r in items if r.time_to_ack is not None]
+        followups = [r.time_to_followup for r in items if r.time_to_followup is not None]
+        summary[handler] = {
+            'count': len(items),
+            'errors': sum(1 for r in items if r.error),
+            'missed_ack': sum(1 for r in items if r.missed),
+            'ack_ms': {f'p{p}': _ms(percentile(acks, p)) for p in (50, 95, 99)},
+            'followup_ms': {f'p{p}': _ms(percentile(followups, p)) for p in (50, 95, 99)}
+        }
+    return summary
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return round(value * 1000, 1) if value is not None else None
+
+
+def print_summary(summary: Dict, records: List[InteractionRecord]):
+    def fmt(value):
+        return f"{value:.0f}" if value is not None else '-'
+
+    print(f"\n{'Handler':<30} {'n':>5} {'ack p50':>8} {'p95':>7} {'p99':>7} {'follow p50':>11} {'p95':>7} {'p99':>7} {'>3s':>5} {'err':>4}")
+    print("-" * 100)
+    for handler, data in summary.items():
+        ack, followup = data['ack_ms'], data['followup_ms']
+        print(
+            f"{handler:<30} {data['count']:>5} {fmt(ack['p50']):>8} {fmt(ack['p95']):>7} {fmt(ack['p99']):>7} "
+            f"{fmt(followup['p50']):>11} {fmt(followup['p95']):>7} {fmt(followup['p99']):>7} "
+            f"{data['missed_ack']:>5} {data['errors']:>4}"
+        )
+
+    missed = [r for r in records if r.missed]
+    errors = [r for r in records if r.error]
+    if missed:
+        print(f"\n⚠️ {len(missed)} Interactions hätten das 3-Sekunden-Fenster verpasst:")
+        for record in missed[:20]:
+            ack = f"{record.time_to_ack * 1000:.0f} ms" if record.time_to_ack is not None else "keine Antwort"
+            print(f"   - {record.handler}: {ack}" + (f" ({record.error})" if record.error else ""))
+    elif not errors:
+        print("\n✅ Alle Interactions innerhalb von 3 Sekunden beantwortet")
+
+    if errors:
+        print(f"\n❌ {len(errors)} Interactions mit Fehlern:")
+    for record in errors[:10]:
+        print(f"❌ {record.handler}: {record.error}")
+
+
+# ==================== MAIN ====================
+
+async def run(args) -> Dict:
+    bench.prepare(args.seed_logs, args.sheets_latency)
+    service = bench.fake_sheets._shared
+    service.jitter = args.sheets_jitter
+    service.error_rate = args.sheets_error_rate
+
+    bot = logbot.bot
+    await bot._async_setup_hook()
+    bot._connection.user = SimpleNamespace(display_avatar=SimpleNamespace(url=''))
+
+    rng = random.Random(args.seed)
+    sim = DiscordSimulator(args.discord_latency, args.discord_jitter, args.seed)
+
+    members = [FakeMember(sim, 200000000000000000 + i, f'loadmember{i:04d}') for i in range(args.members)]
+    admins = [FakeMember(sim, 300000000000000000 + i, f'loadadmin{i:02d}', admin=True) for i in range(args.admins)]
+    guild = FakeGuild(members + admins)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        await logbot.sync_store_from_sheets()
+        bot.replayer.start()
+
+        # Jeder Admin zahlt ein paar eigene Mitglieder einzeln aus
+        payees = members[:args.admins * args.payouts_per_admin]
+        tasks = [member_flow(sim, member, guild, args, random.Random(rng.random())) for member in members]
+        tasks += [
+            admin_flow(sim, admin, guild, payees[i::args.admins], args, random.Random(rng.random()))
+            for i, admin in enumerate(admins)
+        ]
+
+        started = time.perf_counter()
+        await asyncio.gather(*tasks)
+        if args.bulk and admins:
+            await bulk_payout(sim, admins[0], guild)
+        duration = time.perf_counter() - started
+
+        await bot.replayer.stop()
+
+    summary = summarize(sim.records)
+    print_summary(summary, sim.records)
+    print(f"\n⏱️ {len(sim.records)} Interactions in {duration:.1f}s, Sheets-Requests: {sum(service.calls.values())}, injizierte Fehler: {sum(service.errors.values())}")
+
+    return {
+        'commit': bench.git_commit(),
+        'settings': vars(args),
+        'duration_s': duration,
+        'interactions': len(sim.records),
+        'missed_ack': sum(1 for r in sim.records if r.missed),
+        'errors': sum(1 for r in sim.records if r.error),
+        'sheets_calls': {name.replace('sheets.spreadsheets.', ''): count for name, count in service.calls.items()},
+        'handlers': summary
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Last-Harness für Discord-Interactions (Fake Sheets)")
+    parser.add_argument('--members', type=int, default=200, help="Gleichzeitige Mitglieder")
+    parser.add_argument('--admins', type=int, default=3, help="Gleichzeitige Admins")
+    parser.add_argument('--logs-per-member', type=int, default=2, help="Logs pro Mitglied")
+    parser.add_argument('--payouts-per-admin', type=int, default=3, help="Einzelauszahlungen pro Admin")
+    parser.add_argument('--bulk', action='store_true', help="Am Ende alle auszahlen")
+    parser.add_argument('--seed-logs', type=int, default=10_000, help="Vorhandene Logs im Fake-Spreadsheet")
+    parser.add_argument('--ramp', type=float, default=5.0, help="Startzeitpunkte verteilt über X Sekunden")
+    parser.add_argument('--think', type=float, default=2.0, help="Maximale Bedenkzeit zwischen Schritten")
+    parser.add_argument('--sheets-latency', type=float, default=0.3, help="Sheets-Latenz pro Request in Sekunden")
+    parser.add_argument('--sheets-jitter', type=float, default=0.4, help="Zusätzliche zufällige Sheets-Latenz")
+    parser.add_argument('--sheets-error-rate', type=float, default=0.02, help="Anteil fehlschlagender Sheets-Requests")
+    parser.add_argument('--discord-latency', type=float, default=0.05, help="Discord-API-Latenz in Sekunden")
+    parser.add_argument('--discord-jitter', type=float, default=0.05, help="Zusätzliche zufällige Discord-Latenz")
+    parser.add_argument('--seed', type=int, default=1, help="Seed für reproduzierbare Abläufe")
+    parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Ergebnisse gespeichert: {args.output}")
+
+    sys.exit(1 if results['missed_ack'] or results['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
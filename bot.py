@@ -16,6 +16,10 @@ from discord import app_commands
 import os
 from datetime import datetime, timedelta
 import asyncio
+import hashlib
+import random
+import time
+import uuid
 from typing import Optional, Dict, List, Tuple
 import json
 
@@ -24,6 +28,25 @@ from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from sheets_client import AsyncSheetsClient, UNFORMATTED_READ, column_ranges, expand_columns
+from local_store import LocalStore, LOCAL_DB_PATH, row_fingerprint, cell_text
+from aggregates import WeekAggregateIndex
+from records import euros
+from weeks import LOGS_PARTITIONED, current_week, is_year_boundary_week, parse_week, parse_week_tab, week_key, week_label, week_tab
+from write_queue import JournalReplayer, IdempotentAppender, LOG_WRITE_MAX_BATCH
+from archive_planner import merge_row_ranges, build_delete_requests, build_move_requests
+from rate_limit import TokenBucket, DM_RATE, DM_BURST
+from quota import QuotaLimiter
+from payout_executor import PayoutExecutor
+from fake_sheets import FAKE_SHEETS, shared_service as fake_sheets_service
+from premium_sheets_designer import (
+    AGGREGATES_HEADERS, AGGREGATES_TAB, LOG_HEADERS, COLORS as SHEET_COLORS, aggregates_formula, logs_tab_requests
+)
+from metrics import (
+    timed, start_metrics_server, CACHE_REQUESTS, JOURNAL_DEPTH,
+    PAYOUTS, PAYOUT_AMOUNT, PAYOUT_DMS
+)
+
 # Environment
 from dotenv import load_dotenv
 load_dotenv()
@@ -67,6 +90,31 @@ COLORS = {
     'gradient_end': 0xE0AAFF,     # Gradient End
 }
 
+# Logs-Tab regelmäßig auf neue Zeilen prüfen (Sekunden)
+LOGS_TAIL_INTERVAL = int(os.getenv('LOGS_TAIL_INTERVAL', 60))
+
+# Größe der Stichprobe für die Änderungserkennung im Logs-Tab
+LOGS_TAIL_SAMPLE = 20
+
+# Spalten für den Stichproben-Vergleich (KW, User-ID, Aktion, Betrag)
+FINGERPRINT_COLUMNS = ('B', 'D', 'E', 'G')
+
+# Spalten zum Finden der Zeilen eines Archiv-Auftrags (Zeitstempel für das ISO-Jahr, KW, User-ID, Log-ID)
+ARCHIVE_KEY_COLUMNS = ('A', 'B', 'D', 'I')
+
+# Archivieren: 'copy' (Zeilen lesen, anhängen, löschen) oder 'server' (cutPaste innerhalb von Google)
+ARCHIVE_MODE = os.getenv('ARCHIVE_MODE', 'copy').lower()
+
+# Erste Archiv-Zeile mit Stempeln eines noch nicht abgeschlossenen serverseitigen Laufs
+ARCHIVE_STAMPS_META = 'archive_stamps_from'
+
+# Wochen-Summen für Panel, Wochenbericht und Statistiken: 'local' (Index aus dem lokalen Spiegel)
+# oder 'sheet' (versteckter _Aggregates-Tab, von Google per QUERY berechnet)
+AGGREGATES_SOURCE = os.getenv('AGGREGATES_SOURCE', 'local').lower()
+
+# Wie lange eine gelesene Zusammenfassung gültig bleibt (Sekunden)
+AGGREGATES_TTL = int(os.getenv('AGGREGATES_TTL', 30))
+
 # Rollen-Konfiguration (aus .env oder Speicher)
 PAYOUT_ROLE_IDS = []
 CONFIG_FILE = 'config.json'
@@ -116,22 +164,144 @@ class LogBot(commands.Bot):
         )
         
         self.sheets_service = None
+        self.sheets: Optional[AsyncSheetsClient] = None
+        self.log_appender: Optional[IdempotentAppender] = None
+        self.payout_appender: Optional[IdempotentAppender] = None
+        self.archive_appender: Optional[IdempotentAppender] = None
+        
+        # Appender pro Wochen-Tab (LOGS_PARTITIONED), Tab-Titel -> Appender
+        self.week_appenders: Dict[str, IdempotentAppender] = {}
+        
+        # Zuletzt gelesene Zeilen des _Aggregates-Tabs (AGGREGATES_SOURCE=sheet)
+        self.summary_rows: Optional[List[List]] = None
+        self.summary_loaded_at = 0.0
+        self.summary_generation = 0
+        
+        # Lokaler Spiegel der Tabs - alle Lesezugriffe laufen hierüber
+        self.store = LocalStore(LOCAL_DB_PATH)
+        
+        # Wochen-Aggregate (Woche -> User -> Summen), in O(1) gepflegt
+        self.index = WeekAggregateIndex(PAYMENT_AMOUNTS.keys())
+        
+        # Überträgt das lokale Journal (offene Zeilen im Spiegel) nach Sheets
+        # (replicate_pending ist weiter unten definiert)
+        self.replayer = JournalReplayer(lambda: replicate_pending(), self.store.journal_depth)
+        JOURNAL_DEPTH.set_function(self.store.journal_depth)
+        
+        # Token Bucket für Discord-DMs (Sammelauszahlung)
+        self.dm_bucket = TokenBucket(DM_RATE, DM_BURST)
+        
+        self._connect_lock = asyncio.Lock()
+        self._startup_tasks: List[asyncio.Task] = []
+        self._metrics_runner = None
         
     async def setup_hook(self):
-        """Bot Initialisierung"""
-        await self.tree.sync()
+        """
+        Bot Initialisierung
+        
+        Blockiert den Gateway-Connect nicht: Slash-Command-Sync und Google
+        Sheets laufen als Hintergrund-Tasks, bis dahin arbeitet der Bot mit
+        dem lokalen Spiegel.
+        """
         print(f'Bot bereit: {self.user}')
         
-        # Google Sheets verbinden
-        self.sheets_service = self.init_google_sheets()
+        # Aggregate aus dem lokalen Spiegel - sofort einsatzbereit
+        rebuild_index()
+        
+        # Optionaler Metrik-Endpoint (METRICS_PORT)
+        try:
+            self._metrics_runner = await start_metrics_server()
+        except Exception as e:
+            print(f"⚠️ Metrik-Endpoint konnte nicht gestartet werden: {e}")
+        
+        # Parallel zum Gateway-Login
+        self._startup_tasks = [
+            asyncio.create_task(self.sync_commands()),
+            asyncio.create_task(self.start_sheets())
+        ]
         
         # Automatische wöchentliche Berichte starten
         if not self.weekly_report.is_running():
             self.weekly_report.start()
     
+    async def sync_commands(self):
+        """Synchronisiere die Slash-Commands nur, wenn sich der Command-Tree geändert hat"""
+        try:
+            payload = json.dumps(
+                [self.application_id] + [command.to_dict() for command in self.tree.get_commands()],
+                sort_keys=True,
+                default=str
+            )
+            tree_hash = hashlib.sha256(payload.encode()).hexdigest()
+            
+            if self.store.get_meta('command_tree_hash') == tree_hash:
+                print("⚡ Slash-Commands unverändert - Sync übersprungen")
+                return
+            
+            await self.tree.sync()
+            self.store.set_meta('command_tree_hash', tree_hash)
+            print("✅ Slash-Commands synchronisiert")
+            
+        except Exception as e:
+            print(f"❌ Fehler beim Synchronisieren der Slash-Commands: {e}")
+    
+    async def start_sheets(self):
+        """Google Sheets verbinden, Spiegel abgleichen und Hintergrund-Tasks starten"""
+        await self.ensure_sheets()
+        
+        # Lokalen Spiegel mit Sheets abgleichen (ohne Verbindung: lokaler Stand)
+        await sync_store_from_sheets()
+        
+        # Journal übertragen (auch Einträge aus einem früheren Ausfall)
+        self.replayer.start()
+        
+        # Google Token vor Ablauf erneuern (keine Latenzspitzen bei Usern)
+        if not self.token_loop.is_running():
+            self.token_loop.start()
+        
+        # Neue Zeilen aus dem Logs-Tab übernehmen (z.B. manuelle Einträge)
+        if not self.tail_loop.is_running():
+            self.tail_loop.change_interval(seconds=LOGS_TAIL_INTERVAL)
+            self.tail_loop.start()
+    
+    async def ensure_sheets(self) -> bool:
+        """Verbinde Google Sheets falls nötig (Service-Build läuft im Thread)"""
+        async with self._connect_lock:
+            if not self.sheets_service:
+                await asyncio.to_thread(self.connect_sheets)
+        return self.sheets_service is not None
+    
+    async def close(self):
+        """Letzten Journal-Durchgang versuchen, dann beenden"""
+        await self.replayer.stop()
+        if self._metrics_runner:
+            await self._metrics_runner.cleanup()
+        await super().close()
+    
+    def connect_sheets(self) -> bool:
+        """
+        Verbinde Google Sheets (beim Start und erneut nach einem Ausfall)
+        
+        Alle Appends tragen einen Idempotenz-Key (Log-ID / Payout-ID) und
+        sind dadurch wiederholbar.
+        """
+        self.sheets_service = self.init_google_sheets()
+        if self.sheets_service:
+            self.log_appender = IdempotentAppender(self.sheets, 'Logs!A:I', key_index=8, key_column='I')
+            self.payout_appender = IdempotentAppender(self.sheets, 'Auszahlungen!A:I', key_index=8, key_column='I')
+            self.archive_appender = IdempotentAppender(self.sheets, 'Archiv!A:J', key_index=9, key_column='J')
+            self.week_appenders = {}
+        return self.sheets_service is not None
+    
     def init_google_sheets(self):
         """Google Sheets API initialisieren - mit Base64 Support"""
         try:
+            # Option 0: In-Memory Fake für Lasttests (FAKE_SHEETS=1)
+            if FAKE_SHEETS:
+                service = fake_sheets_service()
+                self.sheets = AsyncSheetsClient(service, SPREADSHEET_ID, quota=QuotaLimiter())
+                return service
+            
             # Option 1: Base64 credentials (Railway/Cloud)
             if os.getenv('GOOGLE_CREDENTIALS_BASE64'):
                 import base64
@@ -155,7 +325,16 @@ class LogBot(commands.Bot):
                 )
                 print("✅ Google Sheets verbunden (File)")
             
-            service = build('sheets', 'v4', credentials=creds)
+            # Mitgeliefertes Discovery-Dokument - kein Discovery-Request beim Start
+            service = build('sheets', 'v4', credentials=creds, static_discovery=True, cache_discovery=False)
+            
+            # Async Client: alle Requests laufen außerhalb des Event Loops
+            self.sheets = AsyncSheetsClient(
+                service,
+                SPREADSHEET_ID,
+                credentials=creds,
+                quota=QuotaLimiter()
+            )
             return service
             
         except Exception as e:
@@ -171,6 +350,26 @@ class LogBot(commands.Bot):
             if channel:
                 embed = await generate_weekly_stats()
                 await channel.send(embed=embed)
+    
+    @tasks.loop(minutes=5)
+    async def token_loop(self):
+        """Erneuere das Google Token, bevor es abläuft"""
+        if not self.sheets:
+            return
+        try:
+            if await self.sheets.refresh_token():
+                stats = self.sheets.transport_stats()
+                print(
+                    f"📶 Sheets-Verbindungen: {stats['connections_reused']}/{stats['requests']} "
+                    f"wiederverwendet, {stats['connections_opened']} neu aufgebaut"
+                )
+        except Exception as e:
+            print(f"❌ Token-Erneuerung fehlgeschlagen: {e}")
+    
+    @tasks.loop(seconds=60)
+    async def tail_loop(self):
+        """Übernimm neue Zeilen aus dem Logs-Tab"""
+        await refresh_logs_tail()
 
 
 # Bot Instanz
@@ -197,26 +396,6 @@ def has_payout_permission():
 
 # ==================== HELPER FUNCTIONS ====================
 
-async def get_total_log_count() -> int:
-    """Hole die Gesamtanzahl aller Logs"""
-    if not bot.sheets_service:
-        return 0
-    
-    try:
-        sheet = bot.sheets_service.spreadsheets()
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:A'
-        ).execute()
-        
-        values = result.get('values', [])
-        return len(values)
-        
-    except Exception as e:
-        print(f"❌ Fehler beim Zählen der Logs: {e}")
-        return 0
-
-
 def create_progress_bar(current: int, target: int, length: int = 20) -> str:
     """Erstellt eine visuelle Progress Bar mit Metallic-Style"""
     if target == 0:
@@ -239,162 +418,96 @@ async def get_all_users_with_earnings() -> List[Dict]:
     Returns:
         List of {user_id, username, total, logs, breakdown}
     """
-    if not bot.sheets_service:
-        return []
-    
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
-        # Aktuelle Kalenderwoche
-        current_week = datetime.now().isocalendar()[1]
-        current_year = datetime.now().year
-        week_key = f"KW{current_week}/{current_year}"
-        
-        # Alle Logs abrufen
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        # User-Statistiken sammeln
-        user_stats = {}
-        
-        for row in values:
-            if len(row) >= 7:
-                if row[1] == week_key:
-                    user_id = row[3]
-                    username = row[2]
-                    action = row[4]
-                    amount = float(row[6])
-                    
-                    if user_id not in user_stats:
-                        user_stats[user_id] = {
-                            'user_id': user_id,
-                            'username': username,
-                            'total': 0,
-                            'logs': 0,
-                            'breakdown': {a: 0 for a in PAYMENT_AMOUNTS.keys()}
-                        }
-                    
-                    user_stats[user_id]['total'] += amount
-                    user_stats[user_id]['logs'] += 1
-                    if action in user_stats[user_id]['breakdown']:
-                        user_stats[user_id]['breakdown'][action] += 1
-        
         # Als Liste zurückgeben, sortiert nach Betrag
-        users = list(user_stats.values())
-        users.sort(key=lambda x: x['total'], reverse=True)
-        
-        return users
+        index = await summary_index()
+        return [aggregate.to_dict() for aggregate in index.users(current_week())]
         
     except Exception as e:
         print(f"❌ Fehler beim Abrufen der User-Earnings: {e}")
         return []
 
 
-async def get_user_week_earnings(user_id: int) -> Dict:
-    """Hole detaillierte Wochen-Statistiken für einen User"""
-    if not bot.sheets_service:
-        return {'total': 0, 'logs': 0, 'breakdown': {}, 'week': '', 'row_indices': []}
+async def get_user_week_earnings(user_id: int, summary: bool = False) -> Dict:
+    """
+    Hole detaillierte Wochen-Statistiken für einen User
     
+    Args:
+        summary: Aus ``summary_index`` lesen (Statistik-Button); sonst aus
+            dem lokalen Index ohne Google-Request (Fortschritt nach jedem
+            Log, /auszahlung)
+    """
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
-        current_week = datetime.now().isocalendar()[1]
-        current_year = datetime.now().year
-        week_key = f"KW{current_week}/{current_year}"
-        
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        total_earnings = 0
-        log_count = 0
-        breakdown = {action: 0 for action in PAYMENT_AMOUNTS.keys()}
-        row_indices = []  # Für Archivierung
-        
-        for i, row in enumerate(values):
-            if len(row) >= 7:
-                if row[1] == week_key and row[3] == str(user_id):
-                    action = row[4]
-                    amount = float(row[6])
-                    
-                    total_earnings += amount
-                    log_count += 1
-                    row_indices.append(i + 2)  # +2 wegen Header und 0-Index
-                    
-                    if action in breakdown:
-                        breakdown[action] += 1
+        week = current_week()
+        index = await summary_index() if summary else bot.index
+        aggregate = index.user(week, str(user_id))
+        
+        if aggregate is None:
+            return {
+                'total': 0,
+                'cents': 0,
+                'logs': 0,
+                'breakdown': {action: 0 for action in PAYMENT_AMOUNTS.keys()},
+                'week': week_label(week)
+            }
         
         return {
-            'total': total_earnings,
-            'logs': log_count,
-            'breakdown': breakdown,
-            'week': week_key,
-            'row_indices': row_indices
+            'total': aggregate.total,
+            'cents': aggregate.cents,
+            'logs': aggregate.logs,
+            'breakdown': dict(aggregate.breakdown),
+            'week': week_label(week)
         }
         
     except Exception as e:
         print(f"❌ Fehler beim Abrufen der Earnings: {e}")
-        return {'total': 0, 'logs': 0, 'breakdown': {}, 'week': '', 'row_indices': []}
+        return {'total': 0, 'cents': 0, 'logs': 0, 'breakdown': {}, 'week': ''}
 
 
-async def save_log(user: discord.Member, action_type: str, description: str, image_url: str) -> bool:
-    """Speichere Log in Google Sheets"""
-    if not bot.sheets_service:
-        return False
+async def save_log(user: discord.Member, action_type: str, description: str, image_url: str) -> Optional[int]:
+    """
+    Speichere Log im lokalen Journal, Google Sheets folgt im Hintergrund
+    
+    Gelingt auch ohne Verbindung zu Google - der Replayer überträgt den
+    Log, sobald Sheets wieder erreichbar ist.
     
+    Returns:
+        Fortlaufende Log-ID (None bei Fehler)
+    """
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
         now = datetime.now()
         timestamp = now.strftime("%d.%m.%Y %H:%M:%S")
-        week_number = now.isocalendar()[1]
-        year = now.year
         
         amount = PAYMENT_AMOUNTS.get(action_type, 0)
         
         values = [[
             timestamp,
-            f"KW{week_number}/{year}",
+            week_label(week_key(now)),
             user.name,
             str(user.id),
             action_type,
             description,
             amount,
-            image_url
+            image_url,
+            bot.store.next_log_id()
         ]]
         
-        body = {'values': values}
-        
-        result = sheet.values().append(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A:H',
-            valueInputOption='USER_ENTERED',
-            body=body
-        ).execute()
+        # Erst auf der Platte, dann nach Sheets
+        bot.store.insert_log(values[0])
+        bot.index.add_row(values[0])
+        schedule_replication()
         
-        print(f"✅ Log gespeichert: {user.name} - {action_type}")
-        return True
+        print(f"✅ Log #{values[0][8]} gespeichert: {user.name} - {action_type}")
+        return values[0][8]
         
-    except HttpError as error:
-        print(f"❌ Google Sheets Fehler: {error}")
-        return False
+    except Exception as error:
+        print(f"❌ Fehler beim Speichern des Logs: {error}")
+        return None
 
 
 async def save_payout(user_id: str, username: str, amount: float, week: str, log_count: int, admin_name: str) -> bool:
-    """Speichere Auszahlung in Google Sheets (Auszahlungen Tab)"""
-    if not bot.sheets_service:
-        return False
-    
+    """Speichere Auszahlung im lokalen Journal (Auszahlungen Tab folgt im Hintergrund)"""
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
         now = datetime.now()
         timestamp = now.strftime("%d.%m.%Y %H:%M:%S")
         
@@ -406,17 +519,15 @@ async def save_payout(user_id: str, username: str, amount: float, week: str, log
             amount,
             log_count,
             "Ausgezahlt",
-            admin_name
+            admin_name,
+            uuid.uuid4().hex
         ]]
         
-        body = {'values': values}
+        bot.store.insert_payout(values[0])
+        schedule_replication()
         
-        result = sheet.values().append(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Auszahlungen!A:H',
-            valueInputOption='USER_ENTERED',
-            body=body
-        ).execute()
+        PAYOUTS.inc(mode='single')
+        PAYOUT_AMOUNT.inc(float(amount))
         
         print(f"✅ Auszahlung gespeichert: {username} - {amount}€")
         return True
@@ -426,81 +537,21 @@ async def save_payout(user_id: str, username: str, amount: float, week: str, log
         return False
 
 
-async def archive_user_logs(user_id: int, week: str) -> bool:
+async def archive_user_logs(user_id: int, week: int) -> bool:
     """
-    Verschiebe User-Logs ins Archiv
+    Verschiebe User-Logs einer ISO-Woche (z.B. 202642) ins Archiv
     
-    1. Kopiere Logs ins Archiv-Tab
-    2. Lösche aus Logs-Tab
+    Die Logs werden sofort im lokalen Spiegel verschoben, das Archiv-Tab
+    und das Löschen im Logs-Tab werden im Hintergrund repliziert.
     """
-    if not bot.sheets_service:
-        return False
-    
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
-        # Alle Logs abrufen
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        # User-Logs finden
-        logs_to_archive = []
-        rows_to_delete = []
-        
-        for i, row in enumerate(values):
-            if len(row) >= 7:
-                if row[1] == week and row[3] == str(user_id):
-                    # Archiv-Datum hinzufügen
-                    archived_row = row + [datetime.now().strftime("%d.%m.%Y %H:%M:%S")]
-                    logs_to_archive.append(archived_row)
-                    rows_to_delete.append(i + 2)  # +2 für Header und 0-Index
-        
-        if not logs_to_archive:
-            return True  # Keine Logs zum Archivieren
-        
-        # 1. Ins Archiv kopieren
-        body = {'values': logs_to_archive}
-        sheet.values().append(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Archiv!A:I',
-            valueInputOption='USER_ENTERED',
-            body=body
-        ).execute()
-        
-        # 2. Aus Logs löschen (von hinten nach vorne um Index-Probleme zu vermeiden)
-        rows_to_delete.sort(reverse=True)
-        
-        # Get Sheet ID für Logs
-        spreadsheet = sheet.get(spreadsheetId=SPREADSHEET_ID).execute()
-        logs_sheet_id = None
-        for s in spreadsheet.get('sheets', []):
-            if s['properties']['title'] == 'Logs':
-                logs_sheet_id = s['properties']['sheetId']
-                break
-        
-        if logs_sheet_id is not None:
-            requests = []
-            for row_idx in rows_to_delete:
-                requests.append({
-                    'deleteDimension': {
-                        'range': {
-                            'sheetId': logs_sheet_id,
-                            'dimension': 'ROWS',
-                            'startIndex': row_idx - 1,
-                            'endIndex': row_idx
-                        }
-                    }
-                })
-            
-            if requests:
-                body = {'requests': requests}
-                sheet.batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
+        archived_at = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+        _, archived = bot.store.archive_logs(str(user_id), week, archived_at)
+        for row in archived:
+            bot.index.remove_row(row)
+        schedule_replication()
         
-        print(f"✅ {len(logs_to_archive)} Logs archiviert für User {user_id}")
+        print(f"✅ {len(archived)} Logs archiviert für User {user_id}")
         return True
         
     except Exception as e:
@@ -508,35 +559,651 @@ async def archive_user_logs(user_id: int, week: str) -> bool:
         return False
 
 
-async def get_user_stats(user_id: int) -> dict:
-    """Hole Statistiken für einen User (aktuelle Woche)"""
-    if not bot.sheets_service:
+# ==================== SHEETS REPLIKATION ====================
+
+_replication_lock = asyncio.Lock()
+
+
+def schedule_replication():
+    """Wecke den Replayer für neue Journal-Einträge"""
+    bot.replayer.notify()
+
+
+async def replicate_pending() -> bool:
+    """
+    Schreibe das lokale Journal nach Google Sheets
+    
+    Reihenfolge: Logs, Auszahlungen, unreplizierte archivierte Logs, dann
+    Archiv-Aufträge. Logs, die schon vor ihrer Replikation ausgezahlt bzw.
+    archiviert wurden, stehen in keinem Logs-Tab - sie gehen direkt aus dem
+    Journal ins Archiv-Tab (Log-ID als Key, daher ohne Duplikate, falls ein
+    verlorener Append sie doch in den Logs-Tab geschrieben hat). Große Rückstände
+    (z.B. nach einem Ausfall) werden in Batches von LOG_WRITE_MAX_BATCH
+    Zeilen übertragen.
+    
+    Läuft serialisiert, damit Zeilen-Indizes beim Löschen im Logs-Tab
+    nicht durch parallele Archivierungen verschoben werden. Alle offenen
+    Archiv-Aufträge werden gemeinsam in einem Durchgang ausgeführt.
+    """
+    if not await bot.ensure_sheets():
+        return False
+    
+    async with _replication_lock:
+        try:
+            while True:
+                pending_logs = bot.store.unsynced_logs(LOG_WRITE_MAX_BATCH)
+                if not pending_logs:
+                    break
+                if LOGS_PARTITIONED:
+                    await replicate_week_logs(pending_logs)
+                else:
+                    sheet_rows = await bot.log_appender.append([row for _, row in pending_logs])
+                    bot.store.mark_synced('logs', [log_id for log_id, _ in pending_logs], sheet_rows)
+                invalidate_summary()
+            
+            while True:
+                pending_payouts = bot.store.unsynced_payouts(LOG_WRITE_MAX_BATCH)
+                if not pending_payouts:
+                    break
+                await bot.payout_appender.append([row for _, row in pending_payouts])
+                bot.store.mark_synced('payouts', [payout_id for payout_id, _ in pending_payouts])
+            
+            while True:
+                archived_rows = bot.store.unsynced_archive(LOG_WRITE_MAX_BATCH)
+                if not archived_rows:
+                    break
+                await bot.archive_appender.append([row for _, row in archived_rows])
+                bot.store.mark_synced('archive', [archive_id for archive_id, _ in archived_rows])
+            
+            pending_archives = bot.store.pending_archives()
+            if pending_archives:
+                await replicate_archives(pending_archives)
+                bot.store.complete_archives([op[0] for op in pending_archives])
+                invalidate_summary()
+            
+            return True
+                
+        except Exception as e:
+            print(f"❌ Replikation nach Sheets fehlgeschlagen: {e}")
+            return False
+
+
+async def week_log_appender(week: int) -> IdempotentAppender:
+    """
+    Appender für den Wochen-Tab einer Woche (LOGS_PARTITIONED)
+    
+    Fehlt der Tab, wird er mit Header und dem Styling des Logs-Tabs angelegt.
+    """
+    tab = week_tab(week)
+    appender = bot.week_appenders.get(tab)
+    if appender is not None:
+        return appender
+    
+    if await bot.sheets.sheet_id(tab) is None:
+        sheet_id = await bot.sheets.add_tab(tab, rows=1000, columns=9, properties={'tabColor': SHEET_COLORS['primary']})
+        await bot.sheets.values_update(f'{tab}!A1:I1', [LOG_HEADERS])
+        await bot.sheets.batch_update(logs_tab_requests(sheet_id))
+        await update_aggregates_formula()
+        print(f"📄 Wochen-Tab {tab} angelegt")
+    
+    appender = IdempotentAppender(bot.sheets, f'{tab}!A:I', key_index=8, key_column='I')
+    bot.week_appenders[tab] = appender
+    return appender
+
+
+async def replicate_week_logs(pending_logs: List[Tuple[int, List]]):
+    """
+    Schreibe neue Logs in die Tabs ihrer Woche (ein Append pro Woche)
+    
+    Zeilen ohne lesbare KW landen wie bisher im Logs-Tab.
+    """
+    by_week: Dict[Optional[int], List[Tuple[int, List]]] = {}
+    for log_id, row in pending_logs:
+        by_week.setdefault(parse_week(row[1], row[0]), []).append((log_id, row))
+    
+    for week, entries in by_week.items():
+        rows = [row for _, row in entries]
+        ids = [log_id for log_id, _ in entries]
+        if week is None:
+            sheet_rows = await bot.log_appender.append(rows)
+            bot.store.mark_synced('logs', ids, sheet_rows)
+            continue
+        
+        appender = await week_log_appender(week)
+        await appender.append(rows)
+        # Zeilennummern werden nur für den Logs-Tab geführt
+        bot.store.mark_synced('logs', ids)
+
+
+def archive_targets(ops: List[Tuple[int, str, int, str, Optional[List[int]]]]) -> Dict[Tuple[int, str], Dict[str, str]]:
+    """
+    (Woche, User-ID) -> {Log-ID: Archiv-Datum} aller Archiv-Aufträge
+    
+    '' steht für Zeilen ohne Log-ID (Altbestand), '*' für alle Zeilen bei
+    Aufträgen von vor den Log-IDs. Logs, die nach der Auszahlung derselben
+    Woche eingereicht wurden, gehören zu keinem Auftrag.
+    """
+    targets: Dict[Tuple[int, str], Dict[str, str]] = {}
+    for _, user_id, week, archived_at, log_ids in ops:
+        by_id = targets.setdefault((week, str(user_id)), {})
+        for log_id in ('*',) if log_ids is None else ['', *map(str, log_ids)]:
+            by_id[log_id] = archived_at
+    return targets
+
+
+def archive_target(targets: Dict[Tuple[int, str], Dict[str, str]], row: List) -> Optional[str]:
+    """Archiv-Datum einer Tab-Zeile (Schlüsselspalten inkl. Log-ID), None wenn sie bleibt"""
+    by_id = targets.get((parse_week(row[1], row[0]), cell_text(row[3])))
+    if not by_id:
+        return None
+    log_id = cell_text(row[8]) if len(row) > 8 else ''
+    return by_id.get(log_id, by_id.get('*'))
+
+
+async def replicate_archives(ops: List[Tuple[int, str, int, str, Optional[List[int]]]]):
+    """
+    Verschiebe die Logs aller Archiv-Aufträge in Google Sheets ins Archiv
+    
+    Im partitionierten Layout wird zuerst in den Wochen-Tabs gesucht; der
+    Logs-Tab wird nur noch gelesen, solange er alte Zeilen enthält.
+    """
+    targets = archive_targets(ops)
+    
+    if LOGS_PARTITIONED:
+        for week in sorted({week for week, _ in targets}):
+            await archive_from_tab(week_tab(week), targets)
+        if bot.store.logs_cursor() <= 1:
+            return  # Logs-Tab ist leer
+    
+    await archive_from_tab('Logs', targets)
+
+
+async def archive_from_tab(tab: str, targets: Dict[Tuple[int, str], Dict[str, str]]):
+    """
+    Verschiebe die passenden Zeilen eines Tabs ins Archiv
+    
+    Unabhängig von der Anzahl User zwei Lesezugriffe (Schlüsselspalten,
+    dann nur die betroffenen Zeilen), ein Append ins Archiv und ein
+    batchUpdate zum Löschen. Wird ein Wochen-Tab vollständig archiviert,
+    wird der ganze Tab gelöscht statt einzelner Zeilen. Mit
+    ARCHIVE_MODE=server entfällt das Lesen der Zeilen (``move_to_archive``).
+    
+    1. Kopiere Logs ins Archiv-Tab
+    2. Lösche aus dem Tab
+    """
+    if await bot.sheets.sheet_id(tab) is None:
+        return
+    
+    # Betroffene Zeilen nur über Zeitstempel, KW, User-ID und Log-ID suchen (ohne Freitext und Bild-URLs)
+    keys = await bot.sheets.values_columns(tab, ARCHIVE_KEY_COLUMNS)
+    row_archived_at = {}
+    row_log_ids = {}
+    occupied = 0
+    for i, row in enumerate(keys):
+        if len(row) >= 4:
+            occupied += 1
+            archived_at = archive_target(targets, row)
+            if archived_at is not None:
+                row_archived_at[i + 2] = archived_at  # +2 für Header und 0-Index
+                row_log_ids[i + 2] = cell_text(row[8]) if len(row) > 8 else ''
+    
+    if not row_archived_at:
+        return  # Keine Logs zum Archivieren
+    
+    rows_to_delete = sorted(row_archived_at)
+    whole_tab = tab != 'Logs' and len(rows_to_delete) == occupied
+    
+    if ARCHIVE_MODE == 'server':
+        await move_to_archive(tab, row_archived_at, row_log_ids, drop_tab=whole_tab)
+        return
+    
+    if whole_tab:
+        await archive_whole_tab(tab, row_archived_at)
+        return
+    
+    blocks = sorted((start + 1, end) for start, end in merge_row_ranges(rows_to_delete))
+    
+    # Vollständige Zeilen nur für die betroffenen Blöcke
+    values = await bot.sheets.values_batch_get(
+        [f'{tab}!A{first}:I{last}' for first, last in blocks],
+        **UNFORMATTED_READ
+    )
+    
+    logs_to_archive = []
+    for (first, last), block in zip(blocks, values):
+        for offset in range(last - first + 1):
+            row = block[offset] if offset < len(block) else []
+            # Archiv-Datum hinzufügen, Log-ID bleibt in der letzten Spalte
+            log_id = row[8] if len(row) > 8 else ''
+            logs_to_archive.append((row + [''] * 8)[:8] + [row_archived_at[first + offset], log_id])
+    
+    # 1. Ins Archiv kopieren
+    await bot.archive_appender.append(logs_to_archive)
+    
+    # 2. Aus dem Tab löschen (zusammenhängende Zeilen als ein Bereich, von hinten nach vorne)
+    ranges = merge_row_ranges(rows_to_delete)
+    
+    # Sheet ID kommt aus dem Metadaten-Cache
+    if ranges and await bot.sheets.sheet_id(tab) is not None:
+        await bot.sheets.batch_update_tabs(
+            lambda metadata: build_delete_requests(metadata.sheet_id(tab), ranges)
+        )
+        if tab == 'Logs':
+            bot.store.apply_row_deletions(ranges)
+            bot.log_appender.forget_rows()
+        elif tab in bot.week_appenders:
+            bot.week_appenders[tab].forget_rows()
+        print(f"🗑️ {len(rows_to_delete)} Zeilen in {len(ranges)} Bereichen aus {tab} gelöscht")
+
+
+async def move_to_archive(
+    tab: str,
+    row_archived_at: Dict[int, str],
+    row_log_ids: Dict[int, str],
+    drop_tab: bool = False
+):
+    """
+    Verschiebe Zeilen serverseitig ins Archiv (ARCHIVE_MODE=server)
+    
+    Die Log-Daten verlassen Google nicht:
+    1. Archiv-Datum und Log-ID als Stempel über den Archiv-Appender anhängen
+       (reserviert die Zielzeilen). Stempel eines abgebrochenen Laufs werden
+       vorher über die Log-ID in Spalte J gesucht und weiterverwendet, auch
+       nach einem Neustart (``open_archive_stamps``).
+    2. Ein batchUpdate: ein cutPaste (A:H) pro zusammenhängendem Lauf auf
+       die Stempel-Zeilen, danach die Zeilen (bzw. den Wochen-Tab) löschen
+    
+    Wiederholt wird das batchUpdate nur, wenn Google es abgelehnt hat (429,
+    ungültige sheetId). Bei 5xx oder einer verlorenen Antwort wird es nicht
+    erneut gesendet, die Zeilen könnten sich schon verschoben haben; stattdessen
+    wird geprüft, ob es ausgeführt wurde (``archive_move_applied``). Sonst
+    bleiben die Stempel für den nächsten Lauf stehen.
+    """
+    rows = sorted(row_archived_at)
+    log_ids = [row_log_ids.get(row, '') for row in rows]
+    
+    existing = await open_archive_stamps()
+    missing = [i for i, log_id in enumerate(log_ids) if not log_id or log_id not in existing]
+    stamps = [existing.get(log_id) for log_id in log_ids]
+    if missing:
+        # Vor dem Append merken, ab welcher Zeile ein abgebrochener Lauf seine Stempel findet
+        if not bot.store.get_meta(ARCHIVE_STAMPS_META):
+            bot.store.set_meta(ARCHIVE_STAMPS_META, str((bot.archive_appender.last_row or 1) + 1))
+        appended = await bot.archive_appender.append(
+            [[''] * 8 + [row_archived_at[rows[i]], log_ids[i]] for i in missing]
+        )
+        for i, sheet_row in zip(missing, appended):
+            stamps[i] = sheet_row
+    if None in stamps:
+        raise RuntimeError("Zielzeilen im Archiv unbekannt")
+    
+    ranges = merge_row_ranges(rows)
+    row_targets = dict(zip(rows, stamps))
+    
+    if drop_tab:
+        await update_aggregates_formula(exclude=tab)
+    
+    def build_requests(metadata) -> List[Dict]:
+        source_id = metadata.sheet_id(tab)
+        requests = build_move_requests(source_id, metadata.sheet_id('Archiv'), row_targets)
+        if drop_tab:
+            return requests + [{'deleteSheet': {'sheetId': source_id}}]
+        return requests + build_delete_requests(source_id, ranges)
+    
+    try:
+        await bot.sheets.batch_update_tabs(build_requests)
+    except Exception as e:
+        if not await archive_move_applied(tab, log_ids, drop_tab):
+            print(f"⚠️ Verschieben aus {tab} nicht ausgeführt ({e}) - Stempel bleiben für den nächsten Lauf")
+            raise
+        print(f"⚠️ Antwort beim Verschieben aus {tab} verloren ({e}), Zeilen sind im Archiv")
+    
+    bot.store.set_meta(ARCHIVE_STAMPS_META, '')
+    
+    if drop_tab:
+        bot.sheets.metadata.forget(tab)
+        bot.week_appenders.pop(tab, None)
+        print(f"🗃️ {tab} serverseitig archiviert ({len(rows)} Zeilen), Tab gelöscht")
+        return
+    
+    if tab == 'Logs':
+        bot.store.apply_row_deletions(ranges)
+        bot.log_appender.forget_rows()
+    elif tab in bot.week_appenders:
+        bot.week_appenders[tab].forget_rows()
+    print(f"🗃️ {len(rows)} Zeilen in {len(ranges)} Bereichen serverseitig aus {tab} ins Archiv verschoben")
+
+
+async def open_archive_stamps() -> Dict[str, int]:
+    """
+    Log-ID -> Zeile der Stempel eines nicht abgeschlossenen Laufs
+    
+    Liest Spalte J nur, wenn ein Lauf seine Stempel hinterlassen hat, und
+    nur ab der Zeile, ab der er angehängt hat.
+    """
+    first_row = bot.store.get_meta(ARCHIVE_STAMPS_META)
+    if not first_row:
         return {}
     
+    values = await bot.sheets.values_get(f'Archiv!J{first_row}:J', **UNFORMATTED_READ)
+    return {cell_text(row[0]): int(first_row) + i for i, row in enumerate(values) if row and row[0] != ''}
+
+
+async def archive_move_applied(tab: str, log_ids: List[str], drop_tab: bool) -> bool:
+    """
+    Prüfe nach einem Fehler, ob das batchUpdate von ``move_to_archive`` lief
+    
+    Ein batchUpdate wird ganz oder gar nicht ausgeführt: fehlt der Wochen-Tab
+    bzw. steht keine der Log-IDs mehr im Tab, sind alle Zeilen verschoben.
+    Ohne Log-IDs (Altbestand) gilt es als nicht ausgeführt.
+    """
+    if drop_tab:
+        await bot.sheets.refresh_metadata()
+        return await bot.sheets.sheet_id(tab) is None
+    
+    moved = {log_id for log_id in log_ids if log_id}
+    if not moved:
+        return False
+    
+    remaining = await bot.sheets.values_columns(tab, ('I',))
+    return moved.isdisjoint(cell_text(row[8]) for row in remaining if len(row) > 8)
+
+
+async def archive_whole_tab(tab: str, row_archived_at: Dict[int, str]):
+    """Kopiere alle Zeilen eines Wochen-Tabs ins Archiv und lösche den Tab"""
+    last_row = max(row_archived_at)
+    block = await bot.sheets.values_get(f'{tab}!A2:I{last_row}', **UNFORMATTED_READ)
+    
+    logs_to_archive = []
+    for offset, row in enumerate(block):
+        archived_at = row_archived_at.get(offset + 2)
+        if archived_at is None:
+            continue  # Leere Zeile
+        log_id = row[8] if len(row) > 8 else ''
+        logs_to_archive.append((row + [''] * 8)[:8] + [archived_at, log_id])
+    
+    await bot.archive_appender.append(logs_to_archive)
+    await update_aggregates_formula(exclude=tab)
+    await bot.sheets.delete_tab(tab)
+    bot.week_appenders.pop(tab, None)
+    print(f"🗃️ {tab} vollständig archiviert ({len(logs_to_archive)} Zeilen), Tab gelöscht")
+
+
+def rebuild_index():
+    """Baue die Wochen-Aggregate aus dem lokalen Spiegel neu auf"""
+    bot.index.rebuild(bot.store.aggregate_rows())
+
+
+def invalidate_summary():
+    """Verwirf die gelesene Zusammenfassung (nach Replikation und Archivierung)"""
+    bot.summary_rows = None
+    bot.summary_generation += 1
+
+
+async def read_summary() -> Optional[List[List]]:
+    """
+    Zeilen des _Aggregates-Tabs (None wenn der Tab fehlt)
+    
+    Ein Lesezugriff pro AGGREGATES_TTL; bei knappem Lese-Budget bleibt es
+    beim zuletzt gelesenen Stand.
+    """
+    if bot.summary_rows is not None:
+        if time.monotonic() - bot.summary_loaded_at < AGGREGATES_TTL:
+            CACHE_REQUESTS.inc(cache='aggregates', result='hit')
+            return bot.summary_rows
+        if bot.sheets.degraded('read'):
+            CACHE_REQUESTS.inc(cache='aggregates', result='stale')
+            return bot.summary_rows
+    
+    CACHE_REQUESTS.inc(cache='aggregates', result='miss')
+    if await bot.sheets.sheet_id(AGGREGATES_TAB) is None:
+        return None
+    
+    generation = bot.summary_generation
+    rows = await bot.sheets.values_get(f'{AGGREGATES_TAB}!A2:F', **UNFORMATTED_READ)
+    
+    # Während des Lesens replizierte Logs: Ergebnis nur für diese Anfrage verwenden
+    if generation == bot.summary_generation:
+        bot.summary_rows = rows
+        bot.summary_loaded_at = time.monotonic()
+    return rows
+
+
+async def summary_index() -> WeekAggregateIndex:
+    """
+    Wochen-Aggregate für Panel, Wochenbericht und Statistik-Button
+    
+    Mit AGGREGATES_SOURCE=sheet aus dem _Aggregates-Tab: eine Zeile pro
+    Woche, User und Aktion statt aller Logs, unabhängig vom lokalen Spiegel.
+    Noch nicht replizierte Logs und Archiv-Aufträge aus dem Journal werden
+    darübergelegt. Ohne Tab oder Verbindung gilt der lokale Index, für
+    Wochen am Jahreswechsel (KW1, KW52, KW53) ebenfalls.
+    """
+    if AGGREGATES_SOURCE != 'sheet' or not bot.sheets_service:
+        return bot.index
+    
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
-        current_week = datetime.now().isocalendar()[1]
-        current_year = datetime.now().year
-        week_key = f"KW{current_week}/{current_year}"
-        
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
+        rows = await read_summary()
+    except Exception as e:
+        print(f"⚠️ {AGGREGATES_TAB} nicht lesbar ({e}) - verwende lokalen Index")
+        return bot.index
+    
+    if rows is None:
+        return bot.index
+    
+    index = WeekAggregateIndex(PAYMENT_AMOUNTS.keys())
+    index.rebuild_from_summary(rows)
+    for _, row in bot.store.unsynced_logs():
+        index.add_row(row)
+    for _, user_id, week, _, log_ids in bot.store.pending_archives():
+        if log_ids is None:
+            index.remove_user(week, str(user_id))
+    for row in bot.store.pending_archive_rows():
+        index.remove_row(row)
+    
+    # Die QUERY gruppiert nach dem rohen KW-Label; ältere Labels am Jahreswechsel
+    # korrigiert nur der lokale Spiegel über den Zeitstempel
+    index.copy_weeks(bot.index, [week for week in {*index.weeks, *bot.index.weeks} if is_year_boundary_week(week)])
+    return index
+
+
+async def update_aggregates_formula(exclude: str = ''):
+    """
+    Schreibe Header und QUERY-Formel in den _Aggregates-Tab
+    
+    Im partitionierten Layout umfasst die Formel alle Wochen-Tabs und wird
+    beim Anlegen und vor dem Löschen eines Wochen-Tabs neu geschrieben.
+    """
+    if await bot.sheets.sheet_id(AGGREGATES_TAB) is None:
+        return
+    
+    tabs = ['Logs']
+    if LOGS_PARTITIONED:
+        titles = bot.sheets.metadata.sheet_ids()
+        tabs += sorted(title for title in titles if parse_week_tab(title) is not None and title != exclude)
+    
+    await bot.sheets.values_update(
+        f'{AGGREGATES_TAB}!A1:F2',
+        [AGGREGATES_HEADERS, [aggregates_formula(tabs)]],
+        'USER_ENTERED'
+    )
+    invalidate_summary()
+
+
+async def sync_store_from_sheets() -> bool:
+    """
+    Lade Logs, Auszahlungen und Archiv aus Sheets in den lokalen Spiegel
+    
+    Wird beim Start und zur Wiederherstellung genutzt und baut danach die
+    Wochen-Aggregate neu auf.
+    """
+    if not bot.sheets_service:
+        return False
+    
+    async with _replication_lock:
+        try:
+            # Wochen-Tabs stehen nur in den aktuellen Metadaten
+            week_tabs = []
+            if LOGS_PARTITIONED:
+                metadata = await bot.sheets.refresh_metadata()
+                week_tabs = sorted(title for title in metadata.sheet_ids() if parse_week_tab(title) is not None)
+            
+            # Ein batchGet für alle Tabs, Beträge als Zahlen
+            results = await bot.sheets.values_batch_get(
+                ['Logs!A2:I', 'Auszahlungen!A2:I', 'Archiv!A2:J'] + [f'{tab}!A2:I' for tab in week_tabs],
+                **UNFORMATTED_READ
+            )
+            logs, payouts, archive = results[:3]
+            partitions = results[3:]
+            bot.store.load_from_sheets(logs, payouts, archive, partitions)
+            rebuild_index()
+            
+            logs_count = len(logs) + sum(len(rows) for rows in partitions)
+            print(f"✅ Lokaler Spiegel geladen: {logs_count} Logs, {len(payouts)} Auszahlungen, {len(archive)} Archiv")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Fehler beim Laden des lokalen Spiegels: {e}")
+            return False
+
+
+def _sample_matches(first_row: int, last_row: int, values: List[List]) -> bool:
+    """Vergleiche einen Block aus dem Logs-Tab mit dem lokalen Spiegel"""
+    if len(values) < last_row - first_row + 1:
+        return False  # Zeilen wurden gelöscht
+    
+    local = bot.store.sample_rows(first_row, last_row)
+    for offset, row in enumerate(values):
+        local_row = local.get(first_row + offset)
+        if len(row) < 7:
+            if local_row is not None:
+                return False
+        elif local_row is None or row_fingerprint(row) != row_fingerprint(local_row):
+            return False
+    return True
+
+
+async def refresh_logs_tail() -> bool:
+    """
+    Übernimm neue Zeilen aus dem Logs-Tab ab dem zuletzt gesehenen Cursor
+    
+    Liest in einem batchGet nur ``Logs!A{n+1}:I`` sowie zwei kleine
+    Stichproben (die letzten bekannten Zeilen und einen zufälligen Block,
+    nur die Spalten B, D, E und G).
+    Weichen die Stichproben ab, wurden Zeilen gelöscht oder umsortiert und
+    es folgt ein vollständiger Abgleich.
+    
+    Ist das Lese-Budget fast aufgebraucht, bleibt es beim lokalen
+    (ggf. leicht veralteten) Stand statt in der Quota-Warteschlange zu hängen.
+    
+    Mit LOGS_PARTITIONED wird zusätzlich der Tab der aktuellen Woche
+    abgeglichen; der Logs-Tab nur noch, solange er alte Zeilen enthält.
+    """
+    if not bot.sheets_service:
+        return False
+    
+    if bot.sheets.degraded('read'):
+        CACHE_REQUESTS.inc(cache='logs_tail', result='stale')
+        print("⚠️ Lese-Quota knapp - verwende lokalen Stand")
+        return False
+    
+    if LOGS_PARTITIONED:
+        week_refreshed = await refresh_week_tab()
+        if bot.store.logs_cursor() <= 1:
+            return week_refreshed  # Logs-Tab ist leer
+    
+    resync = False
+    
+    async with _replication_lock:
+        # Erst wenn alle lokalen Änderungen repliziert sind, passen die Zeilennummern
+        if bot.store.unsynced_logs() or bot.store.pending_archives():
+            return False
         
-        values = result.get('values', [])
+        try:
+            cursor = bot.store.logs_cursor()
+            
+            samples = []
+            if cursor >= 2:
+                tail_start = max(2, cursor - LOGS_TAIL_SAMPLE + 1)
+                samples.append((tail_start, cursor))
+                
+                random_start = random.randint(2, max(2, cursor - LOGS_TAIL_SAMPLE + 1))
+                samples.append((random_start, min(cursor, random_start + LOGS_TAIL_SAMPLE - 1)))
+            
+            # Neue Zeilen vollständig, Stichproben nur mit den Vergleichsspalten
+            sample_ranges = [column_ranges('Logs', FINGERPRINT_COLUMNS, first, last) for first, last in samples]
+            ranges = [f'Logs!A{cursor + 1}:I'] + [r for block in sample_ranges for r in block]
+            results = await bot.sheets.values_batch_get(ranges, **UNFORMATTED_READ)
+            tail = results[0] if results else []
+            
+            position = 1
+            for (first, last), block in zip(samples, sample_ranges):
+                values = expand_columns(results[position:position + len(block)], FINGERPRINT_COLUMNS)
+                position += len(block)
+                if not _sample_matches(first, last, values):
+                    resync = True
+                    break
+            
+            if not resync:
+                CACHE_REQUESTS.inc(cache='logs_tail', result='hit')
+                added = bot.store.append_tail(cursor + 1, tail)
+                for row in added:
+                    bot.index.add_row(row)
+                
+                if added:
+                    print(f"✅ {len(added)} neue Zeilen aus dem Logs-Tab übernommen")
+                return True
+            
+        except Exception as e:
+            print(f"❌ Fehler beim Lesen neuer Logs: {e}")
+            return False
+    
+    CACHE_REQUESTS.inc(cache='logs_tail', result='miss')
+    print("⚠️ Logs-Tab wurde verändert - vollständiger Abgleich...")
+    return await sync_store_from_sheets()
+
+
+async def refresh_week_tab() -> bool:
+    """
+    Gleiche die aktuelle Woche mit ihrem Wochen-Tab ab (LOGS_PARTITIONED)
+    
+    Ein Lesezugriff auf einen Tab mit nur den Logs dieser Woche; ältere
+    Wochen ändern sich nur noch über Archivierungen des Bots.
+    """
+    async with _replication_lock:
+        if bot.store.unsynced_logs() or bot.store.pending_archives():
+            return False
         
-        stats = {action: 0 for action in PAYMENT_AMOUNTS.keys()}
+        try:
+            week = current_week()
+            tab = week_tab(week)
+            rows = []
+            if await bot.sheets.sheet_id(tab) is not None:
+                rows = await bot.sheets.values_get(f'{tab}!A2:I', **UNFORMATTED_READ)
+            
+            if bot.store.replace_partition(week, rows):
+                CACHE_REQUESTS.inc(cache='logs_tail', result='miss')
+                rebuild_index()
+                print(f"✅ {tab} abgeglichen: {len(rows)} Zeilen")
+            else:
+                CACHE_REQUESTS.inc(cache='logs_tail', result='hit')
+            return True
+            
+        except Exception as e:
+            print(f"❌ Fehler beim Lesen von {week_tab(current_week())}: {e}")
+            return False
+
+
+async def get_user_stats(user_id: int) -> dict:
+    """Hole Statistiken für einen User (aktuelle Woche)"""
+    try:
+        index = await summary_index()
+        aggregate = index.user(current_week(), str(user_id))
         
-        for row in values:
-            if len(row) >= 5:
-                if row[1] == week_key and row[3] == str(user_id):
-                    action = row[4]
-                    if action in stats:
-                        stats[action] += 1
+        if aggregate is None:
+            return {action: 0 for action in PAYMENT_AMOUNTS.keys()}
         
-        return stats
+        return dict(aggregate.breakdown)
         
     except Exception as e:
         print(f"❌ Fehler beim Abrufen der Stats: {e}")
@@ -545,38 +1212,11 @@ async def get_user_stats(user_id: int) -> dict:
 
 async def generate_weekly_stats() -> discord.Embed:
     """Generiere wöchentlichen Gesamtbericht"""
-    if not bot.sheets_service:
-        return discord.Embed(title="Fehler", description="Keine Verbindung zu Sheets")
-    
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
-        current_week = datetime.now().isocalendar()[1]
-        current_year = datetime.now().year
-        week_key = f"KW{current_week}/{current_year}"
-        
-        result = sheet.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A2:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        user_earnings = {}
-        action_counts = {action: 0 for action in PAYMENT_AMOUNTS.keys()}
-        
-        for row in values:
-            if len(row) >= 7 and row[1] == week_key:
-                username = row[2]
-                action = row[4]
-                amount = float(row[6])
-                
-                if username not in user_earnings:
-                    user_earnings[username] = 0
-                user_earnings[username] += amount
-                
-                if action in action_counts:
-                    action_counts[action] += 1
+        week = current_week()
+        index = await summary_index()
+        user_earnings = {a.username: a.total for a in index.users(week)}
+        action_counts = index.week_action_counts(week)
         
         # 🎨 METALLIC PURPLE EMBED
         embed = discord.Embed(
@@ -586,12 +1226,12 @@ async def generate_weekly_stats() -> discord.Embed:
         )
         
         embed.set_author(
-            name=f"📊 Wöchentlicher Bericht - {week_key}",
+            name=f"📊 Wöchentlicher Bericht - {week_label(week)}",
             icon_url=bot.user.display_avatar.url
         )
         
-        # Top Earners
-        sorted_users = sorted(user_earnings.items(), key=lambda x: x[1], reverse=True)
+        # Top Earners (Index liefert bereits sortiert)
+        sorted_users = list(user_earnings.items())
         
         if sorted_users:
             top_10 = sorted_users[:10]
@@ -682,6 +1322,7 @@ class ActionSelect(discord.ui.Select):
             max_values=1
         )
     
+    @timed
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.send_modal(
             LogModal(action_type=self.values[0])
@@ -703,6 +1344,7 @@ class LogModal(discord.ui.Modal):
         )
         self.add_item(self.description)
     
+    @timed
     async def on_submit(self, interaction: discord.Interaction):
         """Wenn Modal abgeschickt wird"""
         await interaction.response.defer(ephemeral=True)
@@ -727,14 +1369,14 @@ class LogModal(discord.ui.Modal):
             message = await bot.wait_for('message', timeout=60.0, check=check)
             image_url = message.attachments[0].url
             
-            success = await save_log(
+            log_id = await save_log(
                 user=interaction.user,
                 action_type=self.action_type,
                 description=self.description.value,
                 image_url=image_url
             )
             
-            if success:
+            if log_id:
                 amount = PAYMENT_AMOUNTS[self.action_type]
                 
                 # 🎨 METALLIC PURPLE CONFIRMATION
@@ -829,11 +1471,10 @@ class LogModal(discord.ui.Modal):
                         )
                         
                         now = datetime.now()
-                        week_number = now.isocalendar()[1]
                         
                         premium_embed.add_field(
                             name="📅 Kalenderwoche",
-                            value=f"KW {week_number}/{now.year}",
+                            value=week_label(week_key(now)),
                             inline=True
                         )
                         
@@ -860,9 +1501,8 @@ class LogModal(discord.ui.Modal):
                         premium_embed.set_thumbnail(url=interaction.user.display_avatar.url)
                         premium_embed.set_image(url=image_url)
                         
-                        log_count = await get_total_log_count()
                         premium_embed.set_footer(
-                            text=f"Log #{log_count} • Metallic Purple Edition",
+                            text=f"Log #{log_id} • Metallic Purple Edition",
                             icon_url=bot.user.display_avatar.url
                         )
                         
@@ -897,11 +1537,12 @@ class LogView(discord.ui.View):
         emoji="📊",
         custom_id="stats_button"
     )
+    @timed
     async def stats_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Zeige persönliche Statistiken"""
         await interaction.response.defer(ephemeral=True)
         
-        user_stats = await get_user_week_earnings(interaction.user.id)
+        user_stats = await get_user_week_earnings(interaction.user.id, summary=True)
         
         # 🎨 METALLIC STATS EMBED
         embed = discord.Embed(
@@ -985,6 +1626,7 @@ class PayoutUserSelect(discord.ui.Select):
             max_values=1
         )
     
+    @timed
     async def callback(self, interaction: discord.Interaction):
         if self.values[0] == "none":
             await interaction.response.send_message("❌ Keine User verfügbar.", ephemeral=True)
@@ -1031,6 +1673,7 @@ class PayoutConfirmView(discord.ui.View):
         self.admin = admin
     
     @discord.ui.button(label="✅ Auszahlen", style=discord.ButtonStyle.success)
+    @timed
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
         
@@ -1055,6 +1698,7 @@ class PayoutConfirmView(discord.ui.View):
         self.stop()
     
     @discord.ui.button(label="❌ Abbrechen", style=discord.ButtonStyle.danger)
+    @timed
     async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_message("❌ Auszahlung abgebrochen.", ephemeral=True)
         self.stop()
@@ -1069,10 +1713,11 @@ class PayoutAllConfirmView(discord.ui.View):
         self.guild = guild
     
     @discord.ui.button(label="✅ JA, ALLE AUSZAHLEN", style=discord.ButtonStyle.success)
+    @timed
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
         
-        total_amount = sum(u['total'] for u in self.users)
+        total_amount = euros(sum(u['cents'] for u in self.users))
         total_users = len(self.users)
         
         # Progress Message
@@ -1083,24 +1728,34 @@ class PayoutAllConfirmView(discord.ui.View):
         )
         progress_msg = await interaction.followup.send(embed=progress_embed, ephemeral=True)
         
-        success_count = 0
-        failed_count = 0
+        # 1. Alle Auszahlungen + Archivierungen in einem Durchgang
+        try:
+            synced = await process_bulk_payout(self.users, self.admin)
+        except Exception as e:
+            print(f"❌ Fehler bei der Sammelauszahlung: {e}")
+            await progress_msg.edit(embed=discord.Embed(
+                title="❌ Fehler bei der Auszahlung",
+                description=str(e),
+                color=COLORS['danger']
+            ))
+            self.stop()
+            return
         
-        for i, user_data in enumerate(self.users):
-            success = await process_single_payout(user_data, self.guild, self.admin)
-            
-            if success:
-                success_count += 1
-            else:
-                failed_count += 1
-            
-            # Update Progress alle 3 User
-            if (i + 1) % 3 == 0 or i == total_users - 1:
-                progress_embed.description = f"{i + 1} / {total_users} User verarbeitet..."
-                await progress_msg.edit(embed=progress_embed)
-            
-            # Rate limiting
-            await asyncio.sleep(0.5)
+        # 2. DMs parallel verschicken (Tempo über den DM Token Bucket)
+        default_week = week_label(current_week())
+        
+        async def notify(user_data: Dict):
+            await send_payout_dm(user_data, self.guild, user_data.get('week', default_week))
+        
+        async def show_progress(done: int, total: int):
+            progress_embed.description = f"{done} / {total} User verarbeitet..."
+            await progress_msg.edit(embed=progress_embed)
+        
+        success_count, failed_count = await PayoutExecutor(notify).run(
+            self.users,
+            on_progress=show_progress,
+            describe=lambda user_data: f"DM für {user_data['username']}"
+        )
         
         # Final Message
         final_embed = discord.Embed(
@@ -1112,11 +1767,17 @@ class PayoutAllConfirmView(discord.ui.View):
         final_embed.add_field(name="✅ Erfolgreich", value=f"**{success_count}**", inline=True)
         final_embed.add_field(name="❌ Fehlgeschlagen", value=f"**{failed_count}**", inline=True)
         final_embed.add_field(name="💎 Gesamtbetrag", value=f"**{total_amount:.2f}€**", inline=True)
+        final_embed.add_field(
+            name="📋 Google Sheets",
+            value="✅ Aktualisiert" if synced else "⏳ Wird im Hintergrund nachgetragen",
+            inline=False
+        )
         
         await progress_msg.edit(embed=final_embed)
         self.stop()
     
     @discord.ui.button(label="❌ ABBRECHEN", style=discord.ButtonStyle.danger)
+    @timed
     async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_message("❌ Auszahlung abgebrochen.", ephemeral=True)
         self.stop()
@@ -1132,12 +1793,13 @@ class PayoutPanelView(discord.ui.View):
             self.add_item(PayoutUserSelect(users))
     
     @discord.ui.button(label="💎 Alle Auszahlen", style=discord.ButtonStyle.primary, emoji="💰", row=1)
+    @timed
     async def payout_all(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self.users:
             await interaction.response.send_message("❌ Keine User mit offenem Guthaben.", ephemeral=True)
             return
         
-        total_amount = sum(u['total'] for u in self.users)
+        total_amount = euros(sum(u['cents'] for u in self.users))
         total_users = len(self.users)
         
         # Bestätigungs-Embed
@@ -1156,10 +1818,13 @@ class PayoutPanelView(discord.ui.View):
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
     
     @discord.ui.button(label="🔄 Aktualisieren", style=discord.ButtonStyle.secondary, emoji="🔄", row=1)
+    @timed
     async def refresh(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
         
-        # Neu laden
+        # Neue Zeilen aus dem Logs-Tab übernehmen, dann neu laden
+        await refresh_logs_tail()
+        invalidate_summary()
         users = await get_all_users_with_earnings()
         
         if not users:
@@ -1178,64 +1843,75 @@ class PayoutPanelView(discord.ui.View):
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @discord.ui.button(label="❌ Schließen", style=discord.ButtonStyle.danger, emoji="❌", row=1)
+    @timed
     async def close(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_message("Panel geschlossen.", ephemeral=True)
         self.stop()
 
 
+async def send_payout_dm(user_data: Dict, guild: discord.Guild, week: str):
+    """Informiere den User per DM über seine Auszahlung (wenn möglich)"""
+    member = guild.get_member(int(user_data['user_id']))
+    if not member:
+        PAYOUT_DMS.inc(result='missing')
+        return
+    
+    await bot.dm_bucket.acquire()
+    
+    try:
+        dm_embed = discord.Embed(
+            title="",
+            color=COLORS['gold'],
+            timestamp=datetime.utcnow()
+        )
+        
+        dm_embed.set_author(
+            name="💎 AUSZAHLUNG ERFOLGREICH",
+            icon_url=guild.icon.url if guild.icon else None
+        )
+        
+        dm_embed.description = f"Hallo **{member.display_name}**!\n\nDeine Auszahlung wurde veranlasst:"
+        
+        dm_embed.add_field(name="📅 Zeitraum", value=f"**{week}**", inline=True)
+        dm_embed.add_field(name="💎 Betrag", value=f"**{user_data['total']:.2f}€**", inline=True)
+        dm_embed.add_field(name="📋 Logs", value=f"**{user_data['logs']}**", inline=True)
+        
+        action_emojis = {'Düngen': '🌱', 'Reparieren': '🔧', 'Panel platziert': '⚡'}
+        breakdown_text = ""
+        for action, count in user_data['breakdown'].items():
+            if count > 0:
+                emoji = action_emojis.get(action, '📌')
+                earnings = count * PAYMENT_AMOUNTS.get(action, 0)
+                breakdown_text += f"{emoji} **{action}**: {count}x (**{earnings:.2f}€**)\n"
+        
+        if breakdown_text:
+            dm_embed.add_field(name="📊 Breakdown", value=breakdown_text, inline=False)
+        
+        dm_embed.add_field(
+            name="🎉 Status",
+            value="Dein Guthaben wurde zurückgesetzt.\n**Viel Erfolg in der neuen Woche!** 🚀",
+            inline=False
+        )
+        
+        dm_embed.set_thumbnail(url=member.display_avatar.url)
+        dm_embed.set_footer(text="Metallic Purple Edition • Auszahlung")
+        
+        await member.send(embed=dm_embed)
+        PAYOUT_DMS.inc(result='sent')
+        
+    except discord.Forbidden:
+        PAYOUT_DMS.inc(result='forbidden')
+        print(f"⚠️ Konnte DM nicht senden an {user_data['username']}")
+
+
 async def process_single_payout(user_data: Dict, guild: discord.Guild, admin: discord.Member) -> bool:
     """Führe eine einzelne Auszahlung durch"""
     try:
         user_id = int(user_data['user_id'])
-        week = user_data.get('week', f"KW{datetime.now().isocalendar()[1]}/{datetime.now().year}")
-        
-        # Versuche Member zu finden
-        member = guild.get_member(user_id)
+        week = user_data.get('week', week_label(current_week()))
         
         # 1. DM senden (wenn möglich)
-        if member:
-            try:
-                dm_embed = discord.Embed(
-                    title="",
-                    color=COLORS['gold'],
-                    timestamp=datetime.utcnow()
-                )
-                
-                dm_embed.set_author(
-                    name="💎 AUSZAHLUNG ERFOLGREICH",
-                    icon_url=guild.icon.url if guild.icon else None
-                )
-                
-                dm_embed.description = f"Hallo **{member.display_name}**!\n\nDeine Auszahlung wurde veranlasst:"
-                
-                dm_embed.add_field(name="📅 Zeitraum", value=f"**{week}**", inline=True)
-                dm_embed.add_field(name="💎 Betrag", value=f"**{user_data['total']:.2f}€**", inline=True)
-                dm_embed.add_field(name="📋 Logs", value=f"**{user_data['logs']}**", inline=True)
-                
-                action_emojis = {'Düngen': '🌱', 'Reparieren': '🔧', 'Panel platziert': '⚡'}
-                breakdown_text = ""
-                for action, count in user_data['breakdown'].items():
-                    if count > 0:
-                        emoji = action_emojis.get(action, '📌')
-                        earnings = count * PAYMENT_AMOUNTS.get(action, 0)
-                        breakdown_text += f"{emoji} **{action}**: {count}x (**{earnings:.2f}€**)\n"
-                
-                if breakdown_text:
-                    dm_embed.add_field(name="📊 Breakdown", value=breakdown_text, inline=False)
-                
-                dm_embed.add_field(
-                    name="🎉 Status",
-                    value="Dein Guthaben wurde zurückgesetzt.\n**Viel Erfolg in der neuen Woche!** 🚀",
-                    inline=False
-                )
-                
-                dm_embed.set_thumbnail(url=member.display_avatar.url)
-                dm_embed.set_footer(text="Metallic Purple Edition • Auszahlung")
-                
-                await member.send(embed=dm_embed)
-                
-            except discord.Forbidden:
-                print(f"⚠️ Konnte DM nicht senden an {user_data['username']}")
+        await send_payout_dm(user_data, guild, week)
         
         # 2. In Sheets speichern
         await save_payout(
@@ -1248,7 +1924,7 @@ async def process_single_payout(user_data: Dict, guild: discord.Guild, admin: di
         )
         
         # 3. Logs archivieren
-        await archive_user_logs(user_id, week)
+        await archive_user_logs(user_id, parse_week(week))
         
         return True
         
@@ -1257,12 +1933,57 @@ async def process_single_payout(user_data: Dict, guild: discord.Guild, admin: di
         return False
 
 
+async def process_bulk_payout(users: List[Dict], admin: discord.Member) -> bool:
+    """
+    Zahle alle User in einem Durchgang aus (ohne DMs)
+    
+    Alle Auszahlungen und Archivierungen werden lokal in einer Transaktion
+    verbucht und danach gemeinsam repliziert: ein Lesezugriff auf Logs,
+    ein Append nach Auszahlungen, ein Append nach Archiv und ein
+    batchUpdate zum Löschen - unabhängig von der Anzahl User.
+    
+    Returns:
+        True wenn Google Sheets bereits aktualisiert wurde, False wenn die
+        Replikation später nachgeholt wird
+    """
+    now = datetime.now()
+    timestamp = now.strftime("%d.%m.%Y %H:%M:%S")
+    default_week = week_label(week_key(now))
+    
+    payout_rows = [
+        [
+            timestamp,
+            user_data.get('week', default_week),
+            user_data['username'],
+            str(user_data['user_id']),
+            user_data['total'],
+            user_data['logs'],
+            "Ausgezahlt",
+            admin.name,
+            uuid.uuid4().hex
+        ]
+        for user_data in users
+    ]
+    
+    archived = bot.store.record_payouts(payout_rows, timestamp)
+    for row in archived:
+        bot.index.remove_row(row)
+    
+    PAYOUTS.inc(len(payout_rows), mode='bulk')
+    PAYOUT_AMOUNT.inc(euros(sum(user_data['cents'] for user_data in users)))
+    
+    print(f"✅ {len(payout_rows)} Auszahlungen verbucht, {len(archived)} Logs archiviert")
+    
+    if await replicate_pending():
+        return True
+    
+    # Google nicht erreichbar - der Replayer versucht es weiter
+    schedule_replication()
+    return False
+
+
 def create_payout_panel_embed(users: List[Dict]) -> discord.Embed:
     """Erstelle das Auszahlungs-Panel Embed"""
-    current_week = datetime.now().isocalendar()[1]
-    current_year = datetime.now().year
-    week_key = f"KW{current_week}/{current_year}"
-    
     embed = discord.Embed(
         title="",
         color=COLORS['primary'],
@@ -1270,7 +1991,7 @@ def create_payout_panel_embed(users: List[Dict]) -> discord.Embed:
     )
     
     embed.set_author(
-        name=f"💎 AUSZAHLUNGS-PANEL • {week_key}",
+        name=f"💎 AUSZAHLUNGS-PANEL • {week_label(current_week())}",
         icon_url=bot.user.display_avatar.url
     )
     
@@ -1280,13 +2001,13 @@ def create_payout_panel_embed(users: List[Dict]) -> discord.Embed:
     
     # User-Liste
     user_list = ""
-    total_amount = 0
+    total_cents = 0
     total_logs = 0
     
     for i, user in enumerate(users[:10], 1):
         medal = "🥇" if i == 1 else ("🥈" if i == 2 else ("🥉" if i == 3 else f"`{i}.`"))
         user_list += f"{medal} **{user['username']}** │ {user['logs']} Logs │ **{user['total']:.2f}€**\n"
-        total_amount += user['total']
+        total_cents += user['cents']
         total_logs += user['logs']
     
     if len(users) > 10:
@@ -1301,7 +2022,7 @@ def create_payout_panel_embed(users: List[Dict]) -> discord.Embed:
     # Zusammenfassung
     embed.add_field(name="👥 Gesamt User", value=f"**{len(users)}**", inline=True)
     embed.add_field(name="📊 Gesamt Logs", value=f"**{total_logs}**", inline=True)
-    embed.add_field(name="💎 Gesamt Betrag", value=f"**{total_amount:.2f}€**", inline=True)
+    embed.add_field(name="💎 Gesamt Betrag", value=f"**{euros(total_cents):.2f}€**", inline=True)
     
     embed.set_footer(text="Wähle einen User aus oder zahle alle auf einmal aus • Metallic Purple Edition")
     
@@ -1311,6 +2032,7 @@ def create_payout_panel_embed(users: List[Dict]) -> discord.Embed:
 # ==================== SLASH COMMANDS ====================
 
 @bot.tree.command(name="log", description="Öffne das Log-System")
+@timed
 async def log_command(interaction: discord.Interaction):
     """Hauptcommand zum Einreichen von Logs"""
     embed = discord.Embed(
@@ -1339,6 +2061,7 @@ async def log_command(interaction: discord.Interaction):
 
 @bot.tree.command(name="panel", description="Öffne das Auszahlungs-Panel")
 @has_payout_permission()
+@timed
 async def panel_command(interaction: discord.Interaction):
     """Interaktives Auszahlungs-Panel"""
     await interaction.response.defer(ephemeral=True)
@@ -1347,12 +2070,10 @@ async def panel_command(interaction: discord.Interaction):
     users = await get_all_users_with_earnings()
     
     # Woche zu jedem User hinzufügen
-    current_week = datetime.now().isocalendar()[1]
-    current_year = datetime.now().year
-    week_key = f"KW{current_week}/{current_year}"
+    week = week_label(current_week())
     
     for user in users:
-        user['week'] = week_key
+        user['week'] = week
     
     # Erstelle Panel
     embed = create_payout_panel_embed(users)
@@ -1364,6 +2085,7 @@ async def panel_command(interaction: discord.Interaction):
 @bot.tree.command(name="auszahlung", description="Zahle einem Mitglied sein Wochenguthaben aus")
 @app_commands.describe(mitglied="Das Mitglied das ausgezahlt werden soll")
 @has_payout_permission()
+@timed
 async def payout_command(interaction: discord.Interaction, mitglied: discord.Member):
     """Schnelle Einzelauszahlung"""
     await interaction.response.defer(ephemeral=True)
@@ -1382,6 +2104,7 @@ async def payout_command(interaction: discord.Interaction, mitglied: discord.Mem
         'user_id': str(mitglied.id),
         'username': mitglied.name,
         'total': user_earnings['total'],
+        'cents': user_earnings['cents'],
         'logs': user_earnings['logs'],
         'breakdown': user_earnings['breakdown'],
         'week': user_earnings['week']
@@ -1414,6 +2137,7 @@ async def payout_command(interaction: discord.Interaction, mitglied: discord.Mem
     app_commands.Choice(name="📋 Rollen anzeigen", value="list")
 ])
 @app_commands.checks.has_permissions(administrator=True)
+@timed
 async def config_command(
     interaction: discord.Interaction,
     aktion: str,
@@ -1481,6 +2205,7 @@ async def config_command(
 
 @bot.tree.command(name="wochenbericht", description="Zeige den aktuellen Wochenbericht")
 @has_payout_permission()
+@timed
 async def weekly_report_command(interaction: discord.Interaction):
     """Manueller Wochenbericht"""
     await interaction.response.defer()
@@ -1490,6 +2215,7 @@ async def weekly_report_command(interaction: discord.Interaction):
 
 @bot.tree.command(name="setup", description="Erstelle das Google Sheet (nur einmal ausführen)")
 @app_commands.checks.has_permissions(administrator=True)
+@timed
 async def setup_command(interaction: discord.Interaction):
     """Erstelle die Sheets-Struktur inkl. Archiv"""
     await interaction.response.defer(ephemeral=True)
@@ -1499,44 +2225,30 @@ async def setup_command(interaction: discord.Interaction):
         return
     
     try:
-        sheet = bot.sheets_service.spreadsheets()
-        
         # 1. LOGS TAB
-        logs_headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL']]
+        logs_headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Log-ID']]
         
-        body = {'values': logs_headers}
-        sheet.values().update(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Logs!A1:H1',
-            valueInputOption='RAW',
-            body=body
-        ).execute()
+        await bot.sheets.values_update('Logs!A1:I1', logs_headers)
         
         # 2. AUSZAHLUNGEN TAB
-        payout_headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Betrag', 'Anzahl Logs', 'Status', 'Admin']]
+        payout_headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Betrag', 'Anzahl Logs', 'Status', 'Admin', 'Payout-ID']]
         
-        body = {'values': payout_headers}
-        sheet.values().update(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Auszahlungen!A1:H1',
-            valueInputOption='RAW',
-            body=body
-        ).execute()
+        await bot.sheets.values_update('Auszahlungen!A1:I1', payout_headers)
         
         # 3. ARCHIV TAB
-        archiv_headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Archiviert am']]
+        archiv_headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Archiviert am', 'Log-ID']]
+        
+        await bot.sheets.values_update('Archiv!A1:J1', archiv_headers)
+        
+        # 4. _AGGREGATES TAB (versteckt, Wochen-Summen per QUERY)
+        if await bot.sheets.sheet_id(AGGREGATES_TAB) is None:
+            await bot.sheets.add_tab(AGGREGATES_TAB, rows=1000, columns=6, properties={'hidden': True})
         
-        body = {'values': archiv_headers}
-        sheet.values().update(
-            spreadsheetId=SPREADSHEET_ID,
-            range='Archiv!A1:I1',
-            valueInputOption='RAW',
-            body=body
-        ).execute()
+        await update_aggregates_formula()
         
         await interaction.followup.send(
             "✅ Sheet erfolgreich eingerichtet!\n"
-            "📋 Tabs erstellt: Logs, Auszahlungen, Archiv\n\n"
+            f"📋 Tabs erstellt: Logs, Auszahlungen, Archiv, {AGGREGATES_TAB} (versteckt)\n\n"
             "💡 Tipp: Führe `/designer` aus für Premium-Design!",
             ephemeral=True
         )
@@ -1545,7 +2257,33 @@ async def setup_command(interaction: discord.Interaction):
         await interaction.followup.send(f"❌ Fehler: {e}", ephemeral=True)
 
 
+@bot.tree.command(name="sync", description="Lade Sheet-Metadaten und lokale Daten neu aus Google Sheets")
+@app_commands.checks.has_permissions(administrator=True)
+@timed
+async def sync_command(interaction: discord.Interaction):
+    """Metadaten-Cache, lokalen Spiegel und Aggregate neu laden"""
+    await interaction.response.defer(ephemeral=True)
+    
+    if not bot.sheets_service:
+        await interaction.followup.send("❌ Keine Verbindung zu Google Sheets!", ephemeral=True)
+        return
+    
+    try:
+        metadata = await bot.sheets.refresh_metadata()
+        synced = await sync_store_from_sheets()
+        
+        await interaction.followup.send(
+            f"✅ Metadaten neu geladen: {len(metadata.tabs)} Tabs\n"
+            f"{'✅ Lokale Daten neu geladen' if synced else '❌ Lokale Daten konnten nicht geladen werden'}",
+            ephemeral=True
+        )
+        
+    except Exception as e:
+        await interaction.followup.send(f"❌ Fehler: {e}", ephemeral=True)
+
+
 @bot.tree.command(name="hilfe", description="Zeige alle verfügbaren Befehle")
+@timed
 async def help_command(interaction: discord.Interaction):
     """Hilfe-Command"""
     embed = discord.Embed(
@@ -1594,6 +2332,12 @@ async def help_command(interaction: discord.Interaction):
         inline=False
     )
     
+    embed.add_field(
+        name="🔄 `/sync`",
+        value="Lade Sheet-Metadaten und lokale Daten neu (nur Admins)",
+        inline=False
+    )
+    
     embed.set_footer(text="Metallic Purple Edition v2.1.0")
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fake Google Sheets für Discord Log Bot
+In-Memory-Nachbau der genutzten Sheets-API (values get/batchGet/append/
+update/clear, spreadsheets get/batchUpdate) für Lasttests ohne Google
+
+Verhält sich wie der googleapiclient-Service: Requests werden gebaut und
+mit ``.execute()`` ausgeführt. Latenz und Fehler (z.B. 429/503) lassen sich
+einstellen, deleteDimension verschiebt Zeilen und cutPaste verschiebt Werte
+wie in Google Sheets. Ein batchUpdate wird wie bei Google ganz oder gar
+nicht ausgeführt.
+
+Aktivieren mit ``FAKE_SHEETS=1`` (Bot, Admin Tools und Designer).
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from sheets_client import column_index, column_letters
+
+# ==================== KONFIGURATION ====================
+
+# Fake statt Google verwenden
+FAKE_SHEETS = os.getenv('FAKE_SHEETS', '').lower() in ('1', 'true', 'yes')
+
+# Simulierte Latenz pro Request in Sekunden (+ zufälliger Anteil bis JITTER)
+FAKE_SHEETS_LATENCY = float(os.getenv('FAKE_SHEETS_LATENCY', 0))
+FAKE_SHEETS_JITTER = float(os.getenv('FAKE_SHEETS_JITTER', 0))
+
+# Anteil der Requests, die mit FAKE_SHEETS_ERROR_STATUS fehlschlagen (0-1)
+FAKE_SHEETS_ERROR_RATE = float(os.getenv('FAKE_SHEETS_ERROR_RATE', 0))
+FAKE_SHEETS_ERROR_STATUS = int(os.getenv('FAKE_SHEETS_ERROR_STATUS', 503))
+
+# Tabs eines neuen Spreadsheets
+FAKE_SHEETS_TABS = [t.strip() for t in os.getenv('FAKE_SHEETS_TABS', 'Logs,Auszahlungen,Archiv').split(',') if t.strip()]
+
+# Standard-Gridgröße neuer Tabs (wie in Google Sheets)
+DEFAULT_ROWS = 1000
+DEFAULT_COLUMNS = 26
+
+_RANGE_RE = re.compile(r'^([A-Z]*)(\d*)$')
+
+
+# ==================== A1-NOTATION ====================
+
+def parse_range(range_name: str) -> Tuple[str, int, int, Optional[int], Optional[int]]:
+    """
+    Zerlege einen A1-Bereich
+
+    Returns:
+        (Tab, erste Zeile, erste Spalte, letzte Zeile, letzte Spalte) -
+        Zeilen 1-basiert, Spalten 0-basiert, None = offen
+    """
+    if '!' in range_name:
+        tab, cells = range_name.rsplit('!', 1)
+    else:
+        tab, cells = range_name, ''
+    tab = tab.strip("'")
+
+    if not cells:
+        return tab, 1, 0, None, None
+
+    start, _, end = cells.upper().partition(':')
+    start_match = _RANGE_RE.match(start)
+    end_match = _RANGE_RE.match(end or start)
+    if not start_match or not end_match:
+        raise ValueError(range_name)
+
+    first_row = int(start_match.group(2)) if start_match.group(2) else 1
+    first_col = column_index(start_match.group(1)) if start_match.group(1) else 0
+    last_row = int(end_match.group(2)) if end_match.group(2) else None
+    last_col = column_index(end_match.group(1)) if end_match.group(1) else None
+    return tab, first_row, first_col, last_row, last_col
+
+
+def _parse_user_entered(value: Any) -> Any:
+    """Zahlen in Strings erkennen wie bei valueInputOption=USER_ENTERED"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return value
+    if number.is_integer() and '.' not in text:
+        # Lange Ziffernfolgen (Discord-IDs) bleiben Text, statt Stellen zu verlieren
+        return int(number) if str(int(number)) == text else value
+    return number
+
+
+def _format_value(value: Any) -> Any:
+    """Zellwert wie bei valueRenderOption=FORMATTED_VALUE"""
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _trim(rows: List[List[Any]]) -> List[List[Any]]:
+    """Leere Zellen am Zeilenende und leere Zeilen am Ende weglassen (wie die API)"""
+    trimmed = []
+    for row in rows:
+        end = len(row)
+        while end and row[end - 1] in ('', None):
+            end -= 1
+        trimmed.append(row[:end])
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+def http_error(status: int, message: str) -> HttpError:
+    """HttpError wie vom googleapiclient"""
+    resp = httplib2.Response({'status': status})
+    resp.reason = message
+    content = json.dumps({'error': {'code': status, 'message': message}}).encode()
+    return HttpError(resp, content)
+
+
+# ==================== DATEN ====================
+
+class FakeTab:
+    """Ein Tab: Zeilen als Listen, dazu Grid-Größe und sheetId"""
+
+    def __init__(self, sheet_id: int, title: str, row_count: int = DEFAULT_ROWS, column_count: int = DEFAULT_COLUMNS):
+        self.sheet_id = sheet_id
+        self.title = title
+        self.row_count = row_count
+        self.column_count = column_count
+        self.rows: List[List[Any]] = []
+        self.extra: Dict[str, Any] = {}
+
+    def properties(self, index: int) -> Dict:
+        properties = dict(self.extra)
+        properties.update({
+            'sheetId': self.sheet_id,
+            'title': self.title,
+            'index': index,
+            'gridProperties': {'rowCount': self.row_count, 'columnCount': self.column_count}
+        })
+        return properties
+
+    def last_used_row(self) -> int:
+        """Letzte Zeile mit Inhalt (1-basiert, 0 = leer)"""
+        for index in range(len(self.rows) - 1, -1, -1):
+            if any(cell not in ('', None) for cell in self.rows[index]):
+                return index + 1
+        return 0
+
+    def read(self, first_row: int, first_col: int, last_row: Optional[int], last_col: Optional[int]) -> List[List[Any]]:
+        end_row = len(self.rows) if last_row is None else min(last_row, len(self.rows))
+        end_col = None if last_col is None else last_col + 1
+        return [row[first_col:end_col] for row in self.rows[first_row - 1:end_row]]
+
+    def write(self, first_row: int, first_col: int, values: List[List[Any]]):
+        needed_rows = first_row - 1 + len(values)
+        if needed_rows > len(self.rows):
+            self.rows.extend([] for _ in range(needed_rows - len(self.rows)))
+        for offset, values_row in enumerate(values):
+            row = self.rows[first_row - 1 + offset]
+            end = first_col + len(values_row)
+            if len(row) < end:
+                row.extend([''] * (end - len(row)))
+            row[first_col:end] = values_row
+
+
+class FakeSpreadsheet:
+    """Ein Spreadsheet mit seinen Tabs"""
+
+    def __init__(self, spreadsheet_id: str, tabs: List[str]):
+        self.spreadsheet_id = spreadsheet_id
+        self.tabs: List[FakeTab] = []
+        self._next_sheet_id = 0
+        for title in tabs:
+            self.add_tab(title)
+
+    def add_tab(self, title: str, row_count: int = DEFAULT_ROWS, column_count: int = DEFAULT_COLUMNS) -> FakeTab:
+        if self.tab(title) is not None:
+            raise http_error(400, f'A sheet with the name "{title}" already exists.')
+        tab = FakeTab(self._next_sheet_id, title, row_count, column_count)
+        self._next_sheet_id += 1
+        self.tabs.append(tab)
+        return tab
+
+    def tab(self, title: str) -> Optional[FakeTab]:
+        for tab in self.tabs:
+            if tab.title == title:
+                return tab
+        return None
+
+    def tab_by_id(self, sheet_id: int) -> FakeTab:
+        for tab in self.tabs:
+            if tab.sheet_id == sheet_id:
+                return tab
+        raise http_error(400, f'No grid with id: {sheet_id}')
+
+    def resolve(self, range_name: str) -> Tuple[FakeTab, int, int, Optional[int], Optional[int]]:
+        try:
+            title, first_row, first_col, last_row, last_col = parse_range(range_name)
+        except ValueError:
+            raise http_error(400, f'Unable to parse range: {range_name}')
+        tab = self.tab(title)
+        if tab is None:
+            raise http_error(400, f'Unable to parse range: {range_name}')
+        return tab, first_row, first_col, last_row, last_col
+
+
+# ==================== REQUESTS ====================
+
+class FakeRequest:
+    """Gegenstück zu googleapiclient.http.HttpRequest"""
+
+    def __init__(self, service: 'FakeSheetsService', method: str, method_id: str, handler: Callable[[], Dict]):
+        self.service = service
+        self.method = method
+        self.methodId = method_id
+        self._handler = handler
+
+    def execute(self, http=None, num_retries: int = 0) -> Dict:
+        return self.service.call(self)
+
+
+class _Values:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def get(self, spreadsheetId: str, range: str, valueRenderOption: str = 'FORMATTED_VALUE', **kwargs) -> FakeRequest:
+        return self._service.request('GET', 'values.get', lambda: self._service.values_get(
+            spreadsheetId, range, valueRenderOption
+        ))
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str], valueRenderOption: str = 'FORMATTED_VALUE', **kwargs) -> FakeRequest:
+        if isinstance(ranges, str):
+            ranges = [ranges]
+        return self._service.request('GET', 'values.batchGet', lambda: {
+            'spreadsheetId': spreadsheetId,
+            'valueRanges': [self._service.values_get(spreadsheetId, r, valueRenderOption) for r in ranges]
+        })
+
+    def append(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict, **kwargs) -> FakeRequest:
+        return self._service.request('POST', 'values.append', lambda: self._service.values_append(
+            spreadsheetId, range, valueInputOption, body.get('values', [])
+        ))
+
+    def update(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict, **kwargs) -> FakeRequest:
+        return self._service.request('PUT', 'values.update', lambda: self._service.values_update(
+            spreadsheetId, range, valueInputOption, body.get('values', [])
+        ))
+
+    def clear(self, spreadsheetId: str, range: str, body: Optional[Dict] = None, **kwargs) -> FakeRequest:
+        return self._service.request('POST', 'values.clear', lambda: self._service.values_clear(
+            spreadsheetId, range
+        ))
+
+
+class _Spreadsheets:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def values(self) -> _Values:
+        return _Values(self._service)
+
+    def get(self, spreadsheetId: str, **kwargs) -> FakeRequest:
+        return self._service.request('GET', 'get', lambda: self._service.get_spreadsheet(spreadsheetId))
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict) -> FakeRequest:
+        return self._service.request('POST', 'batchUpdate', lambda: self._service.batch_update(
+            spreadsheetId, body.get('requests', [])
+        ))
+
+
+# ==================== SERVICE ====================
+
+class FakeSheetsService:
+    """
+    In-Memory Ersatz für ``build('sheets', 'v4', ...)``
+
+    Args:
+        latency: Feste Latenz pro Request in Sekunden
+        jitter: Zusätzliche zufällige Latenz (0 bis jitter Sekunden)
+        error_rate: Anteil der Requests, die fehlschlagen (vor dem Ausführen)
+        error_status: HTTP-Status der injizierten Fehler (429, 500, 503, ...)
+        lost_response_rate: Anteil der Schreib-Requests, die ausgeführt
+            werden, deren Antwort aber verloren geht (testet Idempotenz)
+        tabs: Tabs neuer Spreadsheets
+        seed: Seed für reproduzierbare Latenzen und Fehler
+    """
+
+    def __init__(
+        self,
+        latency: float = FAKE_SHEETS_LATENCY,
+        jitter: float = FAKE_SHEETS_JITTER,
+        error_rate: float = FAKE_SHEETS_ERROR_RATE,
+        error_status: int = FAKE_SHEETS_ERROR_STATUS,
+        lost_response_rate: float = 0.0,
+        tabs: Optional[List[str]] = None,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.lost_response_rate = lost_response_rate
+        self.tabs = list(FAKE_SHEETS_TABS if tabs is None else tabs)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        self._forced_errors: List[int] = []
+        self._forced_losses = 0
+
+        # Statistiken: Requests pro Methode, injizierte Fehler
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    # ----- googleapiclient-Oberfläche -----
+
+    def spreadsheets(self) -> _Spreadsheets:
+        return _Spreadsheets(self)
+
+    def request(self, method: str, name: str, handler: Callable[[], Dict]) -> FakeRequest:
+        return FakeRequest(self, method, f'sheets.spreadsheets.{name}', handler)
+
+    def call(self, request: FakeRequest) -> Dict:
+        """Führe einen Request mit Latenz und Fehlerinjektion aus"""
+        with self._lock:
+            self.calls[request.methodId] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            forced = self._forced_errors.pop(0) if self._forced_errors else None
+            fail = forced is not None or (self.error_rate and self._random.random() < self.error_rate)
+            lose = request.method != 'GET' and (
+                self._forced_losses > 0
+                or (self.lost_response_rate and self._random.random() < self.lost_response_rate)
+            )
+            if lose and self._forced_losses > 0:
+                self._forced_losses -= 1
+
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            status = forced or self.error_status
+            with self._lock:
+                self.errors[status] += 1
+            raise http_error(status, 'Injected error')
+
+        with self._lock:
+            result = request._handler()
+
+        if lose:
+            with self._lock:
+                self.errors['lost'] += 1
+            raise http_error(503, 'Injected lost response')
+        return result
+
+    # ----- Steuerung für Tests -----
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """Lasse die nächsten ``count`` Requests mit ``status`` fehlschlagen"""
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    def lose_next(self, count: int = 1):
+        """Führe die nächsten ``count`` Schreib-Requests aus, verliere aber die Antwort"""
+        with self._lock:
+            self._forced_losses += count
+
+    def spreadsheet(self, spreadsheet_id: str) -> FakeSpreadsheet:
+        """Spreadsheet holen oder mit den Standard-Tabs anlegen"""
+        spreadsheet = self._spreadsheets.get(spreadsheet_id)
+        if spreadsheet is None:
+            spreadsheet = self._spreadsheets[spreadsheet_id] = FakeSpreadsheet(spreadsheet_id, self.tabs)
+        return spreadsheet
+
+    def seed_rows(self, spreadsheet_id: str, title: str, rows: List[List[Any]], start_row: int = 1):
+        """Schreibe Zeilen direkt (ohne Latenz, Fehler oder Zählung)"""
+        with self._lock:
+            spreadsheet = self.spreadsheet(spreadsheet_id)
+            tab = spreadsheet.tab(title) or spreadsheet.add_tab(title)
+            tab.write(start_row, 0, [list(row) for row in rows])
+            tab.row_count = max(tab.row_count, start_row - 1 + len(rows))
+
+    def rows(self, spreadsheet_id: str, title: str) -> List[List[Any]]:
+        """Aktueller Inhalt eines Tabs (Rohwerte, gekürzt wie die API)"""
+        with self._lock:
+            tab = self.spreadsheet(spreadsheet_id).tab(title)
+            return _trim([list(row) for row in tab.rows]) if tab else []
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.errors.clear()
+
+    # ----- Implementierung (unter self._lock) -----
+
+    def values_get(self, spreadsheet_id: str, range_name: str, render_option: str = 'FORMATTED_VALUE') -> Dict:
+        tab, first_row, first_col, last_row, last_col = self.spreadsheet(spreadsheet_id).resolve(range_name)
+        values = _trim(tab.read(first_row, first_col, last_row, last_col))
+        if render_option == 'FORMATTED_VALUE':
+            values = [[_format_value(cell) for cell in row] for row in values]
+
+        result = {'range': range_name, 'majorDimension': 'ROWS'}
+        if values:
+            result['values'] = values
+        return result
+
+    def values_append(self, spreadsheet_id: str, range_name: str, input_option: str, values: List[List[Any]]) -> Dict:
+        tab, _, first_col, _, _ = self.spreadsheet(spreadsheet_id).resolve(range_name)
+        if input_option == 'USER_ENTERED':
+            values = [[_parse_user_entered(cell) for cell in row] for row in values]
+
+        start = tab.last_used_row() + 1
+        tab.write(start, first_col, [list(row) for row in values])
+        end = start + len(values) - 1
+        tab.row_count = max(tab.row_count, end)
+
+        width = max((len(row) for row in values), default=0)
+        last_col = column_letters(first_col + max(width, 1) - 1)
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'updates': {
+                'spreadsheetId': spreadsheet_id,
+                'updatedRange': f"{tab.title}!{column_letters(first_col)}{start}:{last_col}{end}",
+                'updatedRows': len(values),
+                'updatedColumns': width,
+                'updatedCells': sum(len(row) for row in values)
+            }
+        }
+
+    def values_update(self, spreadsheet_id: str, range_name: str, input_option: str, values: List[List[Any]]) -> Dict:
+        tab, first_row, first_col, _, _ = self.spreadsheet(spreadsheet_id).resolve(range_name)
+        if input_option == 'USER_ENTERED':
+            values = [[_parse_user_entered(cell) for cell in row] for row in values]
+
+        end = first_row + len(values) - 1
+        if end > tab.row_count:
+            raise http_error(400, f"Range ('{tab.title}'!A{end}) exceeds grid limits. Max rows: {tab.row_count}")
+
+        tab.write(first_row, first_col, [list(row) for row in values])
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'updatedRange': range_name,
+            'updatedRows': len(values),
+            'updatedColumns': max((len(row) for row in values), default=0),
+            'updatedCells': sum(len(row) for row in values)
+        }
+
+    def values_clear(self, spreadsheet_id: str, range_name: str) -> Dict:
+        tab, first_row, first_col, last_row, last_col = self.spreadsheet(spreadsheet_id).resolve(range_name)
+        end_row = len(tab.rows) if last_row is None else min(last_row, len(tab.rows))
+        for row in tab.rows[first_row - 1:end_row]:
+            end_col = len(row) if last_col is None else min(last_col + 1, len(row))
+            for index in range(first_col, end_col):
+                row[index] = ''
+        return {'spreadsheetId': spreadsheet_id, 'clearedRange': range_name}
+
+    def get_spreadsheet(self, spreadsheet_id: str) -> Dict:
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'properties': {'title': 'Fake Sheets'},
+            'sheets': [{'properties': tab.properties(index)} for index, tab in enumerate(spreadsheet.tabs)]
+        }
+
+    def batch_update(self, spreadsheet_id: str, requests: List[Dict]) -> Dict:
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+
+        # Wie bei Google: ungültige sheetIds lassen den ganzen Batch scheitern
+        for request in requests:
+            for body in request.values():
+                sheet_id = _referenced_sheet_id(body)
+                if sheet_id is not None:
+                    spreadsheet.tab_by_id(sheet_id)
+
+        # Alles oder nichts: scheitert ein Request, wird der Stand vor dem Batch wiederhergestellt
+        snapshot = copy.deepcopy(spreadsheet.__dict__)
+        replies = []
+        try:
+            for request in requests:
+                kind, body = next(iter(request.items()))
+                handler = getattr(self, f'_apply_{kind}', None)
+                replies.append(handler(spreadsheet, body) if handler else {})
+        except Exception:
+            spreadsheet.__dict__.clear()
+            spreadsheet.__dict__.update(snapshot)
+            raise
+        return {'spreadsheetId': spreadsheet_id, 'replies': replies}
+
+    def _apply_addSheet(self, spreadsheet: FakeSpreadsheet, body: Dict) -> Dict:
+        properties = dict(body.get('properties', {}))
+        grid = properties.pop('gridProperties', {})
+        tab = spreadsheet.add_tab(
+            properties.pop('title', f'Sheet{len(spreadsheet.tabs) + 1}'),
+            grid.get('rowCount', DEFAULT_ROWS),
+            grid.get('columnCount', DEFAULT_COLUMNS)
+        )
+        properties.pop('sheetId', None)
+        properties.pop('index', None)
+        tab.extra.update(properties)
+        return {'addSheet': {'properties': tab.properties(spreadsheet.tabs.index(tab))}}
+
+    def _apply_deleteSheet(self, spreadsheet: FakeSpreadsheet, body: Dict) -> Dict:
+        spreadsheet.tabs.remove(spreadsheet.tab_by_id(body['sheetId']))
+        return {}
+
+    def _apply_updateSheetProperties(self, spreadsheet: FakeSpreadsheet, body: Dict) -> Dict:
+        properties = body.get('properties', {})
+        tab = spreadsheet.tab_by_id(properties.get('sheetId', 0))
+        if 'title' in properties:
+            tab.title = properties['title']
+        grid = properties.get('gridProperties', {})
+        tab.row_count = grid.get('rowCount', tab.row_count)
+        tab.column_count = grid.get('columnCount', tab.column_count)
+        return {}
+
+    def _apply_deleteDimension(self, spreadsheet: FakeSpreadsheet, body: Dict) -> Dict:
+        dimension = body['range']
+        tab = spreadsheet.tab_by_id(dimension.get('sheetId', 0))
+        start = dimension.get('startIndex', 0)
+        end = dimension.get('endIndex', tab.row_count if dimension['dimension'] == 'ROWS' else tab.column_count)
+
+        if dimension['dimension'] == 'ROWS':
+            if end > tab.row_count:
+                raise http_error(400, 'Invalid requests[deleteDimension]: Cannot delete rows beyond grid limits')
+            # Nachfolgende Zeilen rücken nach oben
+            del tab.rows[start:end]
+            tab.row_count -= end - start
+        else:
+            for row in tab.rows:
+                del row[start:end]
+            tab.column_count -= end - start
+        return {}
+
+    def _apply_cutPaste(self, spreadsheet: FakeSpreadsheet, body: Dict) -> Dict:
+        source = body['source']
+        tab = spreadsheet.tab_by_id(source.get('sheetId', 0))
+        first_col = source.get('startColumnIndex', 0)
+        last_col = source.get('endColumnIndex', tab.column_count) - 1
+        values = tab.read(source.get('startRowIndex', 0) + 1, first_col, source.get('endRowIndex'), last_col)
+        values = [row + [''] * (last_col - first_col + 1 - len(row)) for row in values]
+
+        # Quelle leeren, dann einfügen (Ziel darf sich mit der Quelle überschneiden)
+        for row in tab.rows[source.get('startRowIndex', 0):source.get('endRowIndex')]:
+            for index in range(first_col, min(last_col + 1, len(row))):
+                row[index] = ''
+
+        destination = body['destination']
+        target = spreadsheet.tab_by_id(destination.get('sheetId', 0))
+        first_row = destination.get('rowIndex', 0) + 1
+        target.write(first_row, destination.get('columnIndex', 0), values)
+        target.row_count = max(target.row_count, first_row + len(values) - 1)
+        return {}
+
+
+def _referenced_sheet_id(body: Any) -> Optional[int]:
+    """sheetId aus einem batchUpdate-Request (range, properties, ...)"""
+    if not isinstance(body, dict):
+        return None
+    for key in ('range', 'source', 'properties'):
+        value = body.get(key)
+        if isinstance(value, dict) and 'sheetId' in value:
+            return value['sheetId']
+    return body.get('sheetId') if 'properties' not in body else None
+
+
+# ==================== GEMEINSAME INSTANZ ====================
+
+_shared: Optional[FakeSheetsService] = None
+
+
+def shared_service() -> FakeSheetsService:
+    """Prozessweite Fake-Instanz (Bot, Admin Tools und Designer sehen dieselben Daten)"""
+    global _shared
+    if _shared is None:
+        _shared = FakeSheetsService()
+        print("🧪 Fake Google Sheets (In-Memory) aktiv")
+    return _shared
@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokaler SQLite-Spiegel für Discord Log Bot
+Hält die Tabs Logs, Auszahlungen und Archiv lokal vor, damit alle Lesezugriffe
+ohne Google-Request beantwortet werden können
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from weeks import parse_week, week_label
+
+# Pfad zur lokalen Datenbank
+LOCAL_DB_PATH = os.getenv('LOCAL_DB_PATH', 'logbot.db')
+
+# Spaltenreihenfolge entspricht exakt den Tabs in Google Sheets
+LOG_COLUMNS = ('timestamp', 'week', 'username', 'user_id', 'action', 'description', 'amount', 'image_url', 'log_id')
+PAYOUT_COLUMNS = ('timestamp', 'week', 'username', 'user_id', 'amount', 'log_count', 'status', 'admin', 'payout_id')
+ARCHIVE_COLUMNS = LOG_COLUMNS[:8] + ('archived_at', 'log_id')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT, week TEXT, username TEXT, user_id TEXT,
+    action TEXT, description TEXT, amount REAL, image_url TEXT,
+    log_id INTEGER,
+    synced INTEGER NOT NULL DEFAULT 1,
+    sheet_row INTEGER,
+    week_key INTEGER
+);
+DROP INDEX IF EXISTS idx_logs_week_user;
+CREATE INDEX IF NOT EXISTS idx_logs_week_key_user ON logs (week_key, user_id);
+CREATE INDEX IF NOT EXISTS idx_logs_log_id ON logs (log_id);
+
+CREATE TABLE IF NOT EXISTS payouts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT, week TEXT, username TEXT, user_id TEXT,
+    amount REAL, log_count INTEGER, status TEXT, admin TEXT,
+    payout_id TEXT,
+    synced INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_payouts_week_user ON payouts (week, user_id);
+CREATE INDEX IF NOT EXISTS idx_payouts_payout_id ON payouts (payout_id);
+
+CREATE TABLE IF NOT EXISTS archive (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT, week TEXT, username TEXT, user_id TEXT,
+    action TEXT, description TEXT, amount REAL, image_url TEXT,
+    archived_at TEXT,
+    log_id INTEGER,
+    synced INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_archive_week_user ON archive (week, user_id);
+
+CREATE TABLE IF NOT EXISTS pending_archives (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT, week TEXT, archived_at TEXT,
+    week_key INTEGER,
+    log_ids TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def parse_amount(value: Any) -> float:
+    """Wandle einen Betrag aus Sheets in float um (auch '5,00 €')"""
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).replace('€', '').replace('\xa0', '').strip()
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    return float(text) if text else 0.0
+
+
+def cell_text(value: Any) -> str:
+    """Zellwert als Text (UNFORMATTED_VALUE liefert ganze Zahlen als int/float)"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _pad(row: List[Any], width: int) -> List[Any]:
+    """Fülle kurze Sheets-Zeilen (leere Zellen am Ende) auf"""
+    return list(row[:width]) + [''] * (width - len(row))
+
+
+def _parse_log_id(value: Any) -> Optional[int]:
+    """Log-ID aus Sheets (leer bei Logs von vor der Einführung)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _with_week_key(row: List[Any]) -> List[Any]:
+    """Logs-Zeile plus ISO-Wochenschlüssel (KW-Text einmal beim Speichern geparst)"""
+    return row + [parse_week(row[1], row[0])]
+
+
+def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def _rows_for(values: List[List[Any]], width: int, amount_idx: int, id_idx: Optional[int] = None):
+    """Gültige Sheets-Zeilen als (Zeilennummer, aufgefüllte Zeile)"""
+    for i, row in enumerate(values):
+        if len(row) < amount_idx + 1:
+            continue
+        padded = _pad(row, width)
+        padded[3] = cell_text(padded[3])  # User-ID
+        try:
+            padded[amount_idx] = parse_amount(padded[amount_idx])
+        except ValueError:
+            continue
+        if id_idx is not None:
+            padded[id_idx] = _parse_log_id(padded[id_idx])
+        yield i + 2, padded  # +2 für Header und 0-Index
+
+
+def row_fingerprint(row: List[Any]) -> Tuple:
+    """
+    Vergleichswert einer Logs-Zeile (Woche, User-ID, Aktion, Betrag)
+
+    Zeitstempel und Freitext werden ignoriert, da Sheets sie je nach
+    Formatierung anders zurückgibt als sie geschrieben wurden.
+    """
+    padded = _pad(row, len(LOG_COLUMNS))
+    try:
+        amount = round(parse_amount(padded[6]), 2)
+    except ValueError:
+        amount = None
+    return cell_text(padded[1]).strip(), cell_text(padded[3]).strip(), cell_text(padded[4]).strip(), amount
+
+
+class LocalStore:
+    """
+    SQLite-Spiegel der drei Tabs
+
+    Alle Abfragen laufen über den Index (week, user_id) und sind damit
+    unabhängig von der Gesamtgröße des Logs-Tabs.
+    """
+
+    def __init__(self, path: str = LOCAL_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # Jeder Commit ist auf der Platte, bevor eine Aktion als erfolgreich gilt
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+        self._backfill_week_keys()
+        self.conn.commit()
+
+    def _migrate(self):
+        """Ergänze Spalten in bestehenden Datenbanken"""
+        for table, column, sql_type in (
+            ('logs', 'sheet_row', 'INTEGER'),
+            ('logs', 'log_id', 'INTEGER'),
+            ('logs', 'week_key', 'INTEGER'),
+            ('archive', 'log_id', 'INTEGER'),
+            ('archive', 'synced', 'INTEGER NOT NULL DEFAULT 1'),
+            ('pending_archives', 'week_key', 'INTEGER'),
+            ('pending_archives', 'log_ids', 'TEXT'),
+            ('payouts', 'payout_id', 'TEXT')
+        ):
+            columns = {r[1] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+            if columns and column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+
+    def _backfill_week_keys(self):
+        """Wochenschlüssel für Zeilen aus Datenbanken von vor der Einführung"""
+        self.conn.executemany(
+            "UPDATE logs SET week_key = ? WHERE id = ?",
+            [(parse_week(week, timestamp), row_id) for row_id, week, timestamp in self.conn.execute(
+                "SELECT id, week, timestamp FROM logs WHERE week_key IS NULL"
+            )]
+        )
+        self.conn.executemany(
+            "UPDATE pending_archives SET week_key = ? WHERE id = ?",
+            [(parse_week(week), op_id) for op_id, week in self.conn.execute(
+                "SELECT id, week FROM pending_archives WHERE week_key IS NULL"
+            )]
+        )
+
+    # ==================== SCHREIBEN ====================
+
+    def insert_log(self, row: List[Any], synced: bool = False, sheet_row: Optional[int] = None) -> int:
+        """
+        Speichere einen Log lokal, gibt die lokale ID zurück
+
+        Args:
+            sheet_row: Zeilennummer im Logs-Tab, falls bereits bekannt
+        """
+        values = _pad(row, len(LOG_COLUMNS))
+        values[6] = parse_amount(values[6])
+        values[8] = _parse_log_id(values[8])
+        cursor = self.conn.execute(
+            _insert_sql('logs', LOG_COLUMNS + ('week_key', 'synced', 'sheet_row')),
+            _with_week_key(values) + [int(synced), sheet_row]
+        )
+        if sheet_row is not None:
+            self._advance_cursor()
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def insert_payout(self, row: List[Any], synced: bool = False) -> int:
+        """Speichere eine Auszahlung lokal"""
+        values = _pad(row, len(PAYOUT_COLUMNS))
+        values[4] = parse_amount(values[4])
+        cursor = self.conn.execute(
+            _insert_sql('payouts', PAYOUT_COLUMNS + ('synced',)),
+            values + [int(synced)]
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def archive_logs(self, user_id: str, week: int, archived_at: str) -> Tuple[int, List[List[Any]]]:
+        """
+        Verschiebe die Logs eines Users in einer ISO-Woche lokal ins Archiv
+
+        Legt zusätzlich einen offenen Archiv-Auftrag mit den Log-IDs der
+        verschobenen Zeilen an, der später nach Google Sheets repliziert wird.
+
+        Returns:
+            (Auftrags-ID, archivierte Zeilen inkl. Archiv-Datum)
+        """
+        with self.conn:
+            rows = self._move_to_archive(str(user_id), week, archived_at)
+            cursor = self._add_pending_archive(str(user_id), week, archived_at, rows)
+        return cursor.lastrowid, rows
+
+    def record_payouts(self, payout_rows: List[List[Any]], archived_at: str) -> List[List[Any]]:
+        """
+        Verbuche mehrere Auszahlungen samt Archivierung in einer Transaktion
+
+        Args:
+            payout_rows: Zeilen im Format des Auszahlungen-Tabs
+            archived_at: Archiv-Datum für alle verschobenen Logs
+
+        Returns:
+            Archivierte Zeilen inkl. Archiv-Datum
+        """
+        archived = []
+        with self.conn:
+            for row in payout_rows:
+                values = _pad(row, len(PAYOUT_COLUMNS))
+                values[4] = parse_amount(values[4])
+                self.conn.execute(_insert_sql('payouts', PAYOUT_COLUMNS + ('synced',)), values + [0])
+
+                week, user_id = parse_week(values[1]), str(values[3])
+                rows = self._move_to_archive(user_id, week, archived_at)
+                self._add_pending_archive(user_id, week, archived_at, rows)
+                archived.extend(rows)
+        return archived
+
+    def _add_pending_archive(self, user_id: str, week: int, archived_at: str, rows: List[List[Any]]) -> sqlite3.Cursor:
+        """Offenen Archiv-Auftrag für die archivierten ``rows`` anlegen (ohne Commit)"""
+        log_ids = [row[9] for row in rows if row[9] is not None]
+        return self.conn.execute(
+            "INSERT INTO pending_archives (user_id, week, week_key, archived_at, log_ids) VALUES (?, ?, ?, ?, ?)",
+            (user_id, week_label(week), week, archived_at, json.dumps(log_ids))
+        )
+
+    def _move_to_archive(
+        self,
+        user_id: str,
+        week: int,
+        archived_at: str,
+        log_ids: Optional[List[int]] = None
+    ) -> List[List[Any]]:
+        """
+        Verschiebe Zeilen von logs nach archive (ohne Commit)
+
+        Noch nicht replizierte Logs stehen in keinem Tab - sie bleiben im
+        Archiv unrepliziert und werden direkt ins Archiv-Tab geschrieben.
+
+        Args:
+            log_ids: Nur diese Logs (und Zeilen ohne Log-ID) verschieben;
+                None verschiebt alle Logs des Users in der Woche
+        """
+        condition = "week_key = ? AND user_id = ?"
+        params: List[Any] = [week, user_id]
+        if log_ids is not None:
+            condition += f" AND (log_id IS NULL OR log_id IN ({', '.join('?' * len(log_ids))}))"
+            params += log_ids
+
+        rows = [list(r) for r in self.conn.execute(
+            f"SELECT {', '.join(LOG_COLUMNS)}, synced FROM logs WHERE {condition} ORDER BY id", params
+        )]
+        archived = [row[:8] + [archived_at, row[8]] for row in rows]
+
+        self.conn.execute(f"DELETE FROM logs WHERE {condition}", params)
+        self.conn.executemany(
+            _insert_sql('archive', ARCHIVE_COLUMNS + ('synced',)),
+            (values + [row[9]] for values, row in zip(archived, rows))
+        )
+        return archived
+
+    # ==================== REPLIKATION ====================
+
+    def mark_synced(self, table: str, ids: Iterable[int], sheet_rows: Optional[List[Optional[int]]] = None):
+        """
+        Markiere Zeilen als nach Sheets repliziert
+
+        Args:
+            sheet_rows: Zeilennummern im Logs-Tab (gleiche Reihenfolge wie ``ids``)
+        """
+        if table not in ('logs', 'payouts', 'archive'):
+            raise ValueError(f"Unbekannte Tabelle: {table}")
+
+        if table == 'logs' and sheet_rows is not None:
+            self.conn.executemany(
+                "UPDATE logs SET synced = 1, sheet_row = ? WHERE id = ?",
+                list(zip(sheet_rows, ids))
+            )
+            self._advance_cursor()
+        else:
+            self.conn.executemany(f"UPDATE {table} SET synced = 1 WHERE id = ?", [(i,) for i in ids])
+        self.conn.commit()
+
+    def unsynced_logs(self, limit: int = -1) -> List[Tuple[int, List[Any]]]:
+        """Logs die noch nicht in Sheets stehen (älteste zuerst)"""
+        return [
+            (r[0], list(r[1:])) for r in self.conn.execute(
+                f"SELECT id, {', '.join(LOG_COLUMNS)} FROM logs WHERE synced = 0 ORDER BY id LIMIT ?",
+                (limit,)
+            )
+        ]
+
+    def unsynced_payouts(self, limit: int = -1) -> List[Tuple[int, List[Any]]]:
+        """Auszahlungen die noch nicht in Sheets stehen (älteste zuerst)"""
+        return [
+            (r[0], list(r[1:])) for r in self.conn.execute(
+                f"SELECT id, {', '.join(PAYOUT_COLUMNS)} FROM payouts WHERE synced = 0 ORDER BY id LIMIT ?",
+                (limit,)
+            )
+        ]
+
+    def unsynced_archive(self, limit: int = -1) -> List[Tuple[int, List[Any]]]:
+        """Archivierte Logs, die vor ihrer Replikation ausgezahlt wurden (älteste zuerst)"""
+        return [
+            (r[0], list(r[1:])) for r in self.conn.execute(
+                f"SELECT id, {', '.join(ARCHIVE_COLUMNS)} FROM archive WHERE synced = 0 ORDER BY id LIMIT ?",
+                (limit,)
+            )
+        ]
+
+    def journal_depth(self) -> int:
+        """Anzahl lokaler Einträge (Logs, Auszahlungen, Archiv-Aufträge), die noch nach Sheets müssen"""
+        return self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM logs WHERE synced = 0)"
+            " + (SELECT COUNT(*) FROM payouts WHERE synced = 0)"
+            " + (SELECT COUNT(*) FROM archive WHERE synced = 0)"
+            " + (SELECT COUNT(*) FROM pending_archives)"
+        ).fetchone()[0]
+
+    def pending_archives(self) -> List[Tuple[int, str, int, str, Optional[List[int]]]]:
+        """
+        Offene Archiv-Aufträge (id, user_id, ISO-Woche, archived_at, Log-IDs)
+
+        Die Log-IDs sind None bei Aufträgen aus Datenbanken von vor ihrer
+        Einführung; dann gilt der Auftrag für alle Logs des Users in der Woche.
+        """
+        return [
+            (op_id, user_id, week, archived_at, json.loads(log_ids) if log_ids is not None else None)
+            for op_id, user_id, week, archived_at, log_ids in self.conn.execute(
+                "SELECT id, user_id, week_key, archived_at, log_ids FROM pending_archives ORDER BY id"
+            )
+        ]
+
+    def pending_archive_rows(self) -> List[List[Any]]:
+        """
+        Archivierte Zeilen offener Aufträge, die noch in einem Tab stehen
+
+        Noch nicht replizierte Logs fehlen hier, sie haben nie einen Tab erreicht.
+        """
+        log_ids = sorted({log_id for op in self.pending_archives() for log_id in op[4] or ()})
+        rows = []
+        for i in range(0, len(log_ids), 500):
+            chunk = log_ids[i:i + 500]
+            rows.extend(list(r) for r in self.conn.execute(
+                f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM archive"
+                f" WHERE synced = 1 AND log_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ))
+        return rows
+
+    def complete_archives(self, op_ids: Iterable[int]):
+        """Archiv-Aufträge wurden in Sheets ausgeführt"""
+        self.conn.executemany("DELETE FROM pending_archives WHERE id = ?", [(i,) for i in op_ids])
+        self.conn.commit()
+
+    def load_from_sheets(
+        self,
+        logs: List[List[Any]],
+        payouts: List[List[Any]],
+        archive: List[List[Any]],
+        partitions: Iterable[List[List[Any]]] = ()
+    ):
+        """
+        Ersetze den Spiegel durch den aktuellen Stand aus Google Sheets
+
+        Noch nicht replizierte lokale Zeilen bleiben erhalten (außer ihr Key
+        steht bereits in Sheets), offene Archiv-Aufträge werden erneut angewendet.
+
+        Args:
+            partitions: Zeilen der Wochen-Tabs (ohne Zeilennummer, der Cursor
+                gilt nur für den Logs-Tab)
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM logs WHERE synced = 1")
+            self.conn.execute("DELETE FROM payouts WHERE synced = 1")
+            self.conn.execute("DELETE FROM archive WHERE synced = 1")
+
+            self.conn.executemany(
+                _insert_sql('logs', LOG_COLUMNS + ('week_key', 'sheet_row')),
+                (_with_week_key(row) + [sheet_row] for sheet_row, row in _rows_for(logs, len(LOG_COLUMNS), 6, 8))
+            )
+            for rows in partitions:
+                self.conn.executemany(
+                    _insert_sql('logs', LOG_COLUMNS + ('week_key',)),
+                    (_with_week_key(row) for _, row in _rows_for(rows, len(LOG_COLUMNS), 6, 8))
+                )
+            self.conn.executemany(
+                _insert_sql('payouts', PAYOUT_COLUMNS),
+                (row for _, row in _rows_for(payouts, len(PAYOUT_COLUMNS), 4))
+            )
+            # Stempel eines abgebrochenen serverseitigen Laufs (nur Archiv-Datum und Log-ID) sind keine Logs
+            self.conn.executemany(
+                _insert_sql('archive', ARCHIVE_COLUMNS),
+                (row for _, row in _rows_for(archive, len(ARCHIVE_COLUMNS), 6, 9) if row[3])
+            )
+            self._set_cursor(len(logs) + 1)
+
+            # Lokale Zeilen, deren Append doch angekommen ist, nicht doppelt führen
+            self.conn.execute(
+                "DELETE FROM logs WHERE synced = 0 AND log_id IN (SELECT log_id FROM logs WHERE synced = 1)"
+            )
+            self.conn.execute(
+                "DELETE FROM payouts WHERE synced = 0 AND payout_id IN (SELECT payout_id FROM payouts WHERE synced = 1)"
+            )
+            self.conn.execute(
+                "DELETE FROM archive WHERE synced = 0 AND log_id IN (SELECT log_id FROM archive WHERE synced = 1)"
+            )
+
+            self._bump_log_seq(self.conn.execute(
+                "SELECT MAX(id) FROM (SELECT MAX(log_id) AS id FROM logs UNION ALL SELECT MAX(log_id) FROM archive)"
+            ).fetchone()[0])
+
+            for _, user_id, week, archived_at, log_ids in self.pending_archives():
+                self._move_to_archive(user_id, week, archived_at, log_ids)
+
+    # ==================== TAIL-CURSOR ====================
+
+    def _get_state(self, key: str, default: int) -> int:
+        value = self.get_meta(key)
+        return int(value) if value is not None else default
+
+    def _set_state(self, key: str, value: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+            (key, str(value))
+        )
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Beliebiger gespeicherter Wert (z.B. Hash der Slash-Commands)"""
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self._set_state(key, value)
+        self.conn.commit()
+
+    def logs_cursor(self) -> int:
+        """Letzte Zeilennummer im Logs-Tab, bis zu der der Spiegel vollständig ist"""
+        return self._get_state('logs_cursor', 1)
+
+    def _set_cursor(self, value: int):
+        self._set_state('logs_cursor', value)
+
+    # ==================== LOG-SEQUENZ ====================
+
+    def next_log_id(self) -> int:
+        """Vergib die nächste fortlaufende Log-ID (persistent, monoton steigend)"""
+        with self.conn:
+            log_id = self._get_state('log_seq', 0) + 1
+            self._set_state('log_seq', log_id)
+        return log_id
+
+    def _bump_log_seq(self, log_id: Optional[int]):
+        """Sequenz nie hinter bereits vergebene IDs (z.B. aus Sheets) zurückfallen lassen"""
+        if log_id and log_id > self._get_state('log_seq', 0):
+            self._set_state('log_seq', log_id)
+
+    def _advance_cursor(self):
+        """Schiebe den Cursor über lückenlos bekannte Zeilen hinweg"""
+        cursor = self.logs_cursor()
+        known = {r[0] for r in self.conn.execute(
+            "SELECT sheet_row FROM logs WHERE sheet_row > ?", (cursor,)
+        )}
+        while cursor + 1 in known:
+            cursor += 1
+        self._set_cursor(cursor)
+
+    def append_tail(self, first_sheet_row: int, rows: List[List[Any]]) -> List[List[Any]]:
+        """
+        Übernimm neue Zeilen ab ``first_sheet_row`` aus dem Logs-Tab
+
+        Zeilen die der Bot selbst geschrieben hat (Zeilennummer oder Log-ID
+        bereits bekannt) werden übersprungen.
+
+        Returns:
+            Die tatsächlich neu übernommenen Zeilen
+        """
+        known = {r[0] for r in self.conn.execute(
+            "SELECT sheet_row FROM logs WHERE sheet_row >= ?", (first_sheet_row,)
+        )}
+        added = []
+        with self.conn:
+            for offset, row in _rows_for(rows, len(LOG_COLUMNS), 6, 8):
+                sheet_row = first_sheet_row + offset - 2
+                if sheet_row in known:
+                    continue
+                if row[8] is not None and self.conn.execute(
+                    "SELECT 1 FROM logs WHERE log_id = ?", (row[8],)
+                ).fetchone():
+                    self.conn.execute("UPDATE logs SET sheet_row = ? WHERE log_id = ?", (sheet_row, row[8]))
+                    continue
+                self.conn.execute(
+                    _insert_sql('logs', LOG_COLUMNS + ('week_key', 'sheet_row')),
+                    _with_week_key(row) + [sheet_row]
+                )
+                self._bump_log_seq(row[8])
+                added.append(row)
+            self._set_cursor(max(self.logs_cursor(), first_sheet_row + len(rows) - 1))
+        return added
+
+    def replace_partition(self, week: int, rows: List[List[Any]]) -> bool:
+        """
+        Gleiche die Logs einer Woche mit ihrem Wochen-Tab ab
+
+        Betrifft nur replizierte Zeilen ohne Zeilennummer im Logs-Tab. Stimmen
+        die Zeilen (Vergleichswerte als Multimenge) überein, bleibt alles wie
+        es ist; sonst wird der lokale Stand der Woche durch den Tab ersetzt.
+
+        Returns:
+            True wenn sich der lokale Stand der Woche geändert hat (auch wenn
+            der Tab leer ist oder fehlt und nur Zeilen entfernt wurden)
+        """
+        condition = "week_key = ? AND synced = 1 AND sheet_row IS NULL"
+        local = [list(r) for r in self.conn.execute(
+            f"SELECT {', '.join(LOG_COLUMNS)} FROM logs WHERE {condition}", (week,)
+        )]
+        remote = [row for _, row in _rows_for(rows, len(LOG_COLUMNS), 6, 8)]
+        if sorted(map(row_fingerprint, local), key=repr) == sorted(map(row_fingerprint, remote), key=repr):
+            return False
+
+        with self.conn:
+            self.conn.execute(f"DELETE FROM logs WHERE {condition}", (week,))
+            self.conn.executemany(
+                _insert_sql('logs', LOG_COLUMNS + ('week_key',)),
+                (_with_week_key(row) for row in remote)
+            )
+            self._bump_log_seq(max((row[8] for row in remote if row[8] is not None), default=None))
+        return True
+
+    def apply_row_deletions(self, ranges: List[Tuple[int, int]]):
+        """
+        Verschiebe bekannte Zeilennummern nach Löschungen im Logs-Tab
+
+        Args:
+            ranges: 0-basierte ``[startIndex, endIndex)`` Bereiche, absteigend
+        """
+        with self.conn:
+            cursor = self.logs_cursor()
+            for start, end in ranges:
+                count = end - start
+                self.conn.execute("UPDATE logs SET sheet_row = NULL WHERE sheet_row > ? AND sheet_row <= ?", (start, end))
+                self.conn.execute("UPDATE logs SET sheet_row = sheet_row - ? WHERE sheet_row > ?", (count, end))
+                if cursor > end:
+                    cursor -= count
+                elif cursor > start:
+                    cursor = start
+            self._set_cursor(cursor)
+
+    def sample_rows(self, first: int, last: int) -> Dict[int, List[Any]]:
+        """Bekannte Zeilen im Bereich [first, last] des Logs-Tabs"""
+        return {
+            r[0]: list(r[1:]) for r in self.conn.execute(
+                f"SELECT sheet_row, {', '.join(LOG_COLUMNS)} FROM logs WHERE sheet_row BETWEEN ? AND ?",
+                (first, last)
+            )
+        }
+
+    # ==================== LESEN ====================
+
+    def week_logs(self, week: int, user_id: Optional[str] = None) -> List[List[Any]]:
+        """Alle offenen Logs einer ISO-Woche (optional nur für einen User)"""
+        if user_id is None:
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(LOG_COLUMNS)} FROM logs WHERE week_key = ? ORDER BY id",
+                (week,)
+            )
+        else:
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(LOG_COLUMNS)} FROM logs WHERE week_key = ? AND user_id = ? ORDER BY id",
+                (week, str(user_id))
+            )
+        return [list(r) for r in cursor]
+
+    def all_logs(self) -> List[List[Any]]:
+        """Alle offenen Logs in Tab-Reihenfolge"""
+        return [list(r) for r in self.conn.execute(
+            f"SELECT {', '.join(LOG_COLUMNS)} FROM logs ORDER BY id"
+        )]
+
+    def aggregate_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Offene Logs im Tab-Layout, nur mit den Spalten für Aggregate
+
+        Die KW-Spalte enthält den bereits geparsten ISO-Wochenschlüssel,
+        Zeitstempel, Beschreibung und Bild-URL bleiben leer. Die Zeilen werden
+        direkt aus dem Cursor gestreamt statt als Liste aufgebaut.
+        """
+        return self.conn.execute(
+            "SELECT '', week_key, username, user_id, action, '', amount FROM logs ORDER BY id"
+        )
+
+    def count_logs(self) -> int:
+        """Anzahl offener Logs (entspricht den Zeilen im Logs-Tab)"""
+        return self.conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+
+    def close(self):
+        """Schließe die Datenbank"""
+        self.conn.close()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metriken für Discord Log Bot
+Counter, Gauges und Histogramme im Prometheus-Textformat, optional über
+einen lokalen HTTP-Endpoint abrufbar (ohne zusätzliche Abhängigkeiten)
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ==================== KONFIGURATION ====================
+
+# Port des Metrik-Endpoints (0 = deaktiviert)
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+
+# Nur lokal erreichbar, außer explizit anders konfiguriert
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+# Standard-Buckets in Sekunden (Discord: 3 s bis zur Antwort)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Metric:
+    """Gemeinsame Basis: Name, Beschreibung, Labels, Thread-Lock"""
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    """Monoton steigender Zähler"""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f'{self.name}{_format_labels(self.labelnames, key)} {value}' for key, value in items]
+
+
+class Gauge(_Metric):
+    """Momentanwert, optional beim Abruf aus einer Funktion gelesen"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]):
+        self._function = function
+
+    def render(self) -> List[str]:
+        value = self._value
+        if self._function is not None:
+            try:
+                value = self._function()
+            except Exception:
+                value = float('nan')
+        return self.header() + [f'{self.name} {value}']
+
+
+class Histogram(_Metric):
+    """Verteilung von Dauern mit festen Buckets"""
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Labels -> (Zähler pro Bucket, Summe, Anzahl)
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Miss die Dauer eines Blocks (funktioniert auch um ``await``)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f'{self.name}_bucket{labels} {bucket_count}')
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{labels} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    """Alle Metriken im Prometheus-Textformat"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ==================== METRIKEN ====================
+
+INTERACTION_LATENCY = Histogram(
+    'logbot_interaction_seconds',
+    'Dauer von Slash-Commands und UI-Callbacks',
+    ('handler', 'outcome')
+)
+
+SHEETS_LATENCY = Histogram(
+    'logbot_sheets_request_seconds',
+    'Dauer einzelner Google-Sheets-Requests',
+    ('operation', 'tab', 'outcome')
+)
+
+JOURNAL_FLUSH_LATENCY = Histogram(
+    'logbot_journal_flush_seconds',
+    'Dauer eines Journal-Durchgangs nach Google Sheets',
+    ('outcome',)
+)
+
+JOURNAL_DEPTH = Gauge(
+    'logbot_journal_depth',
+    'Einträge im lokalen Journal, die noch nicht in Google Sheets stehen'
+)
+
+CACHE_REQUESTS = Counter(
+    'logbot_cache_requests_total',
+    'Cache-Zugriffe (metadata: sheetIds, logs_tail: inkrementell vs. voller Abgleich)',
+    ('cache', 'result')
+)
+
+PAYOUTS = Counter(
+    'logbot_payouts_total',
+    'Verbuchte Auszahlungen',
+    ('mode',)
+)
+
+PAYOUT_AMOUNT = Counter(
+    'logbot_payout_amount_euros_total',
+    'Ausgezahlter Gesamtbetrag in Euro'
+)
+
+PAYOUT_DMS = Counter(
+    'logbot_payout_dms_total',
+    'Verschickte Auszahlungs-DMs',
+    ('result',)
+)
+
+
+def timed(func):
+    """
+    Miss die Dauer eines Discord-Callbacks als ``handler=<qualname>``
+
+    Die Signatur bleibt erhalten (``functools.wraps``), damit discord.py
+    Parameter von Slash-Commands weiterhin erkennt.
+    """
+    handler = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            outcome = 'error'
+            raise
+        finally:
+            INTERACTION_LATENCY.observe(time.perf_counter() - start, handler=handler, outcome=outcome)
+
+    return wrapper
+
+
+# ==================== HTTP-ENDPOINT ====================
+
+async def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST):
+    """
+    Starte den Endpoint ``/metrics`` (nur wenn ein Port konfiguriert ist)
+
+    Returns:
+        Den aiohttp AppRunner (zum Beenden) oder None
+    """
+    if not port:
+        return None
+
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=render(), content_type='text/plain', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"📈 Metriken unter http://{host}:{port}/metrics")
+    return runner
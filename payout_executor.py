@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Payout Executor für Discord Log Bot
+Verarbeitet die Schritte einer Sammelauszahlung (z.B. DMs) mit begrenzter
+Parallelität und zeitbasierten Fortschritts-Updates
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Iterable, Optional, Tuple
+
+# Maximale Anzahl gleichzeitig verarbeiteter User
+PAYOUT_CONCURRENCY = int(os.getenv('PAYOUT_CONCURRENCY', 5))
+
+# Abstand der Fortschritts-Updates in Sekunden
+PAYOUT_PROGRESS_INTERVAL = float(os.getenv('PAYOUT_PROGRESS_INTERVAL', 2))
+
+
+class PayoutExecutor:
+    """
+    Führt einen Worker für viele Einträge parallel aus
+
+    Die Geschwindigkeit bestimmen die Token Buckets innerhalb des Workers
+    (Discord-DMs, Sheets-Writes) - der Executor begrenzt nur die Anzahl
+    gleichzeitig laufender Worker und meldet den Fortschritt.
+    """
+
+    def __init__(
+        self,
+        worker: Callable[[Any], Awaitable[Any]],
+        concurrency: int = PAYOUT_CONCURRENCY,
+        progress_interval: float = PAYOUT_PROGRESS_INTERVAL
+    ):
+        self.worker = worker
+        self.concurrency = max(1, concurrency)
+        self.progress_interval = progress_interval
+
+        self.done = 0
+        self.failed = 0
+
+    async def _run_one(self, semaphore: asyncio.Semaphore, item: Any, describe: Callable[[Any], str]) -> bool:
+        async with semaphore:
+            try:
+                await self.worker(item)
+                return True
+            except Exception as e:
+                print(f"❌ Fehler bei {describe(item)}: {e}")
+                self.failed += 1
+                return False
+            finally:
+                self.done += 1
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        describe: Callable[[Any], str] = str
+    ) -> Tuple[int, int]:
+        """
+        Verarbeite alle Einträge
+
+        Args:
+            items: Einträge (z.B. User-Dicts)
+            on_progress: Wird alle ``progress_interval`` Sekunden mit
+                (verarbeitet, gesamt) aufgerufen, solange noch Arbeit offen ist
+            describe: Beschreibung eines Eintrags für Fehlermeldungen
+
+        Returns:
+            (erfolgreich, fehlgeschlagen)
+        """
+        items = list(items)
+        self.done = 0
+        self.failed = 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = {asyncio.create_task(self._run_one(semaphore, item, describe)) for item in items}
+
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=self.progress_interval)
+            if pending and on_progress:
+                try:
+                    await on_progress(self.done, len(items))
+                except Exception as e:
+                    print(f"⚠️ Fortschritt konnte nicht aktualisiert werden: {e}")
+
+        return self.done - self.failed, self.failed
@@ -12,6 +12,7 @@ Features:
 - Metallic Purple Farbpalette
 - Chrome/Öl Effekt Styling
 - 4 Premium Tabs (Logs, Dashboard, Auszahlungen, Archiv)
+- Versteckter _Aggregates Tab (Wochen-Summen per QUERY)
 - Bedingte Formatierung
 - Live-Formeln & Dashboard
 - Dropdown-Menüs
@@ -23,13 +24,49 @@ from googleapiclient.errors import HttpError
 import os
 import json
 from dotenv import load_dotenv
-import time
+
+from sheets_client import SheetMetadataCache
+from quota import QuotaLimiter
+from fake_sheets import FAKE_SHEETS, shared_service as fake_sheets_service
+from weeks import parse_week_tab
 
 load_dotenv()
 
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
 
+# Tab-Titel, sheetIds und Grid-Größen (gleicher Cache wie im Bot)
+metadata = SheetMetadataCache()
+
+# Lese-/Schreib-Budgets mit Backoff bei 429 (gleiche Limits wie im Bot)
+quota = QuotaLimiter()
+
+# Spalten des Logs-Tabs (gleiches Layout in den Wochen-Tabs)
+LOG_HEADERS = ['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Log-ID']
+
+# Versteckter Tab mit Wochen-Summen, die Google selbst per QUERY berechnet
+AGGREGATES_TAB = '_Aggregates'
+AGGREGATES_HEADERS = ['KW', 'User-ID', 'Username', 'Aktion', 'Anzahl', 'Summe']
+
+
+def aggregates_formula(tabs=('Logs',)):
+    """
+    QUERY für den _Aggregates-Tab: eine Zeile pro Woche, User und Aktion
+
+    Mehrere Tabs (Logs und Wochen-Tabs) werden als Array untereinander
+    gestapelt, daher Col-Notation statt Spaltenbuchstaben. Gruppiert wird
+    nach dem rohen KW-Label; Wochen am Jahreswechsel (KW1, KW52, KW53) liest
+    der Bot deshalb weiter aus dem lokalen Index.
+    """
+    source = '; '.join(f"'{tab}'!A2:I" for tab in tabs)
+    return (
+        '=IFERROR(QUERY({' + source + '}, '
+        '"select Col2, Col4, max(Col3), Col5, count(Col7), sum(Col7) '
+        'where Col4 is not null group by Col2, Col4, Col5 '
+        "label max(Col3) '', count(Col7) '', sum(Col7) ''"
+        '", 0), "")'
+    )
+
 # 🎨 METALLIC PURPLE COLOR PALETTE (RGB 0-1 Format für Google Sheets API)
 COLORS = {
     # Primary Colors
@@ -57,6 +94,9 @@ COLORS = {
 
 def init_sheets():
     """Initialize Google Sheets Service"""
+    if FAKE_SHEETS:
+        return fake_sheets_service()
+    
     try:
         if os.getenv('GOOGLE_CREDENTIALS_BASE64'):
             import base64
@@ -68,7 +108,7 @@ def init_sheets():
         else:
             creds = Credentials.from_service_account_file('credentials.json', scopes=SCOPES)
         
-        return build('sheets', 'v4', credentials=creds)
+        return build('sheets', 'v4', credentials=creds, static_discovery=True, cache_discovery=False)
     except Exception as e:
         print(f"❌ Fehler: {e}")
         return None
@@ -79,18 +119,19 @@ def get_or_create_sheets(service):
     print("\n📄 Überprüfe Tabs...")
     
     try:
-        spreadsheet = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
-        existing_sheets = {sheet['properties']['title']: sheet['properties']['sheetId'] 
-                          for sheet in spreadsheet.get('sheets', [])}
+        if not metadata.loaded:
+            metadata.load(service, SPREADSHEET_ID, quota)
+        existing_sheets = metadata.sheet_ids()
         
         print(f"   Existierende Tabs: {list(existing_sheets.keys())}")
         
         # Tabs die erstellt werden müssen
         required_tabs = {
-            'Logs': {'color': COLORS['primary'], 'cols': 8, 'rows': 1000},
+            'Logs': {'color': COLORS['primary'], 'cols': 9, 'rows': 1000},
             '📊 Dashboard': {'color': COLORS['success'], 'cols': 12, 'rows': 50},
-            'Auszahlungen': {'color': COLORS['gold'], 'cols': 8, 'rows': 1000},
-            'Archiv': {'color': COLORS['secondary'], 'cols': 9, 'rows': 5000}
+            'Auszahlungen': {'color': COLORS['gold'], 'cols': 9, 'rows': 1000},
+            'Archiv': {'color': COLORS['secondary'], 'cols': 10, 'rows': 5000},
+            AGGREGATES_TAB: {'color': COLORS['secondary'], 'cols': 6, 'rows': 1000, 'hidden': True}
         }
         
         requests = []
@@ -105,7 +146,8 @@ def get_or_create_sheets(service):
                                 'rowCount': config['rows'],
                                 'columnCount': config['cols']
                             },
-                            'tabColor': config['color']
+                            'tabColor': config['color'],
+                            'hidden': config.get('hidden', False)
                         }
                     }
                 })
@@ -113,14 +155,12 @@ def get_or_create_sheets(service):
         
         if requests:
             body = {'requests': requests}
-            service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
+            response = quota.run(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body))
             print("✅ Tabs erstellt!")
             
-            # Neu laden für aktuelle Sheet IDs
-            time.sleep(1)
-            spreadsheet = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
-            existing_sheets = {sheet['properties']['title']: sheet['properties']['sheetId'] 
-                              for sheet in spreadsheet.get('sheets', [])}
+            # Neue Sheet IDs stehen in den Replies - kein erneutes Laden nötig
+            metadata.apply_replies(response)
+            existing_sheets = metadata.sheet_ids()
         
         return existing_sheets
         
@@ -129,27 +169,14 @@ def get_or_create_sheets(service):
         return {}
 
 
-def design_logs_tab(service, sheet_id):
-    """Premium Design für Logs Tab"""
-    print("\n🎨 Designe Logs Tab...")
-    
-    # Header eintragen
-    headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL']]
-    
-    body = {'values': headers}
-    service.spreadsheets().values().update(
-        spreadsheetId=SPREADSHEET_ID,
-        range='Logs!A1:H1',
-        valueInputOption='RAW',
-        body=body
-    ).execute()
-    
+def logs_tab_requests(sheet_id):
+    """Styling-Requests für Logs und Wochen-Tabs (Logs_2026W42), auch vom Bot genutzt"""
     requests = []
     
     # 1. Header Styling - Metallic Purple
     requests.append({
         'repeatCell': {
-            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1, 'startColumnIndex': 0, 'endColumnIndex': 8},
+            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1, 'startColumnIndex': 0, 'endColumnIndex': 9},
             'cell': {
                 'userEnteredFormat': {
                     'backgroundColor': COLORS['primary'],
@@ -172,7 +199,7 @@ def design_logs_tab(service, sheet_id):
     requests.append({
         'addConditionalFormatRule': {
             'rule': {
-                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 1000, 'startColumnIndex': 0, 'endColumnIndex': 8}],
+                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 1000, 'startColumnIndex': 0, 'endColumnIndex': 9}],
                 'booleanRule': {
                     'condition': {
                         'type': 'CUSTOM_FORMULA',
@@ -189,7 +216,7 @@ def design_logs_tab(service, sheet_id):
     requests.append({
         'addConditionalFormatRule': {
             'rule': {
-                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 1000, 'startColumnIndex': 0, 'endColumnIndex': 8}],
+                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 1000, 'startColumnIndex': 0, 'endColumnIndex': 9}],
                 'booleanRule': {
                     'condition': {
                         'type': 'CUSTOM_FORMULA',
@@ -269,7 +296,7 @@ def design_logs_tab(service, sheet_id):
     })
     
     # 6. Column Widths
-    widths = [160, 100, 140, 150, 130, 300, 100, 350]
+    widths = [160, 100, 140, 150, 130, 300, 100, 350, 90]
     for i, width in enumerate(widths):
         requests.append({
             'updateDimensionProperties': {
@@ -309,11 +336,51 @@ def design_logs_tab(service, sheet_id):
         }
     })
     
+    return requests
+
+
+def design_logs_tab(service, sheet_id, title='Logs'):
+    """Premium Design für Logs Tab (und Wochen-Tabs im partitionierten Layout)"""
+    print(f"\n🎨 Designe {title} Tab...")
+    
+    # Header eintragen
+    body = {'values': [LOG_HEADERS]}
+    quota.run(service.spreadsheets().values().update(
+        spreadsheetId=SPREADSHEET_ID,
+        range=f'{title}!A1:I1',
+        valueInputOption='RAW',
+        body=body
+    ))
+    
+    requests = logs_tab_requests(sheet_id)
+    
     # Execute
     try:
         body = {'requests': requests}
-        service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
-        print("✅ Logs Tab gestylt!")
+        quota.run(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body))
+        print(f"✅ {title} Tab gestylt!")
+        return True
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        return False
+
+
+def design_aggregates_tab(service, sheets):
+    """Header und QUERY-Formel für den versteckten _Aggregates Tab"""
+    print(f"\n🧮 Richte {AGGREGATES_TAB} Tab ein...")
+    
+    # Logs und Wochen-Tabs (Logs_2026W42) fließen in dieselbe Formel
+    tabs = ['Logs'] + sorted(title for title in sheets if parse_week_tab(title))
+    
+    try:
+        body = {'values': [AGGREGATES_HEADERS, [aggregates_formula(tabs)]]}
+        quota.run(service.spreadsheets().values().update(
+            spreadsheetId=SPREADSHEET_ID,
+            range=f'{AGGREGATES_TAB}!A1:F2',
+            valueInputOption='USER_ENTERED',
+            body=body
+        ))
+        print(f"✅ {AGGREGATES_TAB} Tab eingerichtet!")
         return True
     except Exception as e:
         print(f"❌ Fehler: {e}")
@@ -333,11 +400,11 @@ def design_dashboard_tab(service, sheet_id):
         # Row 3: Section Headers
         ['📊 GESAMTÜBERSICHT', '', '', '📅 DIESE WOCHE', '', '', '📆 HEUTE', '', '', '', '', ''],
         # Row 4: Stats
-        ['Gesamt Logs:', '=COUNTA(Logs!A:A)-1', '', 'Woche Logs:', '=COUNTIF(Logs!B:B,"KW"&WEEKNUM(TODAY())&"/"&YEAR(TODAY()))', '', 'Heute:', '=SUMPRODUCT((TEXT(Logs!A:A,"DD.MM.YYYY")=TEXT(TODAY(),"DD.MM.YYYY"))*1)', '', '', '', ''],
+        ['Gesamt Logs:', '=COUNTA(Logs!A:A)-1', '', 'Woche Logs:', '=COUNTIF(Logs!B:B,"KW"&ISOWEEKNUM(TODAY())&"/"&YEAR(TODAY()-WEEKDAY(TODAY(),2)+4))', '', 'Heute:', '=SUMPRODUCT((TEXT(Logs!A:A,"DD.MM.YYYY")=TEXT(TODAY(),"DD.MM.YYYY"))*1)', '', '', '', ''],
         # Row 5: Money
-        ['Gesamt €:', '=SUM(Logs!G:G)', '', 'Woche €:', '=SUMIF(Logs!B:B,"KW"&WEEKNUM(TODAY())&"/"&YEAR(TODAY()),Logs!G:G)', '', 'Heute €:', '=SUMPRODUCT((TEXT(Logs!A:A,"DD.MM.YYYY")=TEXT(TODAY(),"DD.MM.YYYY"))*Logs!G:G)', '', '', '', ''],
+        ['Gesamt €:', '=SUM(Logs!G:G)', '', 'Woche €:', '=SUMIF(Logs!B:B,"KW"&ISOWEEKNUM(TODAY())&"/"&YEAR(TODAY()-WEEKDAY(TODAY(),2)+4),Logs!G:G)', '', 'Heute €:', '=SUMPRODUCT((TEXT(Logs!A:A,"DD.MM.YYYY")=TEXT(TODAY(),"DD.MM.YYYY"))*Logs!G:G)', '', '', '', ''],
         # Row 6: Average
-        ['Ø pro Log:', '=IFERROR(AVERAGE(Logs!G:G),0)', '', 'Ø Woche:', '=IFERROR(AVERAGEIF(Logs!B:B,"KW"&WEEKNUM(TODAY())&"/"&YEAR(TODAY()),Logs!G:G),0)', '', '', '', '', '', '', ''],
+        ['Ø pro Log:', '=IFERROR(AVERAGE(Logs!G:G),0)', '', 'Ø Woche:', '=IFERROR(AVERAGEIF(Logs!B:B,"KW"&ISOWEEKNUM(TODAY())&"/"&YEAR(TODAY()-WEEKDAY(TODAY(),2)+4),Logs!G:G),0)', '', '', '', '', '', '', ''],
         # Row 7: Empty
         ['', '', '', '', '', '', '', '', '', '', '', ''],
         # Row 8: Section
@@ -368,12 +435,12 @@ def design_dashboard_tab(service, sheet_id):
     
     try:
         body = {'values': dashboard_data}
-        service.spreadsheets().values().update(
+        quota.run(service.spreadsheets().values().update(
             spreadsheetId=SPREADSHEET_ID,
             range='📊 Dashboard!A1:L21',
             valueInputOption='USER_ENTERED',
             body=body
-        ).execute()
+        ))
         
         print("✅ Dashboard Daten eingefügt!")
         
@@ -493,7 +560,7 @@ def design_dashboard_tab(service, sheet_id):
         })
         
         body = {'requests': requests}
-        service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
+        quota.run(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body))
         
         print("✅ Dashboard gestylt!")
         return True
@@ -508,22 +575,22 @@ def design_auszahlungen_tab(service, sheet_id):
     print("\n💰 Designe Auszahlungen Tab...")
     
     # Header
-    headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Betrag', 'Anzahl Logs', 'Status', 'Admin']]
+    headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Betrag', 'Anzahl Logs', 'Status', 'Admin', 'Payout-ID']]
     
     body = {'values': headers}
-    service.spreadsheets().values().update(
+    quota.run(service.spreadsheets().values().update(
         spreadsheetId=SPREADSHEET_ID,
-        range='Auszahlungen!A1:H1',
+        range='Auszahlungen!A1:I1',
         valueInputOption='RAW',
         body=body
-    ).execute()
+    ))
     
     requests = []
     
     # Header Styling - Gold Theme
     requests.append({
         'repeatCell': {
-            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1, 'startColumnIndex': 0, 'endColumnIndex': 8},
+            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1, 'startColumnIndex': 0, 'endColumnIndex': 9},
             'cell': {
                 'userEnteredFormat': {
                     'backgroundColor': COLORS['gold'],
@@ -545,7 +612,7 @@ def design_auszahlungen_tab(service, sheet_id):
     requests.append({
         'addConditionalFormatRule': {
             'rule': {
-                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 1000, 'startColumnIndex': 0, 'endColumnIndex': 8}],
+                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 1000, 'startColumnIndex': 0, 'endColumnIndex': 9}],
                 'booleanRule': {
                     'condition': {
                         'type': 'CUSTOM_FORMULA',
@@ -576,7 +643,7 @@ def design_auszahlungen_tab(service, sheet_id):
     })
     
     # Column Widths
-    widths = [160, 100, 140, 150, 100, 100, 100, 140]
+    widths = [160, 100, 140, 150, 100, 100, 100, 140, 140]
     for i, width in enumerate(widths):
         requests.append({
             'updateDimensionProperties': {
@@ -618,7 +685,7 @@ def design_auszahlungen_tab(service, sheet_id):
     
     try:
         body = {'requests': requests}
-        service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
+        quota.run(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body))
         print("✅ Auszahlungen Tab gestylt!")
         return True
     except Exception as e:
@@ -631,22 +698,22 @@ def design_archiv_tab(service, sheet_id):
     print("\n📁 Designe Archiv Tab...")
     
     # Header
-    headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Archiviert am']]
+    headers = [['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Archiviert am', 'Log-ID']]
     
     body = {'values': headers}
-    service.spreadsheets().values().update(
+    quota.run(service.spreadsheets().values().update(
         spreadsheetId=SPREADSHEET_ID,
-        range='Archiv!A1:I1',
+        range='Archiv!A1:J1',
         valueInputOption='RAW',
         body=body
-    ).execute()
+    ))
     
     requests = []
     
     # Header Styling - Dark Chrome Theme
     requests.append({
         'repeatCell': {
-            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1, 'startColumnIndex': 0, 'endColumnIndex': 9},
+            'range': {'sheetId': sheet_id, 'startRowIndex': 0, 'endRowIndex': 1, 'startColumnIndex': 0, 'endColumnIndex': 10},
             'cell': {
                 'userEnteredFormat': {
                     'backgroundColor': COLORS['secondary'],
@@ -668,7 +735,7 @@ def design_archiv_tab(service, sheet_id):
     requests.append({
         'addConditionalFormatRule': {
             'rule': {
-                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 5000, 'startColumnIndex': 0, 'endColumnIndex': 9}],
+                'ranges': [{'sheetId': sheet_id, 'startRowIndex': 1, 'endRowIndex': 5000, 'startColumnIndex': 0, 'endColumnIndex': 10}],
                 'booleanRule': {
                     'condition': {
                         'type': 'CUSTOM_FORMULA',
@@ -698,7 +765,7 @@ def design_archiv_tab(service, sheet_id):
     })
     
     # Column Widths
-    widths = [160, 100, 140, 150, 130, 280, 100, 320, 160]
+    widths = [160, 100, 140, 150, 130, 280, 100, 320, 160, 90]
     for i, width in enumerate(widths):
         requests.append({
             'updateDimensionProperties': {
@@ -740,7 +807,7 @@ def design_archiv_tab(service, sheet_id):
     
     try:
         body = {'requests': requests}
-        service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
+        quota.run(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body))
         print("✅ Archiv Tab gestylt!")
         return True
     except Exception as e:
@@ -752,14 +819,15 @@ def add_data_validation(service, sheets):
     """Füge Dropdown-Menüs und Validierung hinzu"""
     print("\n🔧 Füge Data Validation hinzu...")
     
-    logs_id = sheets.get('Logs')
-    if not logs_id:
+    # Logs und Wochen-Tabs (Logs_2026W42) haben dasselbe Layout
+    logs_ids = [sheet_id for title, sheet_id in sheets.items() if title == 'Logs' or parse_week_tab(title)]
+    if not logs_ids:
         return False
     
     requests = []
     
     # Aktion Dropdown in Logs Tab
-    requests.append({
+    requests.extend({
         'setDataValidation': {
             'range': {
                 'sheetId': logs_id,
@@ -781,11 +849,11 @@ def add_data_validation(service, sheets):
                 'strict': True
             }
         }
-    })
+    } for logs_id in logs_ids)
     
     try:
         body = {'requests': requests}
-        service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body).execute()
+        quota.run(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body))
         print("✅ Data Validation hinzugefügt!")
         return True
     except Exception as e:
@@ -813,24 +881,26 @@ def main():
         print("❌ Fehler beim Erstellen der Tabs!")
         return
     
-    time.sleep(1)
-    
-    # Design each tab
+    # Design each tab (Tempo über das Schreib-Budget statt fester Pausen)
     if 'Logs' in sheets:
         design_logs_tab(service, sheets['Logs'])
-        time.sleep(0.5)
+    
+    # Wochen-Tabs aus dem partitionierten Layout (LOGS_PARTITIONED)
+    for title, sheet_id in sheets.items():
+        if parse_week_tab(title):
+            design_logs_tab(service, sheet_id, title)
     
     if '📊 Dashboard' in sheets:
         design_dashboard_tab(service, sheets['📊 Dashboard'])
-        time.sleep(0.5)
     
     if 'Auszahlungen' in sheets:
         design_auszahlungen_tab(service, sheets['Auszahlungen'])
-        time.sleep(0.5)
     
     if 'Archiv' in sheets:
         design_archiv_tab(service, sheets['Archiv'])
-        time.sleep(0.5)
+    
+    if AGGREGATES_TAB in sheets:
+        design_aggregates_tab(service, sheets)
     
     # Add data validation
     add_data_validation(service, sheets)
@@ -845,6 +915,7 @@ def main():
     print("     • 📊 Dashboard (Live-Formeln & Statistiken)")
     print("     • Auszahlungen (Gold Theme)")
     print("     • Archiv (Dark Chrome Theme)")
+    print(f"     • {AGGREGATES_TAB} (versteckt, Wochen-Summen)")
     print("\n  🎨 Features:")
     print("     • Metallic Purple Farbpalette")
     print("     • Chrome/Öl Effekt Styling")
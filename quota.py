@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quota-Verwaltung für Google Sheets
+Getrennte Budgets für Lese- und Schreib-Requests, exponentielles Backoff mit
+Jitter (inkl. Retry-After) und ein "degraded"-Signal für Lesepfade
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import os
+import random
+import time
+from typing import Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+from rate_limit import TokenBucket
+
+# ==================== KONFIGURATION ====================
+
+# Requests pro Minute (Google-Quota: 60 Lese- und 60 Schreib-Requests pro Minute und User)
+SHEETS_READ_PER_MINUTE = int(os.getenv('SHEETS_READ_PER_MINUTE', 60))
+SHEETS_WRITE_PER_MINUTE = int(os.getenv('SHEETS_WRITE_PER_MINUTE', 60))
+
+# Wiederholungen bei 429 / 5xx (5xx nur für Lese-Requests)
+SHEETS_MAX_RETRIES = int(os.getenv('SHEETS_MAX_RETRIES', 5))
+SHEETS_BACKOFF_BASE = float(os.getenv('SHEETS_BACKOFF_BASE', 1))
+SHEETS_BACKOFF_MAX = float(os.getenv('SHEETS_BACKOFF_MAX', 32))
+
+# Unter diesem Anteil freier Tokens gilt ein Budget als knapp
+QUOTA_DEGRADED_RATIO = float(os.getenv('QUOTA_DEGRADED_RATIO', 0.2))
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def request_kind(request) -> str:
+    """'read' für GET-Requests (get, batchGet), sonst 'write'"""
+    return 'read' if getattr(request, 'method', 'GET') == 'GET' else 'write'
+
+
+def retry_after(error: HttpError) -> Optional[float]:
+    """Retry-After Header einer Antwort in Sekunden"""
+    value = getattr(error, 'resp', None) and error.resp.get('retry-after')
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, minimum: Optional[float] = None) -> float:
+    """Exponentielles Backoff mit vollem Jitter, mindestens ``minimum`` Sekunden"""
+    delay = random.uniform(0, min(SHEETS_BACKOFF_MAX, SHEETS_BACKOFF_BASE * 2 ** attempt))
+    return max(delay, minimum or 0.0)
+
+
+class QuotaLimiter:
+    """
+    Gemeinsamer Limiter für alle Google-Requests eines Prozesses
+
+    Jeder Request entnimmt vorher ein Token aus dem passenden Budget. Bei
+    einem 429 wird das Budget für die Backoff-Dauer gesperrt, damit auch
+    alle anderen Aufrufer warten statt weitere 429s zu produzieren.
+    """
+
+    def __init__(
+        self,
+        read_per_minute: int = SHEETS_READ_PER_MINUTE,
+        write_per_minute: int = SHEETS_WRITE_PER_MINUTE,
+        max_retries: int = SHEETS_MAX_RETRIES,
+        degraded_ratio: float = QUOTA_DEGRADED_RATIO
+    ):
+        self.buckets = {
+            'read': TokenBucket(read_per_minute / 60, max(1, read_per_minute // 6)),
+            'write': TokenBucket(write_per_minute / 60, max(1, write_per_minute // 6))
+        }
+        self.max_retries = max_retries
+        self.degraded_ratio = degraded_ratio
+
+        # Statistiken
+        self.throttled = 0
+        self.retries = 0
+
+    def degraded(self, kind: str = 'read') -> bool:
+        """True wenn das Budget fast aufgebraucht ist (Lesepfade sollen Cache nutzen)"""
+        bucket = self.buckets[kind]
+        return bucket.available < bucket.capacity * self.degraded_ratio
+
+    async def acquire(self, kind: str) -> float:
+        return await self.buckets[kind].acquire()
+
+    def acquire_sync(self, kind: str) -> float:
+        return self.buckets[kind].acquire_sync()
+
+    def retry_delay(self, error: Exception, attempt: int, kind: str) -> Optional[float]:
+        """
+        Wartezeit bis zum nächsten Versuch
+
+        Schreib-Requests werden nur nach 429 wiederholt: dann hat Google den
+        Request sicher abgelehnt. Nach 5xx ist offen, ob Append, cutPaste oder
+        deleteDimension schon ausgeführt wurden - ein blindes Wiederholen
+        schreibt doppelt bzw. löscht die falschen (inzwischen verschobenen)
+        Zeilen. Appends prüft ``IdempotentAppender`` vor jeder Wiederholung
+        über die Keys, alle anderen Schreibzugriffe werden vom Aufrufer neu
+        gelesen und geplant.
+
+        Returns:
+            Sekunden, oder None wenn der Fehler nicht wiederholt werden soll
+        """
+        if not isinstance(error, HttpError) or error.resp.status not in RETRYABLE_STATUSES:
+            return None
+        if kind == 'write' and error.resp.status != 429:
+            return None
+        if attempt >= self.max_retries:
+            return None
+
+        delay = backoff_delay(attempt, retry_after(error))
+        if error.resp.status == 429:
+            self.throttled += 1
+            self.buckets[kind].drain(delay)
+        self.retries += 1
+        return delay
+
+    def run(self, request) -> Dict:
+        """Führe einen googleapiclient-Request synchron mit Budget und Backoff aus"""
+        kind = request_kind(request)
+        attempt = 0
+        while True:
+            self.acquire_sync(kind)
+            try:
+                return request.execute()
+            except HttpError as e:
+                delay = self.retry_delay(e, attempt, kind)
+                if delay is None:
+                    raise
+                print(f"⚠️ Google API {e.resp.status} - neuer Versuch in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def stats(self) -> Dict:
+        """Aktuelle Kennzahlen beider Budgets"""
+        return {
+            'read': self.buckets['read'].stats(),
+            'write': self.buckets['write'].stats(),
+            'throttled': self.throttled,
+            'retries': self.retries
+        }
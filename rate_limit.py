@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rate Limiting für Discord Log Bot
+Token Buckets für Discord-DMs und Google-Sheets-Requests
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict
+
+# ==================== KONFIGURATION ====================
+
+# Discord DMs: dauerhaft erlaubte DMs pro Sekunde und kurzer Burst
+DM_RATE = float(os.getenv('DM_RATE', 4))
+DM_BURST = int(os.getenv('DM_BURST', 5))
+
+
+class TokenBucket:
+    """
+    Klassischer Token Bucket
+
+    Der Bucket füllt sich mit ``rate`` Tokens pro Sekunde bis maximal
+    ``capacity``. Tokens werden sofort reserviert (der Stand darf negativ
+    werden), der Aufrufer wartet danach die berechnete Zeit - dadurch werden
+    Wartende der Reihe nach bedient. Thread-safe, nutzbar aus dem Event Loop
+    (``acquire``) und aus synchronem Code (``acquire_sync``).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate muss > 0 und capacity >= 1 sein")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Aktuell verfügbare Tokens (negativ = reserviert)"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Reserviere Tokens ohne zu warten
+
+        Returns:
+            Zeit in Sekunden, die der Aufrufer noch warten muss
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            delay = max(0.0, -self._tokens / self.rate)
+            self.acquired += tokens
+            self.total_wait += delay
+            return delay
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """Entnimm Tokens und warte falls nötig (gibt die Wartezeit zurück)"""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def acquire_sync(self, tokens: int = 1) -> float:
+        """Wie ``acquire``, blockierend für synchronen Code"""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def drain(self, seconds: float):
+        """Sperre den Bucket für ``seconds`` Sekunden (z.B. nach einem 429)"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def stats(self) -> Dict:
+        """Aktuelle Kennzahlen des Buckets"""
+        return {
+            'rate': self.rate,
+            'capacity': self.capacity,
+            'available': self.available,
+            'acquired': self.acquired,
+            'total_wait': self.total_wait
+        }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kompakte Log-Datensätze für Discord Log Bot
+Jede Logs-Zeile wird genau einmal geparst: Beträge als ganze Cent, Wochen
+als ISO-Schlüssel (202642), Aktionen als kleine Integer-Codes, User-IDs und
+Namen als geteilte Strings
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from local_store import cell_text, parse_amount
+from weeks import parse_week, week_label
+
+
+class Codebook:
+    """Vergibt fortlaufende Integer-Codes für wiederkehrende Texte"""
+    __slots__ = ('_codes', '_values')
+
+    def __init__(self, values: Iterable[str] = ()):
+        self._codes: Dict[str, int] = {}
+        self._values: List[str] = []
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        """Code eines Textes (neue Texte bekommen den nächsten freien Code)"""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Code eines bekannten Textes, ohne einen neuen zu vergeben"""
+        return self._codes.get(value)
+
+    def value(self, code: int) -> str:
+        """Text zu einem Code"""
+        return self._values[code]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+# Prozessweit geteilt, damit Codes aus Bot, Index und Admin Tools übereinstimmen
+ACTIONS = Codebook()
+
+
+def to_cents(value: Any) -> int:
+    """Betrag aus Sheets oder SQLite als ganze Cent (5 -> 500, '12,99 €' -> 1299)"""
+    return round(parse_amount(value) * 100)
+
+
+def euros(cents: int) -> float:
+    """Cent als Euro-Betrag für Anzeige und Sheets"""
+    return cents / 100
+
+
+class LogRecord:
+    """Eine Logs-Zeile, reduziert auf die Felder für Summen und Statistiken"""
+    __slots__ = ('week', 'user_id', 'username', 'action', 'cents')
+
+    def __init__(self, week: int, user_id: str, username: str, action: int, cents: int):
+        self.week = week
+        self.user_id = user_id
+        self.username = username
+        self.action = action
+        self.cents = cents
+
+    @property
+    def week_label(self) -> str:
+        """Woche im Format des Logs-Tabs (KW{n}/{Jahr})"""
+        return week_label(self.week)
+
+    @property
+    def action_name(self) -> str:
+        """Name der Aktion"""
+        return ACTIONS.value(self.action)
+
+
+def parse_row(row: List[Any]) -> Optional[LogRecord]:
+    """
+    Parse eine Zeile im Layout des Logs-Tabs
+
+    Die KW-Spalte darf bereits ein ganzzahliger Schlüssel sein (lokaler
+    Spiegel), sonst wird sie mit dem Zeitstempel aus Spalte A geparst.
+
+    Returns:
+        LogRecord oder None bei unvollständigen Zeilen, unbekannter Woche
+        oder ungültigem Betrag
+    """
+    if len(row) < 7:
+        return None
+
+    week = parse_week(row[1], row[0])
+    if week is None:
+        return None
+
+    try:
+        cents = to_cents(row[6])
+    except ValueError:
+        return None
+
+    return LogRecord(
+        week,
+        sys.intern(cell_text(row[3])),
+        sys.intern(str(row[2])),
+        ACTIONS.code(str(row[4])),
+        cents
+    )
+
+
+def parse_rows(rows: Iterable[List[Any]]) -> List[LogRecord]:
+    """Parse alle gültigen Zeilen (z.B. Ergebnis von ``read_columns``)"""
+    records = []
+    for row in rows:
+        record = parse_row(row)
+        if record is not None:
+            records.append(record)
+    return records
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Async Google Sheets Client für Discord Log Bot
+Führt alle blockierenden googleapiclient-Aufrufe außerhalb des Event Loops aus
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from googleapiclient.errors import HttpError
+
+from metrics import CACHE_REQUESTS, SHEETS_LATENCY
+from quota import QuotaLimiter, request_kind
+
+# ==================== KONFIGURATION ====================
+
+# Maximale Anzahl gleichzeitiger Requests an Google
+SHEETS_MAX_CONCURRENCY = int(os.getenv('SHEETS_MAX_CONCURRENCY', 4))
+
+# Timeout pro Request in Sekunden
+SHEETS_TIMEOUT = float(os.getenv('SHEETS_TIMEOUT', 20))
+
+# Token so viele Sekunden vor Ablauf erneuern (statt beim ersten Request danach)
+TOKEN_REFRESH_MARGIN = float(os.getenv('TOKEN_REFRESH_MARGIN', 600))
+
+# Nur Tab-Titel, sheetIds und Grid-Größen laden (keine Formatierungsregeln)
+METADATA_FIELDS = 'sheets(properties(sheetId,title,gridProperties(rowCount,columnCount)))'
+
+# Zahlen als Zahlen (kein '5,00 €'), Datumswerte weiterhin als formatierter Text
+UNFORMATTED_READ = {'valueRenderOption': 'UNFORMATTED_VALUE', 'dateTimeRenderOption': 'FORMATTED_STRING'}
+
+# Spalten für Aggregationen im Logs-Tab: Zeitstempel (ISO-Jahr), KW, Username, User-ID, Aktion, Betrag
+AGGREGATE_COLUMNS = ('A', 'B', 'C', 'D', 'E', 'G')
+
+
+def is_invalid_sheet_error(error: Exception) -> bool:
+    """Prüfe ob ein Fehler auf eine veraltete sheetId / einen fehlenden Tab hindeutet"""
+    if not isinstance(error, HttpError) or error.resp.status != 400:
+        return False
+    message = str(error).lower()
+    return 'no grid with id' in message or 'unable to parse range' in message or 'sheetid' in message
+
+
+def first_updated_row(response: Dict) -> Optional[int]:
+    """Erste geschriebene Zeilennummer aus einer Append-Antwort ('Logs!A57:H59' -> 57)"""
+    updated_range = response.get('updates', {}).get('updatedRange', '')
+    cell = updated_range.split('!')[-1].split(':')[0]
+    digits = ''.join(c for c in cell if c.isdigit())
+    return int(digits) if digits else None
+
+
+def column_index(letters: str) -> int:
+    """Spaltenbuchstaben -> 0-basierter Index ('A' -> 0, 'AA' -> 26)"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def column_letters(index: int) -> str:
+    """0-basierter Index -> Spaltenbuchstaben (0 -> 'A')"""
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(65 + rest) + letters
+    return letters
+
+
+def column_blocks(columns: Sequence[str]) -> List[Tuple[int, int]]:
+    """Zusammenhängende Spaltenblöcke (['B', 'C', 'D', 'G'] -> [(1, 3), (6, 6)])"""
+    blocks: List[Tuple[int, int]] = []
+    for index in sorted({column_index(c) for c in columns}):
+        if blocks and blocks[-1][1] == index - 1:
+            blocks[-1] = (blocks[-1][0], index)
+        else:
+            blocks.append((index, index))
+    return blocks
+
+
+def column_ranges(tab: str, columns: Sequence[str], first_row: int = 2, last_row: Optional[int] = None) -> List[str]:
+    """A1-Bereiche für die Spaltenblöcke ('Logs', B-E + G -> ['Logs!B2:E', 'Logs!G2:G'])"""
+    end = str(last_row) if last_row is not None else ''
+    return [
+        f"{tab}!{column_letters(first)}{first_row}:{column_letters(last)}{end}"
+        for first, last in column_blocks(columns)
+    ]
+
+
+def expand_columns(value_ranges: List[List[List[Any]]], columns: Sequence[str]) -> List[List[Any]]:
+    """
+    Setze die Spaltenblöcke eines batchGet wieder zu Zeilen zusammen
+
+    Die Zeilen behalten das Layout des Tabs (row[6] ist weiterhin Spalte G),
+    nicht gelesene Spalten bleiben leer.
+    """
+    blocks = column_blocks(columns)
+    count = max((len(values) for values in value_ranges), default=0)
+    width = blocks[-1][1] + 1 if blocks else 0
+
+    rows = []
+    for i in range(count):
+        row = [''] * width
+        for (first, last), values in zip(blocks, value_ranges):
+            if i < len(values):
+                cells = values[i][:last - first + 1]
+                row[first:first + len(cells)] = cells
+        while row and row[-1] == '':
+            row.pop()
+        rows.append(row)
+    return rows
+
+
+def read_columns(
+    service,
+    spreadsheet_id: str,
+    tab: str,
+    columns: Sequence[str] = AGGREGATE_COLUMNS,
+    first_row: int = 2,
+    quota: Optional[QuotaLimiter] = None
+) -> List[List[Any]]:
+    """Synchrones ``values_columns`` für Designer und Admin Tools"""
+    request = service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=column_ranges(tab, columns, first_row),
+        **UNFORMATTED_READ
+    )
+    result = quota.run(request) if quota else request.execute()
+    return expand_columns([r.get('values', []) for r in result.get('valueRanges', [])], columns)
+
+
+def range_tab(range_name: str) -> str:
+    """Tab-Titel eines A1-Bereichs ("'Logs'!A2:I" -> 'Logs')"""
+    return range_name.split('!')[0].strip("'")
+
+
+def request_operation(request) -> str:
+    """Kurzname eines Requests ('sheets.spreadsheets.values.append' -> 'values.append')"""
+    method_id = getattr(request, 'methodId', '') or 'unknown'
+    return method_id.replace('sheets.spreadsheets.', '', 1)
+
+
+# ==================== METADATEN-CACHE ====================
+
+class SheetMetadataCache:
+    """
+    Cache für Tab-Titel, sheetIds und Grid-Größen
+
+    Wird einmal geladen und nur bei ungültigen sheetIds oder auf Anfrage
+    eines Admins neu geladen. Funktioniert mit dem synchronen Service
+    (Designer, Admin Tools) und über den AsyncSheetsClient.
+    """
+
+    def __init__(self):
+        self.tabs: Dict[str, Dict] = {}
+        self.loaded = False
+
+    def load(self, service, spreadsheet_id: str, quota: Optional[QuotaLimiter] = None) -> 'SheetMetadataCache':
+        """Lade die Metadaten synchron (ein Request mit fields-Maske)"""
+        request = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields=METADATA_FIELDS
+        )
+        spreadsheet = quota.run(request) if quota else request.execute()
+        self.update(spreadsheet)
+        return self
+
+    def update(self, spreadsheet: Dict):
+        """Übernimm die Metadaten aus einer spreadsheets().get Antwort"""
+        self.tabs = {}
+        for sheet in spreadsheet.get('sheets', []):
+            self._store(sheet.get('properties', {}))
+        self.loaded = True
+
+    def apply_replies(self, response: Dict):
+        """Übernimm neue Tabs aus den Replies eines batchUpdate (addSheet)"""
+        for reply in response.get('replies', []):
+            if 'addSheet' in reply:
+                self._store(reply['addSheet'].get('properties', {}))
+
+    def _store(self, properties: Dict):
+        grid = properties.get('gridProperties', {})
+        self.tabs[properties['title']] = {
+            'sheetId': properties['sheetId'],
+            'rowCount': grid.get('rowCount', 0),
+            'columnCount': grid.get('columnCount', 0)
+        }
+
+    def forget(self, title: str):
+        """Entferne einen gelöschten Tab aus dem Cache"""
+        self.tabs.pop(title, None)
+
+    def invalidate(self):
+        """Verwerfe den Cache (nächster Zugriff lädt neu)"""
+        self.tabs = {}
+        self.loaded = False
+
+    def sheet_id(self, title: str) -> Optional[int]:
+        """sheetId eines Tabs (None wenn nicht vorhanden)"""
+        tab = self.tabs.get(title)
+        return tab['sheetId'] if tab else None
+
+    def sheet_ids(self) -> Dict[str, int]:
+        """Alle Tabs als {Titel: sheetId}"""
+        return {title: tab['sheetId'] for title, tab in self.tabs.items()}
+
+    def grid_size(self, title: str) -> Tuple[int, int]:
+        """(rowCount, columnCount) eines Tabs"""
+        tab = self.tabs.get(title, {})
+        return tab.get('rowCount', 0), tab.get('columnCount', 0)
+
+
+class AsyncSheetsClient:
+    """
+    Non-blocking Wrapper um den synchronen Sheets Service
+
+    Jeder Request läuft in einem eigenen Worker-Thread. Die Anzahl paralleler
+    Requests ist über eine Semaphore begrenzt, jeder Aufruf hat ein Timeout.
+    Jeder Worker hält eine eigene Keep-Alive-Verbindung, das Token wird vor
+    Ablauf proaktiv erneuert (``refresh_token``).
+    """
+
+    def __init__(
+        self,
+        service,
+        spreadsheet_id: str,
+        credentials=None,
+        max_concurrency: int = SHEETS_MAX_CONCURRENCY,
+        timeout: float = SHEETS_TIMEOUT,
+        quota: Optional[QuotaLimiter] = None
+    ):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.credentials = credentials
+        self.timeout = timeout
+
+        # Lese-/Schreib-Budgets und Backoff (None = unbegrenzt, keine Wiederholung)
+        self.quota = quota
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='sheets'
+        )
+        self._local = threading.local()
+        self._creds_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.metadata = SheetMetadataCache()
+
+        # Statistiken: Verbindungen und Token
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.token_refreshes = 0
+        self.last_token_refresh = 0.0
+        self.total_token_refresh = 0.0
+
+    def _thread_http(self):
+        """
+        Eigene HTTP-Verbindung pro Worker-Thread
+
+        httplib2 ist nicht thread-safe, daher darf die Verbindung des
+        Service-Objekts nicht von mehreren Threads gleichzeitig genutzt werden.
+        """
+        if self.credentials is None:
+            return None
+
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            import httplib2
+            import google_auth_httplib2
+
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials,
+                http=httplib2.Http(timeout=self.timeout)
+            )
+            self._local.http = http
+        return http
+
+    def _execute_sync(self, request) -> Dict:
+        """Führe einen Request im Worker-Thread aus"""
+        http = self._thread_http()
+        if http is not None and not self.credentials.valid:
+            # Fallback falls der Token-Task zu spät kam: nur ein Thread erneuert
+            self._refresh_token_sync(only_if_invalid=True)
+        pool = getattr(http, 'http', None)
+        before = {id(c) for c in pool.connections.values()} if pool is not None else None
+        try:
+            return request.execute(http=http)
+        finally:
+            if before is not None:
+                opened = any(id(c) not in before for c in pool.connections.values())
+                with self._stats_lock:
+                    self.requests += 1
+                    if opened:
+                        self.connections_opened += 1
+                    else:
+                        self.connections_reused += 1
+
+    # ==================== TOKEN ====================
+
+    def token_expires_in(self) -> Optional[float]:
+        """Sekunden bis das Access Token abläuft (None = noch kein Token)"""
+        expiry = getattr(self.credentials, 'expiry', None)
+        if not getattr(self.credentials, 'token', None) or expiry is None:
+            return None
+        return (expiry - datetime.utcnow()).total_seconds()
+
+    def _refresh_token_sync(self, only_if_invalid: bool = False) -> float:
+        """Erneuere das Token im Worker-Thread, gibt die Dauer zurück"""
+        import google_auth_httplib2
+
+        with self._creds_lock:
+            if only_if_invalid and self.credentials.valid:
+                return 0.0
+            start = time.perf_counter()
+            self.credentials.refresh(google_auth_httplib2.Request(self._thread_http().http))
+            duration = time.perf_counter() - start
+
+        with self._stats_lock:
+            self.token_refreshes += 1
+            self.last_token_refresh = duration
+            self.total_token_refresh += duration
+        return duration
+
+    async def refresh_token(self, margin: float = TOKEN_REFRESH_MARGIN) -> bool:
+        """
+        Erneuere das Token, wenn es in weniger als ``margin`` Sekunden abläuft
+
+        Returns:
+            True wenn erneuert wurde
+        """
+        if self.credentials is None:
+            return False
+
+        remaining = self.token_expires_in()
+        if remaining is not None and remaining > margin:
+            return False
+
+        loop = asyncio.get_running_loop()
+        duration = await loop.run_in_executor(self._executor, self._refresh_token_sync)
+        print(f"🔑 Google Token erneuert ({duration * 1000:.0f} ms)")
+        return True
+
+    def transport_stats(self) -> Dict:
+        """Verbindungs-Wiederverwendung und Token-Erneuerungen"""
+        with self._stats_lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'connections_reused': self.connections_reused,
+                'reuse_ratio': self.connections_reused / self.requests if self.requests else 0.0,
+                'token_refreshes': self.token_refreshes,
+                'last_token_refresh': self.last_token_refresh,
+                'avg_token_refresh': self.total_token_refresh / self.token_refreshes if self.token_refreshes else 0.0,
+                'token_expires_in': self.token_expires_in()
+            }
+
+    def degraded(self, kind: str = 'read') -> bool:
+        """True wenn das Quota-Budget fast aufgebraucht ist"""
+        return self.quota.degraded(kind) if self.quota else False
+
+    async def execute(self, factory: Callable, timeout: Optional[float] = None, tab: str = '') -> Dict:
+        """
+        Führe einen beliebigen Request außerhalb des Event Loops aus
+
+        Vor jedem Versuch wird ein Token aus dem Lese- bzw. Schreib-Budget
+        entnommen. 429 wird mit Backoff wiederholt, 5xx nur bei Lese-Requests
+        (siehe ``QuotaLimiter.retry_delay``). Jeder Versuch
+        landet im Latenz-Histogramm (ohne Wartezeit auf das Budget).
+
+        Args:
+            factory: Funktion die aus ``service.spreadsheets()`` den Request baut
+            timeout: Optionales Timeout pro Versuch (Standard: SHEETS_TIMEOUT)
+            tab: Tab-Titel für die Metriken
+        """
+        request = factory(self.service.spreadsheets())
+        kind = request_kind(request)
+        operation = request_operation(request)
+        attempt = 0
+
+        while True:
+            if self.quota:
+                await self.quota.acquire(kind)
+            try:
+                async with self._semaphore:
+                    loop = asyncio.get_running_loop()
+                    start = time.perf_counter()
+                    outcome = 'error'
+                    try:
+                        result = await asyncio.wait_for(
+                            loop.run_in_executor(self._executor, self._execute_sync, request),
+                            timeout or self.timeout
+                        )
+                        outcome = 'ok'
+                        return result
+                    except asyncio.TimeoutError:
+                        outcome = 'timeout'
+                        raise
+                    except HttpError as e:
+                        outcome = str(e.resp.status)
+                        raise
+                    finally:
+                        SHEETS_LATENCY.observe(
+                            time.perf_counter() - start,
+                            operation=operation, tab=tab, outcome=outcome
+                        )
+            except HttpError as e:
+                delay = self.quota.retry_delay(e, attempt, kind) if self.quota else None
+                if delay is None:
+                    raise
+                print(f"⚠️ Google API {e.resp.status} - neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    # ==================== VALUES ====================
+
+    async def values_get(self, range_name: str, **kwargs) -> List[List[Any]]:
+        """Lese einen Bereich und gib die Zeilen zurück"""
+        result = await self.execute(lambda s: s.values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            **kwargs
+        ), tab=range_tab(range_name))
+        return result.get('values', [])
+
+    async def values_batch_get(self, ranges: List[str], **kwargs) -> List[List[List[Any]]]:
+        """Lese mehrere Bereiche in einem Request, Zeilen pro Bereich"""
+        result = await self.execute(lambda s: s.values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=ranges,
+            **kwargs
+        ), tab=','.join(dict.fromkeys(range_tab(r) for r in ranges)))
+        return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+
+    async def values_columns(
+        self,
+        tab: str,
+        columns: Sequence[str] = AGGREGATE_COLUMNS,
+        first_row: int = 2,
+        last_row: Optional[int] = None
+    ) -> List[List[Any]]:
+        """
+        Lies nur die angegebenen Spalten eines Tabs (ein batchGet)
+
+        Beträge kommen als Zahlen (UNFORMATTED_VALUE), Freitext und
+        Bild-URLs werden gar nicht erst übertragen.
+        """
+        value_ranges = await self.values_batch_get(
+            column_ranges(tab, columns, first_row, last_row),
+            **UNFORMATTED_READ
+        )
+        return expand_columns(value_ranges, columns)
+
+    async def values_append(
+        self,
+        range_name: str,
+        values: List[List[Any]],
+        value_input_option: str = 'USER_ENTERED'
+    ) -> Dict:
+        """Hänge Zeilen an einen Bereich an"""
+        return await self.execute(lambda s: s.values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            valueInputOption=value_input_option,
+            body={'values': values}
+        ), tab=range_tab(range_name))
+
+    async def values_update(
+        self,
+        range_name: str,
+        values: List[List[Any]],
+        value_input_option: str = 'RAW'
+    ) -> Dict:
+        """Überschreibe einen Bereich"""
+        return await self.execute(lambda s: s.values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            valueInputOption=value_input_option,
+            body={'values': values}
+        ), tab=range_tab(range_name))
+
+    async def values_clear(self, range_name: str) -> Dict:
+        """Leere einen Bereich"""
+        return await self.execute(lambda s: s.values().clear(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name
+        ), tab=range_tab(range_name))
+
+    # ==================== SPREADSHEET ====================
+
+    async def get_spreadsheet(self, **kwargs) -> Dict:
+        """Hole die Spreadsheet-Metadaten"""
+        return await self.execute(lambda s: s.get(
+            spreadsheetId=self.spreadsheet_id,
+            **kwargs
+        ))
+
+    async def batch_update(self, requests: List[Dict]) -> Dict:
+        """Führe strukturelle Änderungen (batchUpdate) aus"""
+        return await self.execute(lambda s: s.batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'requests': requests}
+        ))
+
+    # ==================== METADATEN ====================
+
+    async def refresh_metadata(self) -> SheetMetadataCache:
+        """Lade Tab-Titel, sheetIds und Grid-Größen neu"""
+        spreadsheet = await self.get_spreadsheet(fields=METADATA_FIELDS)
+        self.metadata.update(spreadsheet)
+        return self.metadata
+
+    async def _ensure_metadata(self):
+        """Lade die Metadaten beim ersten Zugriff (zählt Cache-Treffer)"""
+        if self.metadata.loaded:
+            CACHE_REQUESTS.inc(cache='metadata', result='hit')
+            return
+        CACHE_REQUESTS.inc(cache='metadata', result='miss')
+        await self.refresh_metadata()
+
+    async def sheet_id(self, title: str) -> Optional[int]:
+        """sheetId eines Tabs aus dem Cache (lädt beim ersten Zugriff)"""
+        await self._ensure_metadata()
+        return self.metadata.sheet_id(title)
+
+    async def batch_update_tabs(self, build_requests: Callable[[SheetMetadataCache], List[Dict]]) -> Dict:
+        """
+        batchUpdate mit sheetIds aus dem Cache
+
+        Schlägt der Request wegen einer ungültigen sheetId fehl, wird der Cache
+        einmal neu geladen und der Request mit frischen IDs wiederholt.
+        """
+        await self._ensure_metadata()
+
+        try:
+            return await self.batch_update(build_requests(self.metadata))
+        except HttpError as e:
+            if not is_invalid_sheet_error(e):
+                raise
+            CACHE_REQUESTS.inc(cache='metadata', result='stale')
+            print("⚠️ Ungültige sheetId - lade Metadaten neu...")
+            await self.refresh_metadata()
+            return await self.batch_update(build_requests(self.metadata))
+
+    async def add_tab(self, title: str, rows: int = 1000, columns: int = 26, properties: Optional[Dict] = None) -> int:
+        """
+        Lege einen Tab an und übernimm die sheetId aus den Replies
+
+        Existiert der Tab bereits (z.B. von einer zweiten Instanz angelegt),
+        wird die vorhandene sheetId zurückgegeben.
+        """
+        try:
+            response = await self.batch_update([{
+                'addSheet': {
+                    'properties': {
+                        'title': title,
+                        'gridProperties': {'rowCount': rows, 'columnCount': columns},
+                        **(properties or {})
+                    }
+                }
+            }])
+            self.metadata.apply_replies(response)
+        except HttpError as e:
+            if e.resp.status != 400:
+                raise
+            await self.refresh_metadata()
+            if self.metadata.sheet_id(title) is None:
+                raise
+        return self.metadata.sheet_id(title)
+
+    async def delete_tab(self, title: str) -> bool:
+        """Lösche einen Tab (False wenn er nicht existiert)"""
+        if await self.sheet_id(title) is None:
+            return False
+        await self.batch_update_tabs(lambda metadata: [{'deleteSheet': {'sheetId': metadata.sheet_id(title)}}])
+        self.metadata.forget(title)
+        return True
+
+    def close(self):
+        """Beende die Worker-Threads"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Fixtures: Bot gegen Fake Google Sheets mit frischem lokalen Spiegel
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Vor dem Import des Bots: Fake-Sheets, temporärer Spiegel, kurze Backoffs
+os.environ['FAKE_SHEETS'] = '1'
+os.environ.setdefault('SPREADSHEET_ID', 'test')
+os.environ['LOCAL_DB_PATH'] = os.path.join(tempfile.mkdtemp(prefix='logbot-test-'), 'bootstrap.db')
+os.environ['LOG_OUTPUT_CHANNEL_ID'] = ''
+os.environ.setdefault('SHEETS_READ_PER_MINUTE', '1000000')
+os.environ.setdefault('SHEETS_WRITE_PER_MINUTE', '1000000')
+os.environ.setdefault('SHEETS_BACKOFF_BASE', '0.01')
+
+import bot as logbot  # noqa: E402
+import fake_sheets  # noqa: E402
+from aggregates import WeekAggregateIndex  # noqa: E402
+from local_store import LocalStore  # noqa: E402
+
+LOG_HEADER = ['Zeitstempel', 'KW', 'Username', 'User-ID', 'Aktion', 'Beschreibung', 'Betrag', 'Bild-URL', 'Log-ID']
+PAYOUT_HEADER = ['Zeitstempel', 'KW', 'Username', 'User-ID', 'Betrag', 'Logs', 'Status', 'Admin', 'Payout-ID']
+ARCHIVE_HEADER = LOG_HEADER[:8] + ['Archiviert am', 'Log-ID']
+
+
+@pytest.fixture
+def service():
+    """Frischer Fake-Backend ohne Latenz, mit Headern in allen Tabs"""
+    service = fake_sheets.FakeSheetsService(latency=0.0, jitter=0.0, error_rate=0.0, seed=1)
+    service.seed_rows(os.environ['SPREADSHEET_ID'], 'Logs', [LOG_HEADER])
+    service.seed_rows(os.environ['SPREADSHEET_ID'], 'Auszahlungen', [PAYOUT_HEADER])
+    service.seed_rows(os.environ['SPREADSHEET_ID'], 'Archiv', [ARCHIVE_HEADER])
+    fake_sheets._shared = service
+    return service
+
+
+@pytest.fixture
+def bot(service, tmp_path):
+    """Bot-Modul mit frischem Spiegel und Index, verbunden mit ``service``"""
+    logbot.bot.store = LocalStore(str(tmp_path / 'store.db'))
+    logbot.bot.index = WeekAggregateIndex(logbot.PAYMENT_AMOUNTS.keys())
+    logbot.bot.sheets_service = None
+    assert logbot.bot.connect_sheets()
+    return logbot
+
+
+def member(user_id=1, name='member'):
+    """Discord-Mitglied mit den Feldern, die save_log nutzt"""
+    return SimpleNamespace(id=user_id, name=name, display_name=name)
+
+
+def sheet_rows(service, title):
+    """Datenzeilen eines Tabs ohne Header"""
+    return service.rows(os.environ['SPREADSHEET_ID'], title)[1:]
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Wochen-Aggregate: lokaler Index und _Aggregates-Tab
+"""
+
+import asyncio
+
+from aggregates import WeekAggregateIndex
+from conftest import member
+from weeks import current_week
+
+ACTIONS = ('Düngen', 'Ernten')
+
+
+def row(user_id, action='Düngen', amount=5, week='KW42/2026', name=None):
+    return ['18.10.2026 10:00:00', week, name or f'user{user_id}', user_id, action, '', amount, '', '']
+
+
+def test_add_row_sums_per_week_and_user():
+    index = WeekAggregateIndex(ACTIONS)
+    index.add_row(row('1', 'Düngen', 5))
+    index.add_row(row('1', 'Ernten', '2,50 €'))
+    index.add_row(row('2', 'Düngen', 5))
+    index.add_row(row('1', 'Düngen', 5, week='KW43/2026'))
+
+    aggregate = index.user(202642, '1')
+    assert (aggregate.cents, aggregate.logs, aggregate.breakdown) == (750, 2, {'Düngen': 1, 'Ernten': 1})
+    assert index.week_action_counts(202642) == {'Düngen': 2, 'Ernten': 1}
+    assert [a.user_id for a in index.users(202642)] == ['1', '2']
+    assert index.user(202643, '1').logs == 1
+
+
+def test_add_row_skips_incomplete_rows():
+    index = WeekAggregateIndex(ACTIONS)
+    index.add_row(row('1')[:5])
+    index.add_row(row('1', week='unbekannt'))
+    index.add_row(row('1', amount='abc'))
+
+    assert index.weeks == {}
+
+
+def test_remove_row_subtracts_single_log():
+    index = WeekAggregateIndex(ACTIONS)
+    index.add_row(row('1', 'Düngen', 5))
+    index.add_row(row('1', 'Ernten', 3))
+
+    index.remove_row(row('1', 'Düngen', 5))
+
+    aggregate = index.user(202642, '1')
+    assert (aggregate.cents, aggregate.logs, aggregate.breakdown) == (300, 1, {'Düngen': 0, 'Ernten': 1})
+    assert index.week_action_counts(202642) == {'Düngen': 0, 'Ernten': 1}
+
+
+def test_remove_last_row_drops_user_and_week():
+    index = WeekAggregateIndex(ACTIONS)
+    index.add_row(row('1'))
+
+    index.remove_row(row('1'))
+    index.remove_row(row('1'))  # Unbekannte Zeilen werden ignoriert
+
+    assert index.user(202642, '1') is None
+    assert index.weeks == {}
+    assert index.week_action_counts(202642) == {'Düngen': 0, 'Ernten': 0}
+
+
+def test_remove_user_keeps_other_users():
+    index = WeekAggregateIndex(ACTIONS)
+    index.add_row(row('1', 'Düngen'))
+    index.add_row(row('2', 'Ernten'))
+
+    removed = index.remove_user(202642, '1')
+
+    assert removed.logs == 1
+    assert index.user(202642, '1') is None
+    assert index.week_action_counts(202642) == {'Düngen': 0, 'Ernten': 1}
+    assert index.remove_user(202642, '1') is None
+    assert index.remove_user(202601, '2') is None
+
+
+def test_rebuild_replaces_index():
+    index = WeekAggregateIndex(ACTIONS)
+    index.add_row(row('1'))
+
+    index.rebuild([row('2'), row('2')])
+
+    assert index.user(202642, '1') is None
+    assert index.user(202642, '2').logs == 2
+
+
+def test_log_progress_reads_local_index(bot, monkeypatch):
+    reads = []
+
+    async def read_summary():
+        reads.append(1)
+        return []
+
+    monkeypatch.setattr(bot, 'AGGREGATES_SOURCE', 'sheet')
+    monkeypatch.setattr(bot, 'read_summary', read_summary)
+    asyncio.run(bot.save_log(member(), 'Düngen', '', ''))
+
+    # Fortschritt nach dem Log: kein Google-Request
+    assert asyncio.run(bot.get_user_week_earnings(1))['logs'] == 1
+    assert reads == []
+
+    # Statistik-Button liest den _Aggregates-Tab
+    asyncio.run(bot.get_user_week_earnings(1, summary=True))
+    assert reads == [1]
+
+
+def test_sheet_summary_defers_year_boundary_weeks_to_local_index(bot, monkeypatch):
+    # Älteres Label: 30.12.2024 gehört zu KW1/2025, steht aber als KW1/2024 im Tab
+    amount = bot.PAYMENT_AMOUNTS['Düngen']
+    bot.bot.store.insert_log(['30.12.2024 12:00:00', 'KW1/2024', 'member', '1', 'Düngen', '', amount, '', 7], synced=True)
+    bot.rebuild_index()
+    summary = [
+        ['KW1/2024', '1', 'member', 'Düngen', 1, amount],
+        ['KW20/2024', '1', 'member', 'Düngen', 2, 2 * amount],
+    ]
+
+    async def read_summary():
+        return summary
+
+    monkeypatch.setattr(bot, 'AGGREGATES_SOURCE', 'sheet')
+    monkeypatch.setattr(bot, 'read_summary', read_summary)
+    index = asyncio.run(bot.summary_index())
+
+    assert index.user(202501, '1').logs == 1
+    assert index.user(202401, '1') is None
+    assert index.user(202420, '1').logs == 2
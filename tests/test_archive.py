@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Serverseitiges Archivieren (ARCHIVE_MODE=server) bei Fehlern und verlorenen Antworten
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import member, sheet_rows
+from weeks import current_week
+
+
+@pytest.fixture
+def server_mode(bot, monkeypatch):
+    monkeypatch.setattr(bot, 'ARCHIVE_MODE', 'server')
+    log_id = asyncio.run(bot.save_log(member(), 'Düngen', 'online', ''))
+    assert asyncio.run(bot.replicate_pending())
+    assert asyncio.run(bot.archive_user_logs(1, current_week()))
+    return log_id
+
+
+def inject_on_batch(bot, monkeypatch, inject):
+    """Fehler erst beim batchUpdate mit den cutPaste-Requests auslösen"""
+    original = bot.bot.sheets.batch_update
+
+    async def batch_update(requests):
+        if any('cutPaste' in request for request in requests):
+            inject()
+        return await original(requests)
+
+    monkeypatch.setattr(bot.bot.sheets, 'batch_update', batch_update)
+
+
+def assert_archived_once(service, log_id):
+    archive = sheet_rows(service, 'Archiv')
+    assert [str(row[9]) for row in archive] == [str(log_id)]
+    assert archive[0][4] == 'Düngen'
+    assert sheet_rows(service, 'Logs') == []
+
+
+def test_lost_stamp_response_writes_one_stamp(bot, service, server_mode):
+    service.lose_next(1)
+
+    assert asyncio.run(bot.replicate_pending())
+
+    assert_archived_once(service, server_mode)
+
+
+def test_lost_move_response_is_checked_not_resent(bot, service, server_mode, monkeypatch):
+    inject_on_batch(bot, monkeypatch, lambda: service.lose_next(1))
+
+    assert asyncio.run(bot.replicate_pending())
+
+    assert_archived_once(service, server_mode)
+    assert bot.bot.store.pending_archives() == []
+
+
+def test_failed_move_reuses_stamp(bot, service, server_mode, monkeypatch):
+    inject_on_batch(bot, monkeypatch, lambda: service.fail_next(1, 500))
+    assert not asyncio.run(bot.replicate_pending())
+
+    # Zeile noch im Logs-Tab, Stempel mit Log-ID bleibt stehen
+    assert len(sheet_rows(service, 'Logs')) == 1
+    assert [str(row[9]) for row in sheet_rows(service, 'Archiv')] == [str(server_mode)]
+
+    monkeypatch.undo()
+    monkeypatch.setattr(bot, 'ARCHIVE_MODE', 'server')
+    assert asyncio.run(bot.replicate_pending())
+
+    assert_archived_once(service, server_mode)
+
+
+def test_lost_response_after_dropping_week_tab(bot, service, monkeypatch):
+    monkeypatch.setattr(bot, 'ARCHIVE_MODE', 'server')
+    monkeypatch.setattr(bot, 'LOGS_PARTITIONED', True)
+    log_id = asyncio.run(bot.save_log(member(), 'Düngen', 'online', ''))
+    assert asyncio.run(bot.replicate_pending())
+    asyncio.run(bot.archive_user_logs(1, current_week()))
+    inject_on_batch(bot, monkeypatch, lambda: service.lose_next(1))
+
+    assert asyncio.run(bot.replicate_pending())
+
+    assert asyncio.run(bot.bot.sheets.sheet_id(bot.week_tab(current_week()))) is None
+    assert [str(row[9]) for row in sheet_rows(service, 'Archiv')] == [str(log_id)]
+
+
+def test_failed_move_reuses_stamp_after_restart(bot, service, server_mode, monkeypatch):
+    inject_on_batch(bot, monkeypatch, lambda: service.fail_next(1, 500))
+    assert not asyncio.run(bot.replicate_pending())
+
+    # Neustart: Appender ohne Erinnerung an die Stempel
+    monkeypatch.undo()
+    monkeypatch.setattr(bot, 'ARCHIVE_MODE', 'server')
+    bot.bot.sheets_service = None
+    assert bot.bot.connect_sheets()
+    assert asyncio.run(bot.replicate_pending())
+
+    assert_archived_once(service, server_mode)
+    assert bot.bot.store.get_meta(bot.ARCHIVE_STAMPS_META) == ''
+
+
+def test_open_stamps_are_not_loaded_as_logs(bot, service, server_mode, monkeypatch):
+    inject_on_batch(bot, monkeypatch, lambda: service.fail_next(1, 500))
+    assert not asyncio.run(bot.replicate_pending())
+
+    assert asyncio.run(bot.sync_store_from_sheets())
+
+    # Nur der wieder angewendete Auftrag, kein 0-€-Eintrag aus dem Stempel
+    archived = bot.bot.store.conn.execute("SELECT user_id, amount FROM archive").fetchall()
+    assert archived == [('1', bot.PAYMENT_AMOUNTS['Düngen'])]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Lösch-Planer: Zeilennummern zu Bereichen, Bereiche zu Requests
+"""
+
+from archive_planner import build_delete_requests, build_move_requests, merge_row_ranges
+
+
+def test_adjacent_rows_become_one_range():
+    assert merge_row_ranges([2, 3, 4]) == [(1, 4)]
+
+
+def test_ranges_are_descending():
+    # Von unten nach oben löschen verschiebt die übrigen Bereiche nicht
+    assert merge_row_ranges([2, 3, 7, 9, 10]) == [(8, 10), (6, 7), (1, 3)]
+
+
+def test_unsorted_and_duplicate_rows():
+    assert merge_row_ranges([10, 3, 2, 10, 3, 9]) == [(8, 10), (1, 3)]
+
+
+def test_no_rows():
+    assert merge_row_ranges([]) == []
+
+
+def test_delete_requests_follow_ranges():
+    requests = build_delete_requests(7, merge_row_ranges([2, 3, 5]))
+
+    assert [r['deleteDimension']['range'] for r in requests] == [
+        {'sheetId': 7, 'dimension': 'ROWS', 'startIndex': 4, 'endIndex': 5},
+        {'sheetId': 7, 'dimension': 'ROWS', 'startIndex': 1, 'endIndex': 3},
+    ]
+
+
+def test_move_requests_merge_contiguous_source_and_target_rows():
+    # Zeilen 2-3 auf Stempel 50-51, Zeile 4 auf einen älteren Stempel 20
+    requests = build_move_requests(0, 1, {2: 50, 3: 51, 4: 20})
+
+    moves = [(r['cutPaste']['source']['startRowIndex'], r['cutPaste']['source']['endRowIndex'],
+              r['cutPaste']['destination']['rowIndex']) for r in requests]
+    assert moves == [(1, 3, 49), (3, 4, 19)]
+    assert all(r['cutPaste']['source']['endColumnIndex'] == 8 for r in requests)
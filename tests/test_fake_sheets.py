@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Fake Google Sheets verhält sich bei batchUpdate wie Google
+"""
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from conftest import sheet_rows
+
+
+def sheet_ids(service):
+    """Tab-Titel -> sheetId"""
+    sheets = service.spreadsheets().get(spreadsheetId='test').execute()['sheets']
+    return {sheet['properties']['title']: sheet['properties']['sheetId'] for sheet in sheets}
+
+
+def batch_update(service, requests):
+    return service.spreadsheets().batchUpdate(spreadsheetId='test', body={'requests': requests}).execute()
+
+
+def test_failing_batch_changes_nothing(service):
+    service.seed_rows('test', 'Logs', [['a'], ['b'], ['c']], start_row=2)
+    archive_id = sheet_ids(service)['Archiv']
+
+    requests = [
+        {'cutPaste': {
+            'source': {'sheetId': 0, 'startRowIndex': 1, 'endRowIndex': 2, 'startColumnIndex': 0, 'endColumnIndex': 1},
+            'destination': {'sheetId': archive_id, 'rowIndex': 1, 'columnIndex': 0},
+            'pasteType': 'PASTE_VALUES'
+        }},
+        {'deleteDimension': {'range': {'sheetId': 0, 'dimension': 'ROWS', 'startIndex': 1, 'endIndex': 2}}},
+        {'addSheet': {'properties': {'title': 'Logs_2026W42'}}},
+        # Scheitert erst nach den ersten drei Requests
+        {'addSheet': {'properties': {'title': 'Logs'}}},
+    ]
+    with pytest.raises(HttpError):
+        batch_update(service, requests)
+
+    assert sheet_rows(service, 'Logs') == [['a'], ['b'], ['c']]
+    assert sheet_rows(service, 'Archiv') == []
+    assert 'Logs_2026W42' not in sheet_ids(service)
+
+
+def test_successful_batch_applies_all_requests(service):
+    service.seed_rows('test', 'Logs', [['a'], ['b'], ['c']], start_row=2)
+
+    batch_update(service, [
+        {'deleteDimension': {'range': {'sheetId': 0, 'dimension': 'ROWS', 'startIndex': 1, 'endIndex': 2}}},
+        {'addSheet': {'properties': {'title': 'Logs_2026W42'}}},
+    ])
+
+    assert sheet_rows(service, 'Logs') == [['b'], ['c']]
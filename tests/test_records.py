@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Log-Datensätze: Beträge als ganze Cent, Zeilen einmal parsen
+"""
+
+import pytest
+
+from records import ACTIONS, Codebook, euros, parse_row, to_cents
+
+
+@pytest.mark.parametrize('value, cents', [
+    (5, 500),
+    (12.99, 1299),      # 12.99 * 100 = 1298.999...
+    (0.29, 29),         # 0.29 * 100 = 28.999...
+    (1.005, 100),       # 1.005 liegt binär knapp unter 1.005
+    ('12,99 €', 1299),
+    ('1.234,56 €', 123456),
+    ('7.5', 750),
+    ('', 0),
+])
+def test_to_cents_rounds_to_whole_cents(value, cents):
+    assert to_cents(value) == cents
+
+
+def test_to_cents_rejects_text():
+    with pytest.raises(ValueError):
+        to_cents('abc')
+
+
+def test_cents_sum_without_drift():
+    assert sum(to_cents(0.1) for _ in range(10)) == 100
+    assert euros(sum(to_cents('0,10 €') for _ in range(3))) == 0.3
+
+
+def test_parse_row():
+    record = parse_row(['18.10.2026 10:00:00', 'KW42/2026', 'member', 101.0, 'Düngen', '', '2,50 €', '', 7])
+
+    assert (record.week, record.user_id, record.username, record.action_name, record.cents) == (
+        202642, '101', 'member', 'Düngen', 250
+    )
+    assert record.week_label == 'KW42/2026'
+
+
+@pytest.mark.parametrize('row', [
+    ['18.10.2026', 'KW42/2026', 'member', '1', 'Düngen', ''],
+    ['18.10.2026', 'Woche 42', 'member', '1', 'Düngen', '', 5],
+    ['18.10.2026', 'KW42/2026', 'member', '1', 'Düngen', '', 'fünf'],
+])
+def test_parse_row_skips_invalid_rows(row):
+    assert parse_row(row) is None
+
+
+def test_codebook_assigns_stable_codes():
+    book = Codebook(['a', 'b'])
+
+    assert book.code('b') == 1
+    assert book.code('c') == 2
+    assert book.lookup('d') is None
+    assert (book.value(2), len(book)) == ('c', 3)
+    assert ACTIONS.value(ACTIONS.code('Düngen')) == 'Düngen'
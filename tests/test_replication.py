@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Replikation des lokalen Journals nach Google Sheets
+"""
+
+import asyncio
+
+from conftest import member, sheet_rows
+from weeks import current_week
+
+
+def test_log_archived_before_replication_reaches_archive(bot, service):
+    # Sheets nicht erreichbar: Log bleibt im Journal, wird dann archiviert
+    log_id = asyncio.run(bot.save_log(member(), 'Düngen', 'offline', ''))
+    assert asyncio.run(bot.archive_user_logs(1, current_week()))
+
+    assert asyncio.run(bot.replicate_pending())
+
+    assert sheet_rows(service, 'Logs') == []
+    archive = sheet_rows(service, 'Archiv')
+    assert [str(row[9]) for row in archive] == [str(log_id)]
+    assert bot.bot.store.journal_depth() == 0
+
+
+def test_unsynced_archive_survives_reload(bot, service):
+    asyncio.run(bot.save_log(member(), 'Düngen', 'offline', ''))
+    asyncio.run(bot.archive_user_logs(1, current_week()))
+
+    # Neustart vor der Replikation: lokaler Spiegel wird aus Sheets geladen
+    assert asyncio.run(bot.sync_store_from_sheets())
+    assert asyncio.run(bot.replicate_pending())
+
+    assert len(sheet_rows(service, 'Archiv')) == 1
+    assert sheet_rows(service, 'Logs') == []
+
+
+def test_synced_log_is_archived_once(bot, service):
+    asyncio.run(bot.save_log(member(), 'Düngen', 'online', ''))
+    asyncio.run(bot.replicate_pending())
+    asyncio.run(bot.archive_user_logs(1, current_week()))
+
+    assert asyncio.run(bot.replicate_pending())
+
+    assert sheet_rows(service, 'Logs') == []
+    assert len(sheet_rows(service, 'Archiv')) == 1
+
+
+def test_emptied_week_tab_rebuilds_index(bot, service, monkeypatch):
+    monkeypatch.setattr(bot, 'LOGS_PARTITIONED', True)
+    asyncio.run(bot.save_log(member(), 'Düngen', 'online', ''))
+    assert asyncio.run(bot.replicate_pending())
+    bot.rebuild_index()
+    assert bot.bot.index.user(current_week(), '1') is not None
+
+    # Wochen-Tab wird im Sheet geleert: lokale Zeilen und Index folgen
+    tab = bot.week_tab(current_week())
+    service.spreadsheets().values().clear(spreadsheetId='test', range=f'{tab}!A2:I').execute()
+    assert asyncio.run(bot.refresh_week_tab())
+
+    assert bot.bot.store.week_logs(current_week()) == []
+    assert bot.bot.index.user(current_week(), '1') is None
+
+
+def test_log_after_payout_stays_open(bot, service):
+    asyncio.run(bot.save_log(member(), 'Düngen', 'vor der Auszahlung', ''))
+    asyncio.run(bot.replicate_pending())
+    asyncio.run(bot.archive_user_logs(1, current_week()))
+    later = asyncio.run(bot.save_log(member(), 'Düngen', 'nach der Auszahlung', ''))
+
+    assert asyncio.run(bot.replicate_pending())
+
+    assert [str(row[8]) for row in sheet_rows(service, 'Logs')] == [str(later)]
+    assert len(sheet_rows(service, 'Archiv')) == 1
+    assert bot.bot.index.user(current_week(), '1').logs == 1
+
+    # Neu laden wendet den Auftrag nur auf seine eigenen Logs an
+    assert asyncio.run(bot.sync_store_from_sheets())
+    assert [row[8] for row in bot.bot.store.week_logs(current_week())] == [later]
+
+
+
+def test_pending_archive_keeps_later_log_in_sheet_summary(bot, monkeypatch):
+    asyncio.run(bot.save_log(member(), 'Düngen', 'vor der Auszahlung', ''))
+    asyncio.run(bot.replicate_pending())
+    asyncio.run(bot.archive_user_logs(1, current_week()))
+    asyncio.run(bot.save_log(member(), 'Düngen', 'nach der Auszahlung', ''))
+
+    # _Aggregates enthält noch den archivierten Log, der Auftrag ist offen
+    amount = bot.PAYMENT_AMOUNTS['Düngen']
+    summary = [[bot.week_label(current_week()), '1', 'member', 'Düngen', 1, amount]]
+
+    async def read_summary():
+        return summary
+
+    monkeypatch.setattr(bot, 'AGGREGATES_SOURCE', 'sheet')
+    monkeypatch.setattr(bot, 'read_summary', read_summary)
+    index = asyncio.run(bot.summary_index())
+
+    assert index.user(current_week(), '1').logs == 1
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Wiederholungen nach verlorenen Antworten dürfen nichts doppelt schreiben oder löschen
+"""
+
+import asyncio
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from conftest import sheet_rows
+
+
+def log_row(log_id, user_id='1'):
+    return ['18.10.2026 10:00:00', 'KW42/2026', 'member', user_id, 'Düngen', '', 5, '', str(log_id)]
+
+
+def test_lost_append_response_writes_once(bot, service):
+    service.lose_next()
+    asyncio.run(bot.bot.log_appender.append([log_row(101)]))
+
+    assert [str(row[8]) for row in sheet_rows(service, 'Logs')] == ['101']
+
+
+def test_lost_delete_response_is_not_resent(bot, service):
+    service.seed_rows('test', 'Logs', [log_row(1), log_row(2), log_row(3)], start_row=2)
+    service.lose_next()
+
+    request = {'deleteDimension': {'range': {'sheetId': 0, 'dimension': 'ROWS', 'startIndex': 1, 'endIndex': 2}}}
+    with pytest.raises(HttpError):
+        asyncio.run(bot.bot.sheets.batch_update([request]))
+
+    assert [row[8] for row in sheet_rows(service, 'Logs')] == ['2', '3']
+
+
+def test_reads_are_retried_after_server_error(bot, service):
+    service.seed_rows('test', 'Logs', [log_row(1)], start_row=2)
+    service.fail_next(2, status=503)
+
+    rows = asyncio.run(bot.bot.sheets.values_get('Logs!A2:I'))
+    assert len(rows) == 1
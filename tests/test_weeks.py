@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+ISO-Wochenschlüssel rund um den Jahreswechsel
+"""
+
+from datetime import datetime
+
+import pytest
+
+from local_store import LocalStore
+from weeks import last_weeks, parse_week, week_key, week_label
+
+
+@pytest.mark.parametrize('label, timestamp, expected', [
+    # Vom Bot geschrieben (ISO-Jahr): bleibt unverändert
+    ('KW1/2025', '30.12.2024 10:00:00', 202501),
+    ('KW53/2026', '01.01.2027 09:00:00', 202653),
+    ('KW1/2026', '29.12.2025 18:00:00', 202601),
+    # Ältere Logs mit Kalenderjahr: Jahr wird korrigiert
+    ('KW1/2024', '30.12.2024 10:00:00', 202501),
+    ('KW53/2027', '01.01.2027 09:00:00', 202653),
+    ('KW1/2025', '29.12.2025 18:00:00', 202601),
+    # Mitten im Jahr und ohne lesbaren Zeitstempel
+    ('KW42/2026', '14.10.2026 12:00:00', 202642),
+    ('KW1/2025', '', 202501),
+    ('KW1/2025', 'unbekannt', 202501),
+])
+def test_parse_week_year_boundary(label, timestamp, expected):
+    assert parse_week(label, timestamp) == expected
+
+
+@pytest.mark.parametrize('moment', [
+    datetime(2024, 12, 30, 10), datetime(2025, 12, 29, 18), datetime(2027, 1, 1, 9), datetime(2026, 12, 31, 23)
+])
+def test_bot_label_round_trips(moment):
+    # So beschriftet save_log neue Logs
+    label = week_label(week_key(moment))
+    assert parse_week(label, moment.strftime("%d.%m.%Y %H:%M:%S")) == week_key(moment)
+
+
+def test_store_keys_new_year_logs_by_iso_week(tmp_path):
+    store = LocalStore(str(tmp_path / 'store.db'))
+    moment = datetime(2024, 12, 30, 10)
+    row = [moment.strftime("%d.%m.%Y %H:%M:%S"), week_label(week_key(moment)), 'member', '1', 'Düngen', '', 5, '', 1]
+    store.insert_log(row)
+
+    assert len(store.week_logs(202501)) == 1
+    assert store.week_logs(202601) == []
+
+
+def test_week_range_unpacks_and_iterates():
+    first, last = last_weeks(4, end=202602)
+    assert (first, last) == (202551, 202602)
+    assert last_weeks(4, end=202602)._asdict() == {'first': 202551, 'last': 202602}
+    assert list(last_weeks(4, end=202602).weeks()) == [202551, 202552, 202601, 202602]
+    assert 202552 in last_weeks(4, end=202602)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kalenderwochen für Discord Log Bot
+ISO-Jahr und ISO-Woche als eine Ganzzahl (KW42/2026 -> 202642), Umrechnung
+vom und zum Text im Logs-Tab und Bereiche für Auswertungen
+
+Ganzzahlige Schlüssel sortieren chronologisch, Bereiche wie "letzte 4 Wochen"
+sind damit einfache Vergleiche ``first <= key <= last``.
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import os
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Iterator, NamedTuple, Optional, Union
+
+# "KW42/2026", auch "KW 42/2026" wie in Embeds
+_WEEK_PATTERN = re.compile(r'^\s*KW\s*(\d{1,2})\s*/\s*(\d{4})\s*$', re.IGNORECASE)
+
+# Logs in Wochen-Tabs (Logs_2026W42) statt in einem wachsenden Logs-Tab
+LOGS_PARTITIONED = os.getenv('LOGS_PARTITIONED', '').lower() in ('1', 'true', 'yes')
+
+# Wochen-Tabs im partitionierten Layout: "Logs_2026W42"
+_TAB_PATTERN = re.compile(r'^(\w+)_(\d{4})W(\d{2})$')
+
+
+def week_key(moment: Optional[Union[date, datetime]] = None) -> int:
+    """ISO-Woche eines Zeitpunkts als Ganzzahl (Standard: jetzt)"""
+    iso_year, iso_week, _ = (moment or datetime.now()).isocalendar()
+    return iso_year * 100 + iso_week
+
+
+def current_week() -> int:
+    """Aktuelle ISO-Woche als Ganzzahl"""
+    return week_key()
+
+
+def week_label(key: int) -> str:
+    """Text im Format des Logs-Tabs (202642 -> KW42/2026)"""
+    return f"KW{key % 100}/{key // 100}"
+
+
+@lru_cache(maxsize=1024)
+def _parse_label(text: str) -> Optional[int]:
+    match = _WEEK_PATTERN.match(text)
+    if not match:
+        return None
+    week, year = int(match.group(1)), int(match.group(2))
+    if not 1 <= week <= 53:
+        return None
+    return year * 100 + week
+
+
+@lru_cache(maxsize=4096)
+def _timestamp_week(text: str) -> Optional[int]:
+    """ISO-Woche des Datums eines Zeitstempels (``TT.MM.JJJJ ...``)"""
+    try:
+        return week_key(datetime.strptime(text[:10], "%d.%m.%Y"))
+    except ValueError:
+        return None
+
+
+def parse_week(value: Any, timestamp: Any = '') -> Optional[int]:
+    """
+    Schlüssel aus der KW-Spalte (bereits geparste Ganzzahlen bleiben)
+
+    Ältere Logs wurden mit dem Kalenderjahr statt dem ISO-Jahr beschriftet:
+    30.12.2024 steht dort als ``KW1/2024`` statt ``KW1/2025``. Mit dem
+    Zeitstempel der Zeile (``TT.MM.JJJJ ...``) wird das Jahr korrigiert -
+    nur wenn die Woche zum Datum passt, das Jahr aber nicht dessen ISO-Jahr
+    ist. Korrekt beschriftete Zeilen bleiben unverändert.
+
+    Returns:
+        Ganzzahliger Schlüssel oder None bei unbekanntem Format
+    """
+    if isinstance(value, int):
+        return value
+
+    key = _parse_label(str(value))
+    if key is None or not timestamp:
+        return key
+
+    actual = _timestamp_week(str(timestamp))
+    if actual is not None and actual % 100 == key % 100 and actual != key:
+        return actual
+    return key
+
+
+# Wochennummern, deren ältere Labels ohne Zeitstempel im falschen Jahr landen
+YEAR_BOUNDARY_WEEKS = (1, 52, 53)
+
+
+def is_year_boundary_week(key: int) -> bool:
+    """Woche am Jahreswechsel (``parse_week`` braucht hier den Zeitstempel)"""
+    return key % 100 in YEAR_BOUNDARY_WEEKS
+
+
+def week_tab(key: int, prefix: str = 'Logs') -> str:
+    """Tab-Titel einer Woche im partitionierten Layout (202642 -> Logs_2026W42)"""
+    return f"{prefix}_{key // 100}W{key % 100:02d}"
+
+
+def parse_week_tab(title: str, prefix: str = 'Logs') -> Optional[int]:
+    """Schlüssel aus einem Wochen-Tab-Titel (None für andere Tabs)"""
+    match = _TAB_PATTERN.match(title)
+    if not match or match.group(1) != prefix:
+        return None
+    return int(match.group(2)) * 100 + int(match.group(3))
+
+
+def week_start(key: int) -> date:
+    """Montag einer ISO-Woche"""
+    return date.fromisocalendar(key // 100, key % 100, 1)
+
+
+def shift_weeks(key: int, weeks: int) -> int:
+    """Verschiebe einen Schlüssel um ``weeks`` Wochen (auch über Jahresgrenzen)"""
+    return week_key(week_start(key) + timedelta(weeks=weeks))
+
+
+class WeekRange(NamedTuple):
+    """Geschlossener Bereich von ISO-Wochen"""
+    first: int
+    last: int
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, int) and self.first <= key <= self.last
+
+    def weeks(self) -> Iterator[int]:
+        """Alle Schlüssel im Bereich, aufsteigend (auch über Jahresgrenzen)"""
+        key = self.first
+        while key <= self.last:
+            yield key
+            key = shift_weeks(key, 1)
+
+    def label(self) -> str:
+        if self.first == self.last:
+            return week_label(self.first)
+        return f"{week_label(self.first)} - {week_label(self.last)}"
+
+
+def last_weeks(count: int, end: Optional[int] = None) -> WeekRange:
+    """Die letzten ``count`` Wochen bis einschließlich ``end`` (Standard: aktuelle)"""
+    end = end or current_week()
+    return WeekRange(shift_weeks(end, -(count - 1)), end)
+
+
+def quarter(moment: Optional[Union[date, datetime]] = None) -> WeekRange:
+    """Alle ISO-Wochen, deren Montag im Quartal von ``moment`` liegt"""
+    moment = moment or datetime.now()
+    first_month = (moment.month - 1) // 3 * 3 + 1
+    first_day = date(moment.year, first_month, 1)
+    next_quarter = date(moment.year + (first_month + 3) // 13, (first_month + 2) % 12 + 1, 1)
+
+    # Erster Montag im Quartal und letzter Montag vor dem nächsten Quartal
+    first_monday = first_day + timedelta(days=-first_day.weekday() % 7)
+    last_monday = next_quarter - timedelta(days=next_quarter.weekday() or 7)
+    return WeekRange(week_key(first_monday), week_key(last_monday))
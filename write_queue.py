@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write Queue für Discord Log Bot
+Überträgt das lokale Journal gesammelt und in Reihenfolge nach Google Sheets.
+Jede Zeile trägt einen Idempotenz-Key, damit Wiederholungen keine doppelten
+Zeilen erzeugen.
+
+Author: xPerpleXz
+License: MIT
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+
+from metrics import JOURNAL_FLUSH_LATENCY
+from quota import backoff_delay
+from sheets_client import first_updated_row
+
+# Sammelfenster in Sekunden, bevor das Journal übertragen wird
+LOG_WRITE_WINDOW = float(os.getenv('LOG_WRITE_WINDOW', 0.5))
+
+# Maximale Anzahl Zeilen pro Append (größere Rückstände in mehreren Batches)
+LOG_WRITE_MAX_BATCH = int(os.getenv('LOG_WRITE_MAX_BATCH', 50))
+
+# Wiederholungen eines Appends nach Timeout / Verbindungsfehler
+APPEND_RETRIES = int(os.getenv('APPEND_RETRIES', 8))
+
+# Anzahl zuletzt geschriebener Keys, die lokal vorgehalten werden
+RECENT_KEYS_SIZE = int(os.getenv('RECENT_KEYS_SIZE', 5000))
+
+# Beim Prüfen nach einem Fehler so viele Zeilen vor der letzten bekannten lesen
+RECENT_KEYS_WINDOW = 500
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Client-Fehler (4xx außer 429) werden nicht wiederholt"""
+    if isinstance(error, HttpError):
+        return error.resp.status == 429 or error.resp.status >= 500
+    return True
+
+
+class RecentKeys:
+    """Begrenzter Index: Idempotenz-Key -> Zeilennummer (None wenn unbekannt)"""
+
+    def __init__(self, size: int = RECENT_KEYS_SIZE):
+        self.size = size
+        self._keys: 'OrderedDict[str, Optional[int]]' = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, key: str) -> Optional[int]:
+        return self._keys.get(key)
+
+    def add(self, key: str, sheet_row: Optional[int]):
+        self._keys[key] = sheet_row
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.size:
+            self._keys.popitem(last=False)
+
+    def forget_rows(self):
+        """Zeilennummern verwerfen (nach Löschungen im Tab), Keys bleiben erhalten"""
+        for key in self._keys:
+            self._keys[key] = None
+
+
+class IdempotentAppender:
+    """
+    Append mit Wiederholung ohne Duplikate
+
+    Schlägt ein Append fehl, ist unklar ob Google die Zeilen trotzdem
+    geschrieben hat. Vor jeder Wiederholung wird deshalb die Key-Spalte ab
+    der letzten bekannten Zeile gelesen und nur fehlende Zeilen werden erneut
+    angehängt. Keys, deren Ergebnis nach allen Versuchen offen bleibt, werden
+    beim nächsten Append ebenfalls zuerst geprüft.
+    """
+
+    def __init__(
+        self,
+        client,
+        range_name: str,
+        key_index: int,
+        key_column: str,
+        value_input_option: str = 'USER_ENTERED',
+        retries: int = APPEND_RETRIES
+    ):
+        self.client = client
+        self.range_name = range_name
+        self.tab = range_name.split('!')[0]
+        self.key_index = key_index
+        self.key_column = key_column
+        self.value_input_option = value_input_option
+        self.retries = retries
+
+        self.recent = RecentKeys()
+        self.uncertain: set = set()
+        self.last_row: Optional[int] = None
+
+        # Statistiken
+        self.retried = 0
+        self.deduplicated = 0
+
+    def key_of(self, row: List[Any]) -> Optional[str]:
+        """Idempotenz-Key einer Zeile (None bei Zeilen ohne Key)"""
+        if len(row) <= self.key_index or row[self.key_index] in (None, ''):
+            return None
+        return str(row[self.key_index])
+
+    def forget_rows(self):
+        """Zeilennummern sind nach Löschungen im Tab nicht mehr gültig"""
+        self.recent.forget_rows()
+        self.last_row = None
+
+    async def _remote_keys(self) -> Dict[str, int]:
+        """Keys der zuletzt geschriebenen Zeilen direkt aus Sheets"""
+        start = max(2, self.last_row - RECENT_KEYS_WINDOW) if self.last_row else 2
+        values = await self.client.values_get(f'{self.tab}!{self.key_column}{start}:{self.key_column}')
+        return {str(row[0]): start + i for i, row in enumerate(values) if row and row[0] != ''}
+
+    def _confirm(self, key: Optional[str], sheet_row: Optional[int]):
+        if key:
+            self.recent.add(key, sheet_row)
+            self.uncertain.discard(key)
+
+    async def append(self, rows: List[List[Any]]) -> List[Optional[int]]:
+        """
+        Hänge Zeilen an, bereits vorhandene Keys werden übersprungen
+
+        Returns:
+            Zeilennummer jeder Zeile (None wenn unbekannt), gleiche Reihenfolge
+        """
+        result: List[Optional[int]] = [None] * len(rows)
+        pending = []
+        for i, row in enumerate(rows):
+            key = self.key_of(row)
+            if key and key in self.recent:
+                result[i] = self.recent.get(key)
+                self.deduplicated += 1
+            else:
+                pending.append(i)
+
+        verify = any(self.key_of(rows[i]) in self.uncertain for i in pending)
+        attempt = 0
+
+        while pending:
+            try:
+                if verify:
+                    remote = await self._remote_keys()
+                    still_pending = []
+                    for i in pending:
+                        key = self.key_of(rows[i])
+                        if key and key in remote:
+                            result[i] = remote[key]
+                            self._confirm(key, remote[key])
+                            self.deduplicated += 1
+                        else:
+                            still_pending.append(i)
+                    pending = still_pending
+                    if not pending:
+                        break
+
+                response = await self.client.values_append(
+                    self.range_name,
+                    [rows[i] for i in pending],
+                    self.value_input_option
+                )
+            except Exception as e:
+                if attempt >= self.retries or not _is_retryable(e):
+                    self.uncertain.update(k for k in (self.key_of(rows[i]) for i in pending) if k)
+                    raise
+                delay = backoff_delay(attempt)
+                attempt += 1
+                self.retried += 1
+                print(f"⚠️ Append nach {self.tab} fehlgeschlagen ({e or type(e).__name__}) - prüfe Keys, neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                verify = True
+                continue
+
+            first_row = first_updated_row(response)
+            for n, i in enumerate(pending):
+                result[i] = first_row + n if first_row is not None else None
+                self._confirm(self.key_of(rows[i]), result[i])
+            if first_row is not None:
+                self.last_row = max(self.last_row or 0, first_row + len(pending) - 1)
+            pending = []
+
+        return result
+
+
+class JournalReplayer:
+    """
+    Hintergrund-Task, der das lokale Journal nach Google Sheets überträgt
+
+    Das Journal sind die noch nicht replizierten Einträge im LocalStore
+    (Logs, Auszahlungen, Archiv-Aufträge). ``notify()`` weckt den Replayer,
+    er sammelt für ``window`` Sekunden und ruft dann ``drain()`` auf. Schlägt
+    das fehl (Google nicht erreichbar), wird mit wachsendem Abstand erneut
+    versucht, bis das Journal leer ist.
+    """
+
+    def __init__(
+        self,
+        drain: Callable[[], Awaitable[bool]],
+        pending: Callable[[], int],
+        window: float = LOG_WRITE_WINDOW
+    ):
+        self.drain = drain
+        self.pending = pending
+        self.window = window
+
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistiken
+        self.flush_count = 0
+        self.failures = 0
+        self.last_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Anzahl Journal-Einträge, die noch nicht in Sheets stehen"""
+        return self.pending()
+
+    @property
+    def avg_flush_latency(self) -> float:
+        """Durchschnittliche Dauer eines Durchgangs in Sekunden"""
+        return self.total_flush_latency / self.flush_count if self.flush_count else 0.0
+
+    def stats(self) -> Dict:
+        """Aktuelle Kennzahlen des Replayers"""
+        return {
+            'queue_depth': self.queue_depth,
+            'flush_count': self.flush_count,
+            'failures': self.failures,
+            'last_flush_latency': self.last_flush_latency,
+            'avg_flush_latency': self.avg_flush_latency
+        }
+
+    def notify(self):
+        """Neue Einträge im Journal"""
+        self._wakeup.set()
+
+    def start(self):
+        """Starte den Hintergrund-Task (offene Einträge vom letzten Lauf inklusive)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if self.pending():
+            self.notify()
+
+    async def stop(self):
+        """Beende den Hintergrund-Task und versuche einen letzten Durchgang"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.pending():
+            await self._drain_once()
+
+    async def _drain_once(self) -> bool:
+        start = time.perf_counter()
+        ok = False
+        try:
+            ok = await self.drain()
+            return ok
+        except Exception as e:
+            print(f"❌ Journal-Replay fehlgeschlagen: {e}")
+            return False
+        finally:
+            self.last_flush_latency = time.perf_counter() - start
+            self.total_flush_latency += self.last_flush_latency
+            self.flush_count += 1
+            JOURNAL_FLUSH_LATENCY.observe(self.last_flush_latency, outcome='ok' if ok else 'error')
+
+    async def _run(self):
+        """Warte auf neue Einträge, sammle für ``window`` Sekunden und übertrage"""
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.window)
+            self._wakeup.clear()
+
+            attempt = 0
+            while not await self._drain_once():
+                self.failures += 1
+                delay = backoff_delay(min(attempt, 10))
+                attempt += 1
+                print(f"⏳ {self.pending()} Einträge im Journal - neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)